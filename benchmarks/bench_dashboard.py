@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Dashboard rendering benchmark
+Renders the monitoring dashboard for increasing connection counts, once as a
+single page string (the old approach) and once streamed from a row generator
+into a file, reporting render time and tracemalloc peak memory for each
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "exporter"))
+
+from dashboard import dashboard_metrics, stream_dashboard, write_dashboard  # noqa: E402
+
+STATUSES = ["Valid", "Valid", "EXPIRING", "EXPIRED"]
+
+
+def synthetic_rows(n_rows):
+    """Generator of dashboard rows for ``n_rows`` connections."""
+    for i in range(n_rows):
+        yield {
+            "connection_id": f"VEN-{i:06d}",
+            "vendor_name": f"Vendor <{i % 997}> & Sons",
+            "attestation_status": STATUSES[i % len(STATUSES)],
+            "expiry_date": f"2025-{i % 12 + 1:02d}-15",
+            "alerts": i % 3,
+        }
+
+
+def measure(render):
+    """(seconds, peak MiB) for ``render()``; timed without tracemalloc overhead."""
+    start = time.perf_counter()
+    render()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def bench(n_rows, path):
+    """Time and peak memory for the single-string and streamed renders of ``n_rows``."""
+    # metrics are a cheap counting pass; computing them up front lets the rows stay a generator
+    metrics = dashboard_metrics(list(synthetic_rows(n_rows)))
+
+    def as_string():
+        html = "".join(stream_dashboard(synthetic_rows(n_rows), metrics))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+
+    def streamed():
+        with open(path, "w", encoding="utf-8") as f:
+            write_dashboard(synthetic_rows(n_rows), f, metrics)
+
+    string_s, string_mb = measure(as_string)
+    stream_s, stream_mb = measure(streamed)
+    return {
+        "connections": n_rows,
+        "page_mb": round(os.path.getsize(path) / 2**20, 2),
+        "string_s": round(string_s, 3),
+        "string_peak_mb": round(string_mb, 2),
+        "stream_s": round(stream_s, 3),
+        "stream_peak_mb": round(stream_mb, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single-string vs streamed dashboard rendering")
+    parser.add_argument("--connections", type=int, nargs="+", default=[100, 10_000, 100_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [bench(n, Path(tmp) / "dashboard.html") for n in args.connections]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Evidence manifest hashing benchmark
+Builds a synthetic evidence folder and times a cold manifest build with one
+worker and with the default pool, then a warm rebuild where every file is
+skipped on unchanged size/mtime
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "exporter"))
+
+from manifest import EvidenceManifest  # noqa: E402
+
+
+def make_evidence(root, n_files, size_mb):
+    """``n_files`` random files of ``size_mb`` MiB each under ``root``."""
+    block = os.urandom(1024 * 1024)
+    for i in range(n_files):
+        with open(root / f"Screenshot_{i:04d}.png", "wb") as f:
+            for _ in range(size_mb):
+                f.write(block)
+
+
+def timed_build(evidence_dir, manifest_dir, max_workers=None):
+    manifest = EvidenceManifest(evidence_dir, manifest_dir)
+    start = time.perf_counter()
+    manifest.build(max_workers=max_workers)
+    return time.perf_counter() - start, manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel evidence manifest hashing")
+    parser.add_argument("--files", type=int, default=64)
+    parser.add_argument("--size-mb", type=int, default=16, help="Size of each file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        evidence = Path(tmp) / "evidence"
+        evidence.mkdir()
+        make_evidence(evidence, args.files, args.size_mb)
+        total_mb = args.files * args.size_mb
+
+        serial_s, _ = timed_build(evidence, Path(tmp) / "serial", max_workers=1)
+        parallel_s, _ = timed_build(evidence, Path(tmp) / "parallel")
+        warm_s, warm = timed_build(evidence, Path(tmp) / "parallel")
+
+    print(json.dumps({
+        "files": args.files,
+        "total_mb": total_mb,
+        "serial_s": round(serial_s, 3),
+        "serial_mb_per_s": round(total_mb / serial_s, 1),
+        "parallel_s": round(parallel_s, 3),
+        "parallel_mb_per_s": round(total_mb / parallel_s, 1),
+        "warm_rebuild_s": round(warm_s, 4),
+        "warm_rehashed": warm.hashed,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the report pipeline
+Generates a synthetic dataset at configurable scale (connections, remote
+access sessions, access review accounts, archived identifiers, firewall log
+lines, evidence rows) in the shapes of mock_data/ and evidence_samples/, runs
+every stage of the pipeline on it and prints per-stage wall time, peak memory
+and throughput as JSON so results can be compared across commits
+"""
+
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+import pandas as pd  # pyright: ignore[reportMissingModuleSource]
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "exporter"))
+
+import access_review  # noqa: E402
+import identifier_reuse  # noqa: E402
+import main as pipeline  # noqa: E402
+import remote_access  # noqa: E402
+from firewall_log import DEFAULT_LOG_GLOB, FirewallLogIndex  # noqa: E402
+from manifest import EvidenceManifest  # noqa: E402
+from store import AssessmentStore, available as store_available  # noqa: E402
+from styling import StyleCache, style_worksheet  # noqa: E402
+
+ASSESSMENT_DATE = "2024-09-30"  # inside the mock data's timeline
+DEPARTMENTS = ["Engineering", "IT Admin", "HR", "Finance", "Contracts", "Security"]
+ACTIONS = ["No Change", "No Change", "No Change", "Disabled - No login 30+ days", "Removed CUI access"]
+
+
+# Synthetic dataset --------------------------------------------------------
+def write_connections(path, n, rng):
+    """``external_connections.json`` with ``n`` connections, about a quarter of them expired."""
+    as_of = pd.Timestamp(ASSESSMENT_DATE)
+    expires = as_of + pd.to_timedelta(rng.integers(-180, 365, n), unit="D")
+    ids = pd.Series([f"VEN-{i:05d}" for i in range(n)])
+    df = pd.DataFrame(
+        {
+            "id": ids,
+            "vendor": "Vendor " + ids.str[4:],
+            "type": rng.choice(["Site-to-Site VPN", "API Connection", "SFTP"], n),
+            "purpose": "Synthetic benchmark connection",
+            "cui_access": rng.random(n) < 0.5,
+            "attestation_date": (expires - pd.Timedelta(days=183)).strftime("%Y-%m-%d"),
+            "expires": expires.strftime("%Y-%m-%d"),
+        }
+    )
+    path.write_text('{"connections": ' + df.to_json(orient="records") + "}", encoding="utf-8")
+    return df
+
+
+def write_sessions(path, n, users, rng):
+    """``remote_access_logs.json`` with ``n`` sessions spread over ``users`` users."""
+    start = pd.Timestamp("2024-09-01", tz="UTC")
+    minutes = rng.integers(5, 600, n)
+    df = pd.DataFrame(
+        {
+            "user": pd.Series(rng.integers(0, users, n)).map("user{:06d}.eng".format),
+            "timestamp": (start + pd.to_timedelta(rng.integers(0, 30 * 86400, n), unit="s"))
+            .strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "source_ip": pd.Series(rng.integers(1, 255, (n, 4)).astype(str).tolist()).str.join("."),
+            "mfa_verified": rng.random(n) < 0.98,
+            "session_duration": pd.Series(minutes // 60).astype(str) + "h " + pd.Series(minutes % 60).astype(str) + "m",
+            "accessed_cui": rng.random(n) < 0.4,
+            "recorded": rng.random(n) < 0.97,
+        }
+    )
+    path.write_text('{"sessions": ' + df.to_json(orient="records") + "}", encoding="utf-8")
+
+
+def write_alerts(path, connections, rng):
+    """``monitoring_alerts.json`` with expiry alerts for the expired connections."""
+    expired = connections[pd.to_datetime(connections["expires"]) < pd.Timestamp(ASSESSMENT_DATE)]
+    alerts = [
+        {"timestamp": f"{exp}T00:00:00Z", "connection_id": conn, "alert_type": "ATTESTATION_EXPIRED",
+         "message": "Security attestation has expired - access restricted", "severity": "CRITICAL"}
+        for conn, exp in zip(expired["id"], expired["expires"])
+    ]
+    path.write_text(json.dumps({"alerts": alerts}), encoding="utf-8")
+
+
+def write_firewall_log(path, n_lines, connections, rng):
+    """Firewall log with deny rule changes for expired connections padded with traffic lines."""
+    expired = connections[pd.to_datetime(connections["expires"]) < pd.Timestamp(ASSESSMENT_DATE)]
+    lines = ["# SYNTHETIC FIREWALL LOG"]
+    for conn, exp in zip(expired["id"], expired["expires"]):
+        lines.append(f"{exp}T00:00:00.567Z [RULE-UPDATE] Disabling rule: {conn}-CUI-ACCESS")
+        lines.append(f"{exp}T00:00:00.678Z [RULE-UPDATE] New: deny src:10.20.30.0/24 dst:10.0.10.0/24 port:any")
+    ids = connections["id"].to_numpy()
+    conn = ids[rng.integers(0, len(ids), max(n_lines - len(lines), 0))]
+    seconds = np.sort(rng.integers(0, 30 * 86400, len(conn)))
+    stamps = (pd.Timestamp("2024-09-01") + pd.to_timedelta(seconds, unit="s")).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    lines.extend(f"{ts} [TRAFFIC] allow {c} src:10.20.30.5 dst:10.0.2.10 app:https" for ts, c in zip(stamps, conn))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def write_access_review(path, n, rng):
+    """Q3 access review export with ``n`` accounts."""
+    names = pd.Series([f"user{i:06d}" for i in range(n)])
+    last_login = pd.Timestamp(ASSESSMENT_DATE) - pd.to_timedelta(rng.integers(0, 60, n), unit="D")
+    pd.DataFrame(
+        {
+            "Username": names + ".eng",
+            "Full Name": "User " + names.str[4:],
+            "Department": rng.choice(DEPARTMENTS, n),
+            "CUI Access": rng.choice(["Yes", "No"], n),
+            "Last Login": last_login.strftime("%Y-%m-%d"),
+            "Manager": "User " + pd.Series(rng.integers(0, n, n)).map("{:06d}".format),
+            "Review Status": rng.choice(["Approved", "Approved", "Approved", "Pending"], n),
+            "Action Taken": rng.choice(ACTIONS, n),
+        }
+    ).to_csv(path, index=False)
+
+
+def write_identity_procedure(path, n, rng):
+    """Identity management procedure whose reserved-username table has ``n`` archived identifiers."""
+    terminated = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1700, n), unit="D")
+    rows = [
+        f"| former{i:07d}.eng | {t:%Y-%m-%d} | {t + pd.Timedelta(days=730):%Y-%m-%d} | Archived |"
+        for i, t in zip(range(n), terminated)
+    ]
+    header = "| Username | Termination Date | Eligible for Reuse | Status |\n|---|---|---|---|\n"
+    path.write_text("# Identity Management Procedure\n\n" + header + "\n".join(rows) + "\n", encoding="utf-8")
+
+
+def make_dataset(root, scale, seed=0):
+    """Write a synthetic data/evidence folder pair under ``root``; returns (data_dir, evidence_dir)."""
+    rng = np.random.default_rng(seed)
+    data_dir, evidence_dir = root / "mock_data", root / "evidence"
+    data_dir.mkdir()
+    shutil.copytree(REPO_ROOT / "evidence_samples", evidence_dir)
+    connections = write_connections(data_dir / "external_connections.json", scale["connections"], rng)
+    write_alerts(data_dir / "monitoring_alerts.json", connections, rng)
+    write_sessions(data_dir / "remote_access_logs.json", scale["sessions"], max(scale["accounts"], 1), rng)
+    write_firewall_log(evidence_dir / "Firewall_Log_Synthetic.log", scale["log_lines"], connections, rng)
+    write_access_review(evidence_dir / "AC_3.1.1_Q3_Access_Review.csv", scale["accounts"], rng)
+    write_identity_procedure(evidence_dir / "AC_3.1.7_Identity_Management_Procedure.md", scale["archived"], rng)
+    return data_dir, evidence_dir
+
+
+def scale_evidence(evidence, n_rows):
+    """Tile the collected evidence rows to ``n_rows`` (control ids repeat, as across review periods)."""
+    if n_rows <= len(evidence):
+        return evidence
+    reps = -(-n_rows // len(evidence))
+    return pd.concat([evidence] * reps, ignore_index=True).iloc[:n_rows]
+
+
+# Pipeline -------------------------------------------------------------------
+def drop_firewall_indexes(evidence_dir, state_dir):
+    """Remove the persisted indexes (under ``state_dir``) of the synthetic firewall logs."""
+    index_dir = pipeline.state_paths(state_dir)["firewall_index"]
+    for log in evidence_dir.glob(DEFAULT_LOG_GLOB):
+        FirewallLogIndex(log, index_dir).remove()
+
+
+def clear_memos(evidence_dir, state_dir):
+    """Drop memoized analyses and firewall indexes so every stage is timed cold."""
+    for module in (access_review, identifier_reuse, remote_access):
+        with module._memo_lock:
+            module._memo.clear()
+    drop_firewall_indexes(evidence_dir, state_dir)
+
+
+def pipeline_stages(data_dir, evidence_dir, work_dir, scale):
+    """(stage name, callable(state) -> rows processed) in pipeline order.
+
+    The former hyperlink, auto-fit and color-cue passes are one single-pass
+    ``styling`` stage; ``to_excel`` writes the values and ``save`` serializes.
+    """
+    company = {**pipeline.MOCK_COMPANY, "assessment_date": ASSESSMENT_DATE}
+
+    def evidence(state):
+        rows = pipeline.generate_ac_evidence(company=company, data_dir=data_dir, evidence_dir=evidence_dir)
+        state["evidence"] = scale_evidence(rows, scale["evidence_rows"])
+        return len(state["evidence"])
+
+    def manifest(state):
+        state["manifest_obj"] = EvidenceManifest(evidence_dir, work_dir / "manifest")
+        state["manifest_obj"].build()
+        state["manifest"] = state["manifest_obj"].to_frame()
+        return len(state["manifest"])
+
+    def monitoring(state):
+        state["monitoring"] = pipeline.generate_continuous_monitoring_data(
+            data_dir / "external_connections.json", ASSESSMENT_DATE, evidence_dir, work_dir / "state"
+        )
+        return scale["connections"]
+
+    def remote(state):
+        state["remote_access"] = pipeline.generate_remote_access_data(data_dir / "remote_access_logs.json")
+        return scale["sessions"]
+
+    def access(state):
+        state["access_exceptions"] = pipeline.generate_access_review_exceptions(
+            evidence_dir / "AC_3.1.1_Q3_Access_Review.csv"
+        )
+        return scale["accounts"]
+
+    def reuse(state):
+        state["identifier_reuse"] = pipeline.generate_identifier_reuse_violations(evidence_dir, ASSESSMENT_DATE)
+        return scale["accounts"] + scale["archived"]
+
+    def summary(state):
+        state["summary"] = pipeline.generate_assessment_summary(state["evidence"], company=company)
+        state["evidence"] = pipeline.attach_artifact_hashes(state["evidence"], state["manifest_obj"])
+        return len(state["evidence"])
+
+    def store(state):
+        data = {key: state[key] for key in ("evidence", "summary", "monitoring", "remote_access",
+                                            "access_exceptions", "identifier_reuse", "manifest")}
+        if store_available():
+            data = pipeline.persist_report_data(data, AssessmentStore(work_dir / "store"), ASSESSMENT_DATE)
+        state["sheets"] = pipeline.report_sheets(data)
+        return sum(len(df) for _, df, _ in state["sheets"])
+
+    def to_excel(state):
+        state["writer"] = pd.ExcelWriter(work_dir / "report.xlsx", engine="openpyxl")
+        for name, df, _ in state["sheets"]:
+            df.to_excel(state["writer"], sheet_name=name, index=False)
+        return sum(len(df) for _, df, _ in state["sheets"])
+
+    def styling(state):
+        cache = StyleCache()
+        for name, df, options in state["sheets"]:
+            style_worksheet(state["writer"].sheets[name], name, df, cache=cache, **options)
+        return sum(len(df) for _, df, _ in state["sheets"])
+
+    def save(state):
+        state.pop("writer").close()
+        state["stage_bytes"] = (work_dir / "report.xlsx").stat().st_size
+        return sum(len(df) for _, df, _ in state["sheets"])
+
+    def streaming(state):
+        out = pipeline.write_excel_report(work_dir / "report_streaming.xlsx", state["sheets"], engine="streaming")
+        state["stage_bytes"] = out.stat().st_size
+        return sum(len(df) for _, df, _ in state["sheets"])
+
+    return [
+        ("evidence", evidence),
+        ("manifest", manifest),
+        ("monitoring", monitoring),
+        ("remote_access", remote),
+        ("access_review", access),
+        ("identifier_reuse", reuse),
+        ("summary", summary),
+        ("store", store),
+        ("to_excel", to_excel),
+        ("styling", styling),
+        ("save", save),
+        ("streaming_engine", streaming),
+    ]
+
+
+def run_pipeline(data_dir, evidence_dir, work_dir, scale, trace_memory=False):
+    """One pass over every stage; returns {stage: {"wall_s", "rows"[, "bytes", "peak_mib"]}}."""
+    state, results = {}, {}
+    for name, stage in pipeline_stages(data_dir, evidence_dir, work_dir, scale):
+        clear_memos(evidence_dir, work_dir / "state")
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        rows = stage(state)
+        elapsed = time.perf_counter() - start
+        result = {"wall_s": elapsed, "rows": rows}
+        if "stage_bytes" in state:
+            result["bytes"] = state.pop("stage_bytes")
+        if trace_memory:
+            result["peak_mib"] = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        results[name] = result
+    return results
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                             text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every stage of the report pipeline")
+    parser.add_argument("--connections", type=int, default=5_000)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--accounts", type=int, default=20_000, help="Access review accounts")
+    parser.add_argument("--archived", type=int, default=50_000, help="Archived identifiers")
+    parser.add_argument("--log-lines", type=int, default=100_000, help="Firewall log lines")
+    parser.add_argument("--evidence-rows", type=int, default=5_000, help="Evidence rows (collected rows tiled)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes; the median per stage is reported")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the extra tracemalloc pass that measures peak memory per stage (it runs several "
+                             "times slower than the timed passes)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Also write the JSON result to this file")
+    args = parser.parse_args()
+    scale = {
+        "connections": args.connections,
+        "sessions": args.sessions,
+        "accounts": args.accounts,
+        "archived": args.archived,
+        "log_lines": args.log_lines,
+        "evidence_rows": args.evidence_rows,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        data_dir, evidence_dir = make_dataset(root, scale, args.seed)
+        dataset_s = time.perf_counter() - start
+        passes = []
+        for i in range(args.repeat):
+            work_dir = root / f"pass{i}"
+            work_dir.mkdir()
+            passes.append(run_pipeline(data_dir, evidence_dir, work_dir, scale))
+        memory = {}
+        if not args.no_memory:
+            work_dir = root / "memory"
+            work_dir.mkdir()
+            memory = run_pipeline(data_dir, evidence_dir, work_dir, scale, trace_memory=True)
+
+    stages = {}
+    for name in passes[0]:
+        wall = statistics.median(p[name]["wall_s"] for p in passes)
+        rows = passes[0][name]["rows"]
+        stages[name] = {
+            "wall_s": round(wall, 4),
+            "rows": rows,
+            "rows_per_s": round(rows / wall) if wall > 0 else None,
+        }
+        if "bytes" in passes[0][name]:
+            stages[name]["bytes"] = passes[0][name]["bytes"]
+        if name in memory:
+            stages[name]["peak_mib"] = round(memory[name]["peak_mib"], 2)
+    pipeline_s = sum(s["wall_s"] for name, s in stages.items() if name != "streaming_engine")
+
+    result = json.dumps(
+        {
+            "benchmark": "pipeline",
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "pandas": pd.__version__,
+            "pyarrow_store": store_available(),
+            "scale": scale,
+            "repeat": args.repeat,
+            "dataset_s": round(dataset_s, 3),
+            "pipeline_s": round(pipeline_s, 3),
+            "stages": stages,
+        },
+        indent=2,
+    )
+    print(result)
+    if args.output:
+        args.output.write_text(result + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the exporter library
+Measures cold ``import main`` time and time-to-first-report, each in a fresh
+interpreter so no module is already loaded
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+EXPORTER_DIR = Path(__file__).resolve().parent.parent / "exporter"
+
+IMPORT_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import main
+elapsed = time.perf_counter() - t0
+import sys
+heavy = sorted(m for m in ("pandas", "numpy", "openpyxl") if m in sys.modules)
+print({"import_s": elapsed, "heavy_modules_loaded": heavy})
+"""
+
+REPORT_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import main
+main.build_report({{"output_dir": {out!r}, "state_dir": {out!r}, "use_cache": False}})
+print({{"first_report_s": time.perf_counter() - t0}})
+"""
+
+
+def run_snippet(code):
+    """Run ``code`` in a fresh interpreter inside exporter/ and return its printed dict."""
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=EXPORTER_DIR, check=True, capture_output=True, text=True
+    ).stdout
+    return eval(out.strip().splitlines()[-1])  # noqa: S307 - our own snippet output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exporter cold import and time-to-first-report")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per measurement")
+    args = parser.parse_args()
+
+    imports = [run_snippet(IMPORT_SNIPPET) for _ in range(args.repeat)]
+    with tempfile.TemporaryDirectory() as tmp:
+        reports = [run_snippet(REPORT_SNIPPET.format(out=tmp)) for _ in range(args.repeat)]
+
+    result = {
+        "repeat": args.repeat,
+        "import_median_ms": round(statistics.median(r["import_s"] for r in imports) * 1000, 1),
+        "heavy_modules_loaded_on_import": imports[0]["heavy_modules_loaded"],
+        "first_report_median_ms": round(statistics.median(r["first_report_s"] for r in reports) * 1000, 1),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Styling engine benchmark
+Times the single-pass styling of an evidence sheet at increasing row counts;
+the per-row cost should stay roughly constant (linear scaling)
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd  # pyright: ignore[reportMissingModuleSource]
+from openpyxl import Workbook  # pyright: ignore[reportMissingModuleSource]
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "exporter"))
+
+from styling import StyleCache, style_worksheet  # noqa: E402
+
+STATUSES = ["COMPLIANT", "", "PARTIALLY_COMPLIANT", "", "NON_COMPLIANT"]
+
+
+def synthetic_evidence(n_rows):
+    """Evidence-shaped DataFrame with ``n_rows`` rows."""
+    idx = pd.RangeIndex(n_rows)
+    return pd.DataFrame(
+        {
+            "control_id": "AC.L2-3.1." + (idx % 20 + 1).astype(str),
+            "control_name": "Control Name",
+            "status": [STATUSES[i % len(STATUSES)] for i in range(n_rows)],
+            "implementation": "Role-based access control via Google Cloud Identity",
+            "evidence": "Evidence artifact " + idx.astype(str),
+            "test_result": "Verified sample users - all properly provisioned",
+            "last_tested": "2024-09-05 14:23:45",
+        }
+    )
+
+
+def time_styling(n_rows):
+    """Seconds spent styling a populated worksheet of ``n_rows`` rows."""
+    df = synthetic_evidence(n_rows)
+    wb = Workbook()
+    ws = wb.active
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        ws.append(row)
+    hyperlinks = {r: f"https://example.invalid/{r}" for r in range(2, n_rows + 2, 10)}
+
+    start = time.perf_counter()
+    style_worksheet(ws, "AC_Controls_Evidence", df, hyperlinks=hyperlinks,
+                    link_column="evidence", cache=StyleCache())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the single-pass styling engine")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 50_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'seconds':>10} {'us/row':>10}")
+    for n in args.rows:
+        elapsed = time_styling(n)
+        print(f"{n:>10} {elapsed:>10.3f} {elapsed / n * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
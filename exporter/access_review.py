@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Access review analysis for AC.L2-3.1.1
+Reads IdP/AD account exports (the Q3 access review schema) in chunks with
+typed, categorical columns and flags stale accounts, CUI holders without an
+approved review and accounts whose manager is missing or inactive, all with
+vectorized date arithmetic
+"""
+
+import threading
+from pathlib import Path
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+import pandas as pd  # pyright: ignore[reportMissingModuleSource]
+
+DEFAULT_CHUNKSIZE = 100_000
+STALE_DAYS = 30  # "Disabled - No login 30+ days"
+
+# Export column -> dtype; categoricals keep repeated values to one copy each
+REVIEW_DTYPES = {
+    "Username": "string",
+    "Full Name": "string",
+    "Department": "category",
+    "CUI Access": "category",
+    "Last Login": "string",
+    "Manager": "string",
+    "Review Status": "category",
+    "Action Taken": "category",
+}
+CATEGORY_COLUMNS = [col for col, dtype in REVIEW_DTYPES.items() if dtype == "category"]
+DISABLED_ACTIONS = ("disabled", "removed", "revoked", "deprovisioned")
+EXCEPTION_COLUMNS = ["username", "full_name", "department", "exception", "detail", "action_taken", "state"]
+
+
+def read_review_export(path, chunksize=DEFAULT_CHUNKSIZE):
+    """The access review export as one typed DataFrame, parsed chunk by chunk."""
+    chunks = []
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=REVIEW_DTYPES, usecols=lambda c: c in REVIEW_DTYPES):
+        chunk = chunk.reindex(columns=list(REVIEW_DTYPES))
+        chunk["Last Login"] = pd.to_datetime(chunk["Last Login"], errors="coerce", format="ISO8601")
+        chunks.append(chunk)
+    if not chunks:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in REVIEW_DTYPES.items()})
+    accounts = pd.concat(chunks, ignore_index=True)
+    # per-chunk categories differ, so concat falls back to object; re-intern once
+    for col in CATEGORY_COLUMNS:
+        accounts[col] = accounts[col].astype("category")
+    return accounts
+
+
+def flag_accounts(accounts, as_of=None, stale_days=STALE_DAYS):
+    """Per-account boolean flags (vectorized); returns (flags DataFrame, as_of Timestamp).
+
+    ``as_of`` defaults to the export's snapshot date, i.e. its most recent
+    login, so an older export is judged as of when it was taken.
+    """
+    last_login = accounts["Last Login"]
+    if as_of is None:
+        as_of = last_login.max() if last_login.notna().any() else pd.Timestamp.now()
+    as_of = pd.Timestamp(as_of).normalize()
+
+    days_idle = (as_of - last_login).dt.days
+    action = accounts["Action Taken"].astype("string").str.strip().str.lower().fillna("")
+    disabled = action.str.startswith(DISABLED_ACTIONS)
+    cui = accounts["CUI Access"].astype("string").str.strip().str.lower().isin(["yes", "true", "y", "1"])
+    approved = accounts["Review Status"].astype("string").str.strip().str.lower().eq("approved").fillna(False)
+    stale = (days_idle >= stale_days) | last_login.isna()
+
+    # managers resolve to accounts by full name or username (hashed Index lookup)
+    inactive_accounts = accounts.loc[disabled | stale]
+    inactive = pd.Index(
+        pd.concat([inactive_accounts["Full Name"], inactive_accounts["Username"]])
+        .astype("string").str.strip().str.lower().dropna().unique().to_numpy(dtype=object)
+    )
+    manager = accounts["Manager"].astype("string").str.strip()
+    no_manager = (manager.isna() | manager.eq("")).to_numpy(dtype=bool)
+    manager_key = manager.str.lower().to_numpy(dtype=object, na_value="")
+    orphaned = no_manager | (inactive.get_indexer(manager_key) >= 0)
+
+    flags = pd.DataFrame(
+        {
+            "days_idle": days_idle.astype("Int64"),
+            "disabled": disabled.to_numpy(dtype=bool),
+            "cui": cui.to_numpy(dtype=bool),
+            "stale": stale.to_numpy(dtype=bool),
+            "cui_unapproved": (cui & ~approved).to_numpy(dtype=bool),
+            "orphaned_manager": orphaned,
+            "no_manager": no_manager,
+        },
+        index=accounts.index,
+    )
+    return flags, as_of
+
+
+def exception_rows(accounts, flags):
+    """Long-form exceptions, one row per (account, exception type)."""
+    exceptions = {
+        "Stale account": "stale",
+        "CUI access without approved review": "cui_unapproved",
+        "Orphaned manager": "orphaned_manager",
+    }
+    positions = [np.flatnonzero(flags[flag].to_numpy()) for flag in exceptions.values()]
+    rows = np.concatenate(positions)
+    kind = np.repeat(list(exceptions), [len(p) for p in positions])
+    flagged = accounts.take(rows).reset_index(drop=True)
+    sub = flags.take(rows).reset_index(drop=True)
+
+    idle = ("No login for " + sub["days_idle"].astype("string") + " days").fillna("No recorded login")
+    review = "Review status: " + flagged["Review Status"].astype("string").fillna("none")
+    manager = pd.Series(
+        np.where(sub["no_manager"], "No manager assigned",
+                 "Manager " + flagged["Manager"].astype("string").fillna("") + " is inactive"),
+    )
+    detail = np.select(
+        [kind == "Stale account", kind == "CUI access without approved review"],
+        [idle.to_numpy(dtype=object), review.to_numpy(dtype=object)],
+        default=manager.to_numpy(dtype=object),
+    )
+    return pd.DataFrame(
+        {
+            "username": flagged["Username"],
+            "full_name": flagged["Full Name"],
+            "department": flagged["Department"].astype("string"),
+            "exception": kind,
+            "detail": detail,
+            "action_taken": flagged["Action Taken"].astype("string"),
+            "state": np.where(sub["disabled"], "Resolved", "Open"),
+        },
+        columns=EXCEPTION_COLUMNS,
+    ).fillna("")
+
+
+def analyze_access_review(path, as_of=None, chunksize=DEFAULT_CHUNKSIZE, stale_days=STALE_DAYS):
+    """Analyze an access review export; returns (summary dict, exceptions DataFrame)."""
+    accounts = read_review_export(path, chunksize)
+    flags, as_of = flag_accounts(accounts, as_of, stale_days)
+    exceptions = exception_rows(accounts, flags)
+
+    open_exceptions = exceptions[exceptions["state"] == "Open"]
+    open_counts = open_exceptions["exception"].value_counts()
+    summary = {
+        "accounts": int(len(accounts)),
+        "cui_accounts": int(flags["cui"].sum()),
+        "as_of": as_of.strftime("%Y-%m-%d"),
+        "stale_days": stale_days,
+        "stale": int(flags["stale"].sum()),
+        "disabled": int(flags["disabled"].sum()),
+        "open_exceptions": int(len(open_exceptions)),
+        "resolved_exceptions": int(len(exceptions) - len(open_exceptions)),
+        "open_stale": int(open_counts.get("Stale account", 0)),
+        "open_cui_unapproved": int(open_counts.get("CUI access without approved review", 0)),
+        "open_orphaned": int(open_counts.get("Orphaned manager", 0)),
+    }
+    return summary, exceptions
+
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+
+def analyze_access_review_cached(path, as_of=None, chunksize=DEFAULT_CHUNKSIZE):
+    """``analyze_access_review`` memoized per (path, size, mtime, as_of) within the process.
+
+    Lets the 3.1.1 collector and the Access_Review_Exceptions sheet share one pass.
+    """
+    st = Path(path).stat()
+    key = (str(Path(path).resolve()), st.st_size, st.st_mtime_ns, str(as_of))
+    with _memo_lock:
+        if key not in _memo:
+            _memo.clear()
+            _memo[key] = analyze_access_review(path, as_of, chunksize)
+        summary, exceptions = _memo[key]
+    return dict(summary), exceptions.copy()
+
+
+def evidence_result(summary):
+    """Main-row fields for the AC.L2-3.1.1 evidence row."""
+    compliant = summary["open_exceptions"] == 0
+    result = {
+        "status": "COMPLIANT" if compliant else "PARTIALLY_COMPLIANT",
+        "implementation": "Role-based access control via Google Cloud Identity + Active Directory",
+        "test_result": (
+            f"Reviewed {summary['accounts']} accounts ({summary['cui_accounts']} with CUI access) "
+            f"as of {summary['as_of']}: {summary['stale']} stale ({summary['stale_days']}+ days without login), "
+            f"{summary['resolved_exceptions']} exceptions remediated, {summary['open_exceptions']} open"
+        ),
+    }
+    if not compliant:
+        result["finding"] = (
+            f"{summary['open_stale']} stale accounts still enabled, "
+            f"{summary['open_cui_unapproved']} CUI holders without an approved review, "
+            f"{summary['open_orphaned']} accounts with a missing or inactive manager"
+        )
+        result["remediation"] = "Disable stale accounts and complete outstanding access reviews"
+    return result
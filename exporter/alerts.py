@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Attestation alert stream processor for AC.L2-3.1.20
+Consumes monitoring alerts from a tailed JSON-lines file, the
+monitoring_alerts.json document or a local queue, drops repeats of the same
+connection_id/alert_type inside a time window and keeps per-connection alert
+state in an in-memory index. The index is checkpointed under
+output/alert_state/ so a report run only reads alerts that arrived since the
+previous one
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import queue
+import time
+from datetime import datetime
+from pathlib import Path
+
+from collectors import DATA_DIR, REPO_ROOT
+
+DEFAULT_WINDOW_HOURS = 24.0
+DEFAULT_STATE_DIR = REPO_ROOT / "output" / "alert_state"
+TAIL_SUFFIXES = (".jsonl", ".ndjson")
+HEAD_BYTES = 4096  # fingerprint of the file start, detects rotation/truncation
+
+
+def _epoch(timestamp):
+    """Seconds since the epoch for an ISO-8601 timestamp, or None."""
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(str(timestamp).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class AlertIndex:
+    """Per-connection alert state with per (connection_id, alert_type) dedup.
+
+    An alert is a repeat when an alert of the same type for the same connection
+    was accepted less than ``window_hours`` earlier (or later, for events that
+    arrive out of order); repeats only bump the connection's ``suppressed``
+    counter.
+    """
+
+    def __init__(self, window_hours=DEFAULT_WINDOW_HOURS):
+        self.window_hours = window_hours
+        self.connections = {}  # connection_id -> state dict
+        self.accepted = 0
+        self.suppressed = 0
+        self.rejected = 0  # malformed alerts (unparseable, or no connection, type or timestamp)
+
+    def add(self, alert):
+        """Index one alert; returns True if it was accepted (not a repeat)."""
+        if not isinstance(alert, dict):
+            self.rejected += 1
+            return False
+        conn_id, alert_type = alert.get("connection_id"), alert.get("alert_type")
+        ts = _epoch(alert.get("timestamp"))
+        if not conn_id or not alert_type or ts is None:
+            self.rejected += 1
+            return False
+
+        state = self.connections.get(str(conn_id))
+        if state is None:
+            state = self.connections[str(conn_id)] = {
+                "alerts": 0, "suppressed": 0, "last_seen": {},
+                "last_type": None, "last_time": None, "last_timestamp": None,
+                "severity": None, "action_taken": None,
+            }
+        previous = state["last_seen"].get(alert_type)
+        if previous is not None and abs(ts - previous) < self.window_hours * 3600:
+            state["suppressed"] += 1
+            self.suppressed += 1
+            return False
+
+        state["alerts"] += 1
+        state["last_seen"][alert_type] = ts if previous is None else max(previous, ts)
+        if state["last_time"] is None or ts >= state["last_time"]:
+            state.update(
+                last_type=alert_type, last_time=ts, last_timestamp=str(alert["timestamp"]),
+                severity=alert.get("severity"), action_taken=alert.get("action_taken"),
+            )
+        self.accepted += 1
+        return True
+
+    def counts(self):
+        """Deduplicated alerts per connection_id."""
+        return {conn_id: state["alerts"] for conn_id, state in self.connections.items()}
+
+    def last_alert(self, conn_id):
+        """"<alert_type> <timestamp>" of the connection's latest alert, or ""."""
+        state = self.connections.get(str(conn_id))
+        if not state or not state["last_type"]:
+            return ""
+        return f"{state['last_type']} {state['last_timestamp']}"
+
+    def to_dict(self):
+        return {
+            "window_hours": self.window_hours,
+            "connections": self.connections,
+            "accepted": self.accepted,
+            "suppressed": self.suppressed,
+            "rejected": self.rejected,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls(data["window_hours"])
+        index.connections = data["connections"]
+        index.accepted, index.suppressed, index.rejected = data["accepted"], data["suppressed"], data["rejected"]
+        return index
+
+
+def iter_alert_file(path, offset=0):
+    """(alert, end offset) pairs from ``path``, starting at byte ``offset``.
+
+    JSON-lines files are read line by line and only complete lines are consumed,
+    so a writer appending concurrently is picked up on the next call; a line that
+    is not valid JSON is yielded as ``None`` so the offset still moves past it. A
+    ``{"alerts": [...]}`` document cannot be appended to and is read whole.
+    """
+    path = Path(path)
+    if path.suffix.lower() in TAIL_SUFFIXES:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partially written line; retry on the next read
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    alert = json.loads(line)
+                except ValueError:  # also covers undecodable bytes
+                    alert = None
+                yield alert, offset
+        return
+    with open(path, encoding="utf-8") as f:
+        alerts = json.load(f).get("alerts", [])
+    end = path.stat().st_size
+    for alert in alerts:
+        yield alert, end
+
+
+class AlertStreamProcessor:
+    """Feeds an ``AlertIndex`` from one alert source and checkpoints it."""
+
+    def __init__(self, path=DATA_DIR / "monitoring_alerts.json", window_hours=DEFAULT_WINDOW_HOURS,
+                 state_dir=DEFAULT_STATE_DIR):
+        self.path = Path(path)
+        self.window_hours = window_hours
+        self.state_dir = Path(state_dir) if state_dir is not None else None
+        self.index = AlertIndex(window_hours)
+        self.offset = 0
+        self._stat = None  # (size, mtime_ns) of the source when last read
+
+    @property
+    def tailing(self):
+        return self.path.suffix.lower() in TAIL_SUFFIXES
+
+    @property
+    def checkpoint_path(self):
+        key = hashlib.sha1(str(self.path.resolve()).encode()).hexdigest()[:16]
+        return self.state_dir / f"{key}.json"
+
+    def _head(self, length):
+        with open(self.path, "rb") as f:
+            return hashlib.sha256(f.read(min(length, HEAD_BYTES))).hexdigest()
+
+    def load_checkpoint(self):
+        """Resume from the saved index if it still describes this source."""
+        if self.state_dir is None or not self.checkpoint_path.exists() or not self.path.exists():
+            return False
+        try:
+            saved = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        st = self.path.stat()
+        if saved.get("window_hours") != self.window_hours:
+            return False
+        if self.tailing:
+            if st.st_size < saved["offset"] or self._head(saved["offset"]) != saved["head"]:
+                return False  # truncated or rotated
+        elif [st.st_size, st.st_mtime_ns] != saved["stat"]:
+            return False  # a rewritten document is re-read in full
+        self.index = AlertIndex.from_dict(saved["index"])
+        self.offset = saved["offset"]
+        self._stat = tuple(saved["stat"])
+        return True
+
+    def save_checkpoint(self):
+        """Atomically write the index and read position."""
+        if self.state_dir is None or not self.path.exists():
+            return
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        data = {
+            "source": str(self.path.resolve()),
+            "window_hours": self.window_hours,
+            "offset": self.offset,
+            "head": self._head(self.offset),
+            "stat": list(self._stat) if self._stat else None,
+            "index": self.index.to_dict(),
+        }
+        tmp = self.checkpoint_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, self.checkpoint_path)
+
+    def catch_up(self):
+        """Index alerts added to the source since the last read; returns how many were read."""
+        if not self.path.exists():
+            return 0
+        st = self.path.stat()
+        if not self.tailing and (st.st_size, st.st_mtime_ns) == self._stat:
+            return 0
+        if not self.tailing or st.st_size < self.offset:
+            self.index, self.offset = AlertIndex(self.window_hours), 0
+        read = 0
+        for alert, self.offset in iter_alert_file(self.path, self.offset):
+            self.index.add(alert)
+            read += 1
+        self._stat = (st.st_size, st.st_mtime_ns)
+        return read
+
+    def follow(self, poll_seconds=1.0, checkpoint_every=60.0):
+        """Tail the source forever, yielding the number of alerts read per poll."""
+        last_checkpoint = time.monotonic()
+        while True:
+            read = self.catch_up()
+            if read:
+                yield read
+            if time.monotonic() - last_checkpoint >= checkpoint_every:
+                self.save_checkpoint()
+                last_checkpoint = time.monotonic()
+            time.sleep(poll_seconds)
+
+    def consume(self, alert_queue, timeout=None):
+        """Index alerts from a local ``queue.Queue`` until a ``None`` sentinel (or ``timeout``)."""
+        read = 0
+        while True:
+            try:
+                alert = alert_queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if alert is None:
+                break
+            self.index.add(alert)
+            read += 1
+        return read
+
+
+def load_alert_index(path=DATA_DIR / "monitoring_alerts.json", window_hours=DEFAULT_WINDOW_HOURS,
+                     state_dir=DEFAULT_STATE_DIR):
+    """Current alert index for ``path``, reading only what arrived since the last checkpoint."""
+    processor = AlertStreamProcessor(path, window_hours, state_dir)
+    processor.load_checkpoint()
+    if processor.catch_up():
+        processor.save_checkpoint()
+    return processor.index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tail the AC.L2-3.1.20 monitoring alert feed")
+    parser.add_argument("path", nargs="?", default=str(DATA_DIR / "monitoring_alerts.json"))
+    parser.add_argument("--window-hours", type=float, default=DEFAULT_WINDOW_HOURS,
+                        help="Drop repeats of a connection/alert type inside this window")
+    parser.add_argument("--poll", type=float, default=1.0, help="Seconds between reads of the source")
+    args = parser.parse_args()
+
+    processor = AlertStreamProcessor(args.path, args.window_hours)
+    processor.load_checkpoint()
+    print(f"🔔 Following {args.path}")
+    try:
+        for read in processor.follow(args.poll):
+            index = processor.index
+            print(f"   +{read} alerts: {index.accepted} accepted, {index.suppressed} suppressed, "
+                  f"{len(index.connections)} connections")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        processor.save_checkpoint()
+
+
+if __name__ == "__main__":
+    main()
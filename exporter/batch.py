@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Multi-tenant batch mode for the CMMC AC assessment
+Reads a manifest of company/enclave configurations and generates every
+workbook in parallel on a process pool, with a per-job progress and failure
+report, a combined status rollup and per-assessment trends from the shared
+run history
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd  # pyright: ignore[reportMissingModuleSource]
+
+import main as exporter
+from collectors import DATA_DIR, EVIDENCE_DIR
+from metrics import METRICS_FORMATS, Metrics, metrics_sink
+from store import AssessmentStore, available as store_available
+from summary import HISTORY_KEYS, ROLLUP_DIMENSIONS, history_trends, load_history, main_rows, rollup_assessments
+
+# Manifest format (JSON):
+# {
+#   "jobs": [
+#     {
+#       "id": "acme-enclave-a",                           # also the assessment key in the run history
+#       "company": {"name": "Acme Corp", "assessment_date": "2024-09-30", ...},
+#       "controls": ["AC.L2-3.1.1", "AC.L2-3.1.20"],      # optional, default: all (also limits the sheets)
+#       "data_dir": "clients/acme/mock_data",             # optional, relative to manifest
+#       "evidence_dir": "clients/acme/evidence_samples",  # optional, relative to manifest
+#       "business_unit": "Aerospace", "enclave": "A", "quarter": "2024-Q3"  # optional rollup keys
+#     }
+#   ]
+# }
+
+JOB_ID_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")  # ids name per-job files and state dirs
+
+
+def load_manifest(path):
+    """Jobs from a manifest file, with directories resolved against the manifest location.
+
+    Raises ValueError for duplicate job ids or ids that are not safe as a path component.
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        jobs = json.load(f)["jobs"]
+    base = path.resolve().parent
+    seen = set()
+    for i, job in enumerate(jobs):
+        job.setdefault("id", f"job-{i + 1}")
+        job_id = job["id"]
+        if not isinstance(job_id, str) or not JOB_ID_PATTERN.fullmatch(job_id):
+            raise ValueError(f"Job id {job_id!r} must be letters, digits, '.', '_' or '-' (not starting with '.')")
+        if job_id in seen:
+            raise ValueError(f"Duplicate job id {job_id!r} in {path}")
+        seen.add(job_id)
+        for key, default in (("data_dir", DATA_DIR), ("evidence_dir", EVIDENCE_DIR)):
+            job[key] = str(base / job[key]) if job.get(key) else str(default)
+    return jobs
+
+
+def history_path(output_dir):
+    """Run history shared by every job of a batch writing to ``output_dir``."""
+    return Path(output_dir) / "assessment_history.csv"
+
+
+def run_job(job, output_dir, engine="openpyxl", use_cache=True, use_store=True, link_mode="github",
+            metrics_format="json"):
+    """Generate one workbook; runs in a worker process.
+
+    Each job gets its own columnar store under <output_dir>/assessment_store/<id>
+    (when pyarrow is installed), its own state (evidence cache, log indexes,
+    alert checkpoints, manifest) under <output_dir>/state/<id> and its own stage
+    metrics file <output_dir>/pipeline_metrics_<id>.jsonl|.prom. Its run is recorded in the
+    batch history under (company name, job id). Returns a result dict (with
+    per-stage seconds); failures are reported, never raised.
+    """
+    started = time.perf_counter()
+    result = {"id": job["id"], "ok": False, "output": None, "error": None}
+    cache = None
+    metrics = Metrics()
+    try:
+        company = {**exporter.MOCK_COMPANY, "assessment_id": job["id"], **job.get("company", {})}
+        controls = None
+        if job.get("controls"):
+            unknown = sorted(set(job["controls"]) - set(exporter.AC_CONTROLS))
+            if unknown:
+                raise ValueError(f"Unknown control(s): {', '.join(unknown)}")
+            controls = {cid: exporter.AC_CONTROLS[cid] for cid in job["controls"]}
+        state_dir = Path(output_dir) / "state" / job["id"]
+        if use_cache:
+            cache = exporter.EvidenceCache(exporter.state_paths(state_dir)["cache"])
+        sink = metrics_sink(metrics_format, output_dir, name=f"pipeline_metrics_{job['id']}")
+        metrics = Metrics([sink] if sink else [], labels={"job": job["id"], "company": company["name"],
+                                                          "assessment_date": company["assessment_date"]})
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_file = Path(output_dir) / f"cmmc_ac_assessment_{job['id']}_{timestamp}.xlsx"
+        store = None
+        if use_store and store_available():
+            store = AssessmentStore(Path(output_dir) / "assessment_store" / job["id"])
+        output_file, data = exporter.render_report(
+            output_file, engine=engine, cache=cache, store=store, link_mode=link_mode, metrics=metrics,
+            company=company, controls=controls, data_dir=job["data_dir"], evidence_dir=job["evidence_dir"],
+            state_dir=state_dir, history_path=history_path(output_dir),
+        )
+
+        status_rows = main_rows(data["evidence"])[["control_id", "status"]].copy()
+        status_rows["assessment"] = job["id"]
+        for dim in ROLLUP_DIMENSIONS:
+            status_rows[dim] = job.get(dim, "")
+        result.update(ok=True, output=str(output_file), status_rows=status_rows.to_dict("records"))
+    except Exception as exc:  # noqa: BLE001 - reported per job
+        result["error"] = f"{type(exc).__name__}: {exc}"
+        result["traceback"] = traceback.format_exc()
+    finally:
+        if cache is not None:
+            cache.close()
+        metrics.close()
+    result["stages"] = {r["stage"]: r["seconds"] for r in metrics.records}
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_batch(jobs, output_dir="output", max_workers=None, engine="openpyxl", use_cache=True, use_store=True,
+              link_mode="github", metrics_format="json"):
+    """Run ``jobs`` on a process pool sized to the available cores.
+
+    Prints one progress line per finished job and returns the results in
+    manifest order.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if max_workers is None:
+        max_workers = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    max_workers = max(1, min(max_workers, len(jobs) or 1))
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(run_job, job, output_dir, engine, use_cache, use_store, link_mode, metrics_format): job["id"] for job in jobs}
+        for done, future in enumerate(as_completed(futures), start=1):
+            job_id = futures[future]
+            try:
+                result = future.result()
+            except Exception as exc:  # worker crashed (e.g. killed); run_job itself never raises
+                result = {"id": job_id, "ok": False, "output": None, "error": f"{type(exc).__name__}: {exc}"}
+            results[job_id] = result
+            mark = "✓" if result["ok"] else "✗"
+            detail = result["output"] if result["ok"] else result["error"]
+            print(f"   [{done}/{len(jobs)}] {mark} {job_id} ({result.get('seconds', 0):.1f}s) {detail}")
+    return [results[job["id"]] for job in jobs]
+
+
+def write_batch_report(results, output_dir="output"):
+    """Write the per-job report (JSON), the cross-assessment rollup (CSV) and the
+    trends of this batch's assessments against their previous runs (CSV).
+
+    Returns (report file, rollup file or None, trends file or None).
+    """
+    output_dir = Path(output_dir)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_file = output_dir / f"batch_report_{timestamp}.json"
+    report = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "jobs": len(results),
+        "succeeded": sum(r["ok"] for r in results),
+        "failed": sum(not r["ok"] for r in results),
+        "results": [{k: v for k, v in r.items() if k != "status_rows"} for r in results],
+    }
+    report_file.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    rollup_file = None
+    status_rows = [row for r in results if r["ok"] for row in r["status_rows"]]
+    if status_rows:
+        rollup = rollup_assessments(pd.DataFrame(status_rows))
+        rollup_file = output_dir / f"batch_rollup_{timestamp}.csv"
+        rollup.to_csv(rollup_file, index=False)
+
+    trends_file = None
+    history = load_history(history_path(output_dir))
+    if not history.empty:
+        assessments = {r["id"] for r in results if r["ok"]}
+        trends = history_trends(history, HISTORY_KEYS)
+        trends = trends[trends["assessment"].isin(assessments)]
+        if not trends.empty:
+            trends_file = output_dir / f"batch_trends_{timestamp}.csv"
+            trends.to_csv(trends_file, index=False)
+    return report_file, rollup_file, trends_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CMMC AC Controls Assessment - batch mode")
+    parser.add_argument("manifest", help="JSON manifest of company/enclave jobs")
+    parser.add_argument("--output-dir", default="output", help="Directory for workbooks and reports")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: available cores)")
+    parser.add_argument("--engine", choices=["openpyxl", "streaming"], default="openpyxl", help="Excel output engine")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the evidence cache")
+    parser.add_argument("--no-store", action="store_true", help="Do not persist to the columnar (Parquet) store")
+    parser.add_argument("--links", choices=exporter.LINK_MODES, default="github",
+                        help="Evidence hyperlinks: GitHub URLs or paths relative to the workbooks")
+    parser.add_argument("--metrics", choices=METRICS_FORMATS, default="json",
+                        help="Per-stage metrics per job: JSON lines or a Prometheus text file in the output dir")
+    args = parser.parse_args()
+
+    try:
+        jobs = load_manifest(args.manifest)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"\n📋 Batch assessment: {len(jobs)} jobs from {args.manifest}")
+    results = run_batch(jobs, args.output_dir, args.workers, args.engine,
+                        use_cache=not args.no_cache, use_store=not args.no_store, link_mode=args.links,
+                        metrics_format=args.metrics)
+    report_file, rollup_file, trends_file = write_batch_report(results, args.output_dir)
+
+    failed = [r for r in results if not r["ok"]]
+    print(f"\n✅ {len(results) - len(failed)} of {len(results)} assessments generated")
+    if failed:
+        print(f"❌ {len(failed)} failed: {', '.join(r['id'] for r in failed)}")
+    print(f"📁 Batch report: {report_file}")
+    if rollup_file:
+        print(f"📊 Rollup: {rollup_file}")
+    if trends_file:
+        print(f"📈 Trends vs previous runs: {trends_file}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Pluggable evidence collectors for the CMMC AC controls
+One collector per control; a thread-pool scheduler runs them concurrently
+with per-collector timeouts
+"""
+
+import json
+import re
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = REPO_ROOT / "mock_data"
+EVIDENCE_DIR = REPO_ROOT / "evidence_samples"
+
+DEFAULT_TIMEOUT = 30.0
+
+
+class EvidenceCollector:
+    """Base collector: subclasses set ``control_id``/``artifacts`` and implement ``assess``.
+
+    ``artifacts`` is an ordered tuple of (filename, evidence label); the first one
+    goes on the control's main row, the rest become continuation rows. Each row
+    carries its filename in the ``artifact`` column (the hyperlink target).
+    ``data_files`` lists the mock_data inputs read by ``assess``. ``assess``
+    returns the main-row fields (status, implementation, test_result and
+    optionally finding/remediation). Set ``date_sensitive`` when the rows depend
+    on ``assessment_date`` so cached evidence is keyed on it.
+    """
+
+    control_id = None
+    artifacts = ()
+    data_files = ()
+    date_sensitive = False
+    timeout = DEFAULT_TIMEOUT
+
+    def __init__(self, control, data_dir=DATA_DIR, evidence_dir=EVIDENCE_DIR, timeout=None, assessment_date=None):
+        self.control = control
+        self.data_dir = Path(data_dir)
+        self.evidence_dir = Path(evidence_dir)
+        self.assessment_date = assessment_date or datetime.now().strftime("%Y-%m-%d")
+        if timeout is not None:
+            self.timeout = timeout
+
+    # Input helpers -------------------------------------------------------
+    def load_json(self, name):
+        with open(self.data_dir / name, encoding="utf-8") as f:
+            return json.load(f)
+
+    def artifact_path(self, filename):
+        return self.evidence_dir / filename
+
+    def inputs(self):
+        """Every file this collector reads (used for content-hash caching)."""
+        return [self.artifact_path(f) for f, _ in self.artifacts] + [self.data_dir / f for f in self.data_files]
+
+    def missing_artifacts(self):
+        return [f for f, _ in self.artifacts if not self.artifact_path(f).exists()]
+
+    # Collection ----------------------------------------------------------
+    def assess(self):
+        raise NotImplementedError
+
+    def collect(self):
+        """Evidence rows for this control (main row + continuation rows)."""
+        result = self.assess()
+        missing = self.missing_artifacts()
+        if missing:
+            result.setdefault("finding", "")
+            note = "Missing artifact(s): " + ", ".join(missing)
+            result["finding"] = f"{result['finding']}; {note}" if result["finding"] else note
+        return self.rows(result)
+
+    def rows(self, result):
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        extra = [k for k in ("finding", "remediation") if k in result]
+        artifacts = list(self.artifacts) or [("", "")]
+        rows = [
+            {
+                "control_id": self.control_id,
+                "control_name": self.control["name"],
+                "status": result["status"],
+                "implementation": result["implementation"],
+                "evidence": artifacts[0][1],
+                "artifact": artifacts[0][0],
+                "test_result": result["test_result"],
+                "last_tested": now,
+                **{k: result[k] for k in extra},
+            }
+        ]
+        for filename, label in artifacts[1:]:
+            row = {k: "" for k in rows[0]}
+            row["evidence"] = label
+            row["artifact"] = filename
+            rows.append(row)
+        return rows
+
+    def failure_rows(self, reason):
+        """Rows reported when the collector fails or times out."""
+        return self.rows(
+            {
+                "status": "NOT_ASSESSED",
+                "implementation": "",
+                "test_result": reason,
+                "finding": f"Evidence collection failed: {reason}",
+            }
+        )
+
+
+class AccessControlCollector(EvidenceCollector):
+    control_id = "AC.L2-3.1.1"
+    artifacts = (
+        ("AC_3.1.1_Access_Control_Policy.md", "Access Control Policy"),
+        ("AC_3.1.1_Q3_Access_Review.csv", "Q3 Access Review"),
+    )
+
+    def assess(self):
+        from access_review import analyze_access_review_cached, evidence_result as access_review_result
+
+        summary, _ = analyze_access_review_cached(self.artifact_path("AC_3.1.1_Q3_Access_Review.csv"))
+        return access_review_result(summary)
+
+
+class CUIFlowCollector(EvidenceCollector):
+    control_id = "AC.L2-3.1.3"
+    artifacts = (("AC_3.1.3_CUI_Network_Segmentation_Diagram.png", "Network Segmentation Diagram"),)
+
+    def assess(self):
+        return {
+            "status": "COMPLIANT",
+            "implementation": "CUI isolated in dedicated VPC with DLP policies",
+            "test_result": "Firewall rules validated, DLP blocking test successful",
+        }
+
+
+class SessionLockCollector(EvidenceCollector):
+    control_id = "AC.L2-3.1.6"
+    artifacts = (
+        ("AC_3.1.6_Session_Lock_GPO.xml", "GPO Config"),
+        ("AC_3.1.6_Session_Lock_Test_Results.md", "Session Lock Test Results"),
+    )
+
+    def test_summary(self):
+        """(tested, failed) from the Summary of the session lock test results, or None."""
+        path = self.artifact_path("AC_3.1.6_Session_Lock_Test_Results.md")
+        if not path.exists():
+            return None
+        text = path.read_text(encoding="utf-8")
+        tested = re.search(r"Total Tested:\s*(\d+)", text)
+        failed = re.search(r"Failed:\s*(\d+)", text)
+        if tested is None:
+            return None
+        return int(tested.group(1)), int(failed.group(1)) if failed else 0
+
+    def assess(self):
+        settings = ET.parse(self.artifact_path("AC_3.1.6_Session_Lock_GPO.xml")).getroot().find("Settings")
+        timeout_min = int(settings.findtext("ScreenSaverTimeout", "0")) // 60
+        secure = settings.findtext("ScreenSaverSecure") == "Enabled"
+        compliant = secure and 0 < timeout_min <= 15
+        result = {"implementation": f"{timeout_min}-minute timeout enforced via GPO and Workspace policy"}
+        tested = self.test_summary()
+        if tested is None:
+            result["test_result"] = f"GPO sets a {timeout_min}-minute lock; no workstation test results recorded"
+        elif tested[1]:
+            compliant = False
+            result["test_result"] = f"Tested {tested[0]} workstations - {tested[1]} did not lock"
+            result["finding"] = f"{tested[1]} of {tested[0]} sampled workstations failed the session lock test"
+        else:
+            result["test_result"] = f"Tested {tested[0]} random workstations - all locked at {timeout_min} minutes"
+        return {"status": "COMPLIANT" if compliant else "NON_COMPLIANT", **result}
+
+
+class IdentifierReuseCollector(EvidenceCollector):
+    control_id = "AC.L2-3.1.7"
+    artifacts = (("AC_3.1.7_Identity_Management_Procedure.md", "Identity Management Procedure"),)
+    accounts_file = "AC_3.1.1_Q3_Access_Review.csv"  # current accounts checked against the archive
+    date_sensitive = True  # reuse windows are measured up to the assessment date
+
+    def inputs(self):
+        return super().inputs() + [self.artifact_path(self.accounts_file)]
+
+    def assess(self):
+        from identifier_reuse import analyze_identifier_reuse_cached, evidence_result as identifier_reuse_result
+
+        summary, _ = analyze_identifier_reuse_cached(
+            self.artifact_path(self.artifacts[0][0]), self.artifact_path(self.accounts_file), self.assessment_date
+        )
+        return identifier_reuse_result(summary)
+
+
+class RemoteAccessCollector(EvidenceCollector):
+    control_id = "AC.L2-3.1.12"
+    artifacts = (("AC_3.1.12_Remote_Access_Monitoring_Report.md", "Remote Access Monitoring Report"),)
+    data_files = ("remote_access_logs.json",)
+
+    def assess(self):
+        from remote_access import analyze_remote_access_cached, evidence_result as remote_access_result
+
+        summary, _ = analyze_remote_access_cached(self.data_dir / self.data_files[0])
+        return remote_access_result(summary)
+
+
+class ExternalConnectionCollector(EvidenceCollector):
+    control_id = "AC.L2-3.1.20"
+    artifacts = (
+        ("AC_3.1.20_External_Connection_Inventory.md", "Connection Inventory"),
+        ("Screenshot_Dashboard_VEN003_Restricted.md", "Dashboard Screenshot"),
+        ("Firewall_Log_VEN003_Restriction.log", "Firewall Logs"),
+        ("Email_Alert_VEN003_Expiry.md", "Alert Email"),
+    )
+    data_files = ("external_connections.json", "monitoring_alerts.json")
+    date_sensitive = True  # days to expiry are counted from the assessment date
+
+    def assess(self):
+        from alerts import load_alert_index
+        from connections import assess_connections, evidence_result as connection_result, load_connections
+
+        inventory = load_connections(self.data_dir / self.data_files[0])
+        alerts_path = self.data_dir / self.data_files[1]
+        # read the feed whole rather than through a checkpoint: collectors persist no state of their own
+        alert_index = load_alert_index(alerts_path, state_dir=None) if alerts_path.exists() else None
+        return connection_result(assess_connections(inventory, self.assessment_date, alert_index=alert_index))
+
+
+COLLECTORS = {
+    cls.control_id: cls
+    for cls in (
+        AccessControlCollector,
+        CUIFlowCollector,
+        SessionLockCollector,
+        IdentifierReuseCollector,
+        RemoteAccessCollector,
+        ExternalConnectionCollector,
+    )
+}
+
+
+def build_collectors(controls, **kwargs):
+    """Instantiate the registered collector for each control in ``controls`` (in order)."""
+    return [COLLECTORS[cid](control, **kwargs) for cid, control in controls.items() if cid in COLLECTORS]
+
+
+def retested(rows, when=None):
+    """Cached rows with ``last_tested`` moved to this run (the inputs were just verified unchanged)."""
+    when = when or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return [{**row, "last_tested": when} if row.get("last_tested") else row for row in rows]
+
+
+def run_collectors(collectors, max_workers=None, cache=None):
+    """Run collectors concurrently; returns evidence rows in collector order.
+
+    Each collector gets its own timeout measured from submission. A collector
+    that raises or overruns contributes NOT_ASSESSED rows instead of evidence.
+    Timed-out threads cannot be interrupted and finish in the background.
+    With an ``EvidenceCache``, collectors whose inputs are unchanged are not run;
+    their cached rows get this run's ``last_tested``.
+    """
+    pool = ThreadPoolExecutor(max_workers=max_workers or max(len(collectors), 1),
+                              thread_name_prefix="collector")
+    started = time.monotonic()
+    futures = []
+    for c in collectors:
+        key = cache.key_for(c) if cache is not None else None
+        cached = cache.get(key) if key is not None else None
+        futures.append((c, key, cached if cached is not None else pool.submit(c.collect)))
+    rows = []
+    try:
+        for collector, key, future in futures:
+            if isinstance(future, list):
+                rows.extend(retested(future))
+                continue
+            remaining = max(collector.timeout - (time.monotonic() - started), 0)
+            try:
+                result = future.result(timeout=remaining)
+                if key is not None:
+                    cache.put(key, collector.control_id, result)
+                rows.extend(result)
+            except FutureTimeout:
+                future.cancel()
+                rows.extend(collector.failure_rows(f"Timed out after {collector.timeout:g}s"))
+            except Exception as exc:  # noqa: BLE001 - one bad source must not sink the assessment
+                rows.extend(collector.failure_rows(f"{type(exc).__name__}: {exc}"))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return rows
@@ -4,19 +4,17 @@ Continuous Monitoring Dashboard for AC.L2-3.1.20
 Shows real-time status of external connections
 """
 
-import json
-from datetime import datetime, timedelta
+import hashlib
+from datetime import datetime
+from html import escape
 from pathlib import Path
+from string import Formatter
 
-def generate_dashboard_html():
-    """Generate HTML dashboard for continuous monitoring"""
-    
-    html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>CMMC AC.L2-3.1.20 - Continuous Monitoring Dashboard</title>
-        <style>
+from collectors import DATA_DIR
+
+COMPANY_NAME = "TechDefense Solutions LLC"
+
+PAGE_STYLE = """
             body { font-family: Arial, sans-serif; margin: 20px; }
             .header { background: #1e3a5f; color: white; padding: 20px; }
             .metric { display: inline-block; margin: 10px; padding: 15px; border: 1px solid #ddd; }
@@ -26,56 +24,195 @@ def generate_dashboard_html():
             table { width: 100%; border-collapse: collapse; margin-top: 20px; }
             th, td { padding: 10px; border: 1px solid #ddd; text-align: left; }
             th { background: #366092; color: white; }
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>External Connection Monitoring Dashboard</h1>
-            <p>TechDefense Solutions LLC - Real-time Compliance Status</p>
-        </div>
-        
-        <div class="metrics">
-            <div class="metric compliant">✓ 10 Compliant</div>
-            <div class="metric partial">⚠ 2 Expiring Soon</div>
-            <div class="metric non-compliant">✗ 2 Expired</div>
-        </div>
-        
-        <table>
-            <tr>
-                <th>Connection ID</th>
-                <th>Vendor</th>
-                <th>Status</th>
-                <th>Expiry</th>
-                <th>Action</th>
-            </tr>
-            <tr>
-                <td>VEN-001</td>
-                <td>Raytheon</td>
-                <td style="color: green;">✓ Valid</td>
-                <td>2024-12-15</td>
-                <td>None Required</td>
-            </tr>
-            <tr>
-                <td>VEN-003</td>
-                <td>Northrop</td>
-                <td style="color: red;">✗ Expired</td>
-                <td>2024-08-30</td>
-                <td>Access Restricted</td>
-            </tr>
-        </table>
-        
-        <p><small>Dashboard refreshes every 5 minutes. Last update: """ + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + """</small></p>
-    </body>
-    </html>
+"""
+
+TABLE_HEADERS = ["Connection ID", "Vendor", "Status", "Expiry", "Alerts", "Action"]
+
+
+class Markup(str):
+    """Text that is already HTML and must be inserted without escaping."""
+
+
+class CompiledTemplate:
+    """``str.format``-style template parsed once into literal chunks and slots.
+
+    ``stream(**context)`` yields the page piece by piece: plain values are
+    HTML-escaped, ``Markup`` values are inserted verbatim and any other iterable
+    (e.g. a generator of rendered rows) is streamed item by item under the same
+    rules, so the page never has to exist as one string.
+    """
+
+    def __init__(self, source):
+        self.parts = []  # (literal text, slot name or None)
+        for literal, field, _, _ in Formatter().parse(source):
+            self.parts.append((literal, field))
+
+    def stream(self, **context):
+        for literal, field in self.parts:
+            if literal:
+                yield literal
+            if field is not None:
+                yield from _stream_value(context[field])
+
+    def render(self, **context):
+        return "".join(self.stream(**context))
+
+
+def _stream_value(value):
+    if isinstance(value, Markup):
+        yield value
+    elif isinstance(value, str):
+        yield escape(value)
+    elif hasattr(value, "__iter__"):
+        for item in value:
+            if isinstance(item, Markup):
+                yield item  # rendered rows: skip the recursive generator per item
+            else:
+                yield from _stream_value(item)
+    else:
+        yield escape(str(value))
+
+
+# attestation_status -> (cell color, label, action)
+STATUS_DISPLAY = {
+    "Valid": ("green", "✓ Valid", "None Required"),
+    "EXPIRING": ("darkorange", "⚠ Expiring Soon", "Renewal Requested"),
+    "EXPIRED": ("red", "✗ Expired", "Access Restricted"),
+}
+
+
+def load_alert_counts(path=DATA_DIR / "monitoring_alerts.json", state_dir=None):
+    """Deduplicated alerts per connection_id from the monitoring alert feed.
+
+    The feed's checkpoint goes under ``state_dir`` (see main.state_paths).
+    """
+    from alerts import load_alert_index
+    from main import state_paths
+
+    return load_alert_index(path, state_dir=state_paths(state_dir)["alert_state"]).counts()
+
+
+def load_dashboard_rows(data_dir=DATA_DIR, assessment_date=None, alert_counts=None, state_dir=None):
+    """Dashboard rows (dicts sorted by connection ID) from the connection inventory."""
+    from connections import assess_connections, load_connections
+
+    data_dir = Path(data_dir)
+    monitoring = assess_connections(
+        load_connections(data_dir / "external_connections.json"),
+        assessment_date or datetime.now().strftime("%Y-%m-%d"),
+    )
+    if alert_counts is None:
+        alert_counts = load_alert_counts(data_dir / "monitoring_alerts.json", state_dir)
+    rows = monitoring[["connection_id", "vendor_name", "attestation_status", "expiry_date"]].to_dict("records")
+    for row in rows:
+        row["alerts"] = alert_counts.get(row["connection_id"], 0)
+    return sorted(rows, key=lambda r: str(r["connection_id"]))
+
+
+def dashboard_metrics(rows):
+    """Counts of compliant, expiring and expired connections."""
+    metrics = {"compliant": 0, "expiring": 0, "expired": 0, "total": len(rows)}
+    for row in rows:
+        status = row["attestation_status"]
+        key = "expired" if status == "EXPIRED" else "expiring" if status == "EXPIRING" else "compliant"
+        metrics[key] += 1
+    return metrics
+
+
+def render_metrics(metrics):
+    """Metric tiles HTML."""
+    return Markup(
+        f'<div class="metric compliant">✓ {metrics["compliant"]} Compliant</div>\n'
+        f'<div class="metric partial">⚠ {metrics["expiring"]} Expiring Soon</div>\n'
+        f'<div class="metric non-compliant">✗ {metrics["expired"]} Expired</div>'
+    )
+
+
+def row_dom_id(conn_id):
+    """DOM id of a connection's row: a hash, so any connection ID is a safe, unambiguous id."""
+    return "row-" + hashlib.sha1(str(conn_id).encode()).hexdigest()[:16]
+
+
+def render_row(row):
+    """One escaped table row for a connection."""
+    color, label, action = STATUS_DISPLAY.get(row["attestation_status"], ("black", row["attestation_status"], ""))
+    cells = [
+        f"<td>{escape(str(row['connection_id']))}</td>",
+        f"<td>{escape(str(row['vendor_name']))}</td>",
+        f'<td style="color: {color};">{escape(str(label))}</td>',
+        f"<td>{escape(str(row['expiry_date']))}</td>",
+        f"<td>{int(row.get('alerts', 0))}</td>",
+        f"<td>{escape(action)}</td>",
+    ]
+    return Markup(f'<tr id="{row_dom_id(row["connection_id"])}">' + "".join(cells) + "</tr>\n")
+
+
+DASHBOARD_TEMPLATE = CompiledTemplate("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>CMMC AC.L2-3.1.20 - Continuous Monitoring Dashboard</title>
+    <style>{style}    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>External Connection Monitoring Dashboard</h1>
+        <p>{company} - Compliance Status Snapshot</p>
+    </div>
+
+    <div class="metrics">
+{metrics}
+    </div>
+
+    <table>
+        <tr>{headers}</tr>
+{rows}    </table>
+
+    <p><small>Static snapshot; run dashboard_server.py for live updates. Last update: {updated}</small></p>
+</body>
+</html>
+""")
+
+HEADER_CELLS = Markup("".join(f"<th>{escape(h)}</th>" for h in TABLE_HEADERS))
+
+
+def stream_dashboard(rows, metrics=None, updated=None, render=render_row):
+    """Yield the static dashboard page in chunks; rows are rendered lazily by ``render``.
+
+    ``metrics`` is computed from ``rows`` when not given (which needs ``rows``
+    to be a sequence rather than a one-shot iterator).
     """
-    
-    output_dir = Path("output")
-    output_dir.mkdir(exist_ok=True)
-    
-    with open(output_dir / "monitoring_dashboard.html", "w") as f:
-        f.write(html)
-    
-    print("📊 Monitoring dashboard generated: output/monitoring_dashboard.html")
+    if metrics is None:
+        metrics = dashboard_metrics(rows)
+    return DASHBOARD_TEMPLATE.stream(
+        style=Markup(PAGE_STYLE),
+        company=COMPANY_NAME,
+        metrics=render_metrics(metrics),
+        headers=HEADER_CELLS,
+        rows=(render(r) for r in rows),
+        updated=updated or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    )
+
+
+def write_dashboard(rows, out, metrics=None, updated=None):
+    """Stream the dashboard page into the text file object ``out``."""
+    for chunk in stream_dashboard(rows, metrics, updated):
+        out.write(chunk)
+
+
+def generate_dashboard_html(data_dir=DATA_DIR, assessment_date=None, output_file=Path("output") / "monitoring_dashboard.html",
+                            state_dir=None):
+    """Generate HTML dashboard for continuous monitoring"""
+    rows = load_dashboard_rows(data_dir, assessment_date, state_dir=state_dir)
+
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        write_dashboard(rows, f)
+
+    print(f"📊 Monitoring dashboard generated: {output_file}")
+
 
 if __name__ == "__main__":
     generate_dashboard_html()
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Live monitoring dashboard server for AC.L2-3.1.20
+asyncio HTTP server that computes metrics from the connection inventory and
+alert feed, serves the table one page at a time, and pushes only changed rows
+to connected browsers over Server-Sent Events
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from collectors import DATA_DIR
+from dashboard import (
+    COMPANY_NAME,
+    HEADER_CELLS,
+    PAGE_STYLE,
+    CompiledTemplate,
+    Markup,
+    dashboard_metrics,
+    load_alert_counts,
+    load_dashboard_rows,
+    render_metrics,
+    render_row,
+    row_dom_id,
+    stream_dashboard,
+)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+KEEPALIVE_SECONDS = 15
+SNAPSHOT_CHUNK_CHARS = 64 * 1024
+
+
+class DashboardState:
+    """Current rows plus a cache of rendered row fragments.
+
+    ``refresh`` recomputes rows only when an input file changed, re-renders only
+    rows whose content changed and returns the diff for subscribers. If loading
+    fails the previous view is kept and the same inputs are retried next time.
+    Alert checkpoints are kept under ``state_dir`` (see main.state_paths).
+    """
+
+    def __init__(self, data_dir=DATA_DIR, assessment_date=None, state_dir=None):
+        self.data_dir = Path(data_dir)
+        self.assessment_date = assessment_date
+        self.state_dir = state_dir
+        self.version = 0
+        # (sorted connection IDs, {connection_id: (content hash, rendered <tr>)}),
+        # swapped as one object so request handlers never see a half-applied refresh
+        self._view = ([], {})
+        self.metrics = dashboard_metrics([])
+        self.metrics_html = render_metrics(self.metrics)
+        self.updated = None
+        self._signature = None
+
+    def _inputs_signature(self):
+        sig = []
+        for name in ("external_connections.json", "monitoring_alerts.json"):
+            path = self.data_dir / name
+            st = path.stat() if path.exists() else None
+            sig.append((name, st.st_size if st else None, st.st_mtime_ns if st else None))
+        # expiry is relative to the assessment date, so a new day is a change too
+        sig.append(self.assessment_date or datetime.now().strftime("%Y-%m-%d"))
+        return tuple(sig)
+
+    def refresh(self):
+        """Recompute if inputs changed; returns a diff dict or None."""
+        signature = self._inputs_signature()
+        if signature == self._signature:
+            return None
+        rows = load_dashboard_rows(self.data_dir, self.assessment_date, load_alert_counts(
+            self.data_dir / "monitoring_alerts.json", self.state_dir))
+        self._signature = signature
+
+        _, previous = self._view
+        ids, fragments, changed = [], {}, []
+        for row in rows:
+            conn_id = str(row["connection_id"])
+            ids.append(conn_id)
+            digest = hashlib.sha1(json.dumps(row, sort_keys=True, default=str).encode()).hexdigest()
+            cached = previous.get(conn_id)
+            if cached is None or cached[0] != digest:
+                cached = (digest, render_row(row))
+                changed.append(conn_id)
+            fragments[conn_id] = cached
+        removed = [conn_id for conn_id in previous if conn_id not in fragments]
+
+        self._view = (ids, fragments)
+        self.metrics = dashboard_metrics(rows)
+        self.metrics_html = render_metrics(self.metrics)
+        self.updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if not changed and not removed:
+            return None
+        self.version += 1
+        positions = {conn_id: n for n, conn_id in enumerate(ids)}
+        return {
+            "version": self.version,
+            "changed": [{"id": i, "dom_id": row_dom_id(i), "index": positions[i], "html": fragments[i][1]}
+                        for i in changed],
+            "removed": removed,
+            "total": len(ids),
+            "metrics": self.metrics,
+            "metrics_html": self.metrics_html,
+            "updated": self.updated,
+        }
+
+    def page(self, page, size):
+        """Rendered rows for one page (server-side pagination)."""
+        all_ids, fragments = self._view
+        size = max(1, min(size, MAX_PAGE_SIZE))
+        pages = max(1, -(-len(all_ids) // size))
+        page = max(1, min(page, pages))
+        ids = all_ids[(page - 1) * size: page * size]
+        return {
+            "version": self.version,
+            "page": page,
+            "pages": pages,
+            "size": size,
+            "total": len(all_ids),
+            "first_index": (page - 1) * size,
+            "rows": [{"id": i, "html": fragments[i][1]} for i in ids],
+        }
+
+    def snapshot_chunks(self):
+        """The static dashboard page, streamed from the cached row fragments."""
+        ids, fragments = self._view
+        return stream_dashboard(ids, self.metrics, self.updated, render=lambda i: fragments[i][1])
+
+
+PAGE_TEMPLATE = CompiledTemplate("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>CMMC AC.L2-3.1.20 - Continuous Monitoring Dashboard</title>
+    <style>{style}
+        .pager {{ margin-top: 10px; }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>External Connection Monitoring Dashboard</h1>
+        <p>{company} - Real-time Compliance Status</p>
+    </div>
+    <div class="metrics" id="metrics">{metrics}</div>
+    <table>
+        <thead><tr>{headers}</tr></thead>
+        <tbody id="rows"></tbody>
+    </table>
+    <div class="pager">
+        <button id="prev">&laquo; Prev</button>
+        <span id="pageinfo"></span>
+        <button id="next">Next &raquo;</button>
+    </div>
+    <p><small>Live via server push. Last update: <span id="updated">{updated}</span></small></p>
+<script>
+const size = {page_size};
+let page = 1, pages = 1, firstIndex = 0, shown = new Set();
+async function load(p) {{
+    const r = await fetch(`/rows?page=${{p}}&size=${{size}}`);
+    const d = await r.json();
+    page = d.page; pages = d.pages; firstIndex = d.first_index;
+    document.getElementById("rows").innerHTML = d.rows.map(x => x.html).join("");
+    shown = new Set(d.rows.map(x => x.id));
+    document.getElementById("pageinfo").textContent = `Page ${{page}} of ${{pages}} (${{d.total}} connections)`;
+}}
+document.getElementById("prev").onclick = () => page > 1 && load(page - 1);
+document.getElementById("next").onclick = () => page < pages && load(page + 1);
+const events = new EventSource("/events");
+events.addEventListener("rows", e => {{
+    const d = JSON.parse(e.data);
+    document.getElementById("metrics").innerHTML = d.metrics_html;
+    document.getElementById("updated").textContent = d.updated;
+    let reload = d.removed.some(id => shown.has(id));
+    for (const row of d.changed) {{
+        const el = document.getElementById(row.dom_id);
+        if (el) {{ el.outerHTML = row.html; }}
+        else if (row.index >= firstIndex && row.index < firstIndex + size) {{ reload = true; }}
+    }}
+    if (reload) load(page);
+}});
+load(1);
+</script>
+</body>
+</html>
+""")
+
+
+def _positive_int(query, name, default):
+    """Query parameter ``name`` as a positive integer (``default`` when absent); ValueError otherwise."""
+    raw = query.get(name, [""])[0]
+    if not raw:
+        return default
+    if not (raw.isascii() and raw.isdigit()) or int(raw) < 1:
+        raise ValueError(f"{name} must be a positive integer, got {raw!r}")
+    return int(raw)
+
+
+class DashboardServer:
+    """Minimal asyncio HTTP server: /, /rows, /metrics, /snapshot and /events (SSE)."""
+
+    def __init__(self, state, poll_seconds=5.0, page_size=DEFAULT_PAGE_SIZE):
+        self.state = state
+        self.poll_seconds = poll_seconds
+        self.page_size = page_size
+        self.subscribers = set()
+
+    async def refresh(self):
+        """Run ``state.refresh`` off the event loop; a failure is logged and yields no diff."""
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, self.state.refresh)
+        except Exception:
+            log.exception("Dashboard refresh failed; keeping the last loaded rows")
+            return None
+
+    async def poll_loop(self):
+        while True:
+            diff = await self.refresh()
+            if diff is not None:
+                message = f"event: rows\ndata: {json.dumps(diff)}\n\n".encode()
+                for queue in list(self.subscribers):
+                    queue.put_nowait(message)
+            await asyncio.sleep(self.poll_seconds)
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # headers are not needed
+            parts = request_line.decode("latin-1").split()
+            if len(parts) < 2 or parts[0] != "GET":
+                await self._respond(writer, 405, "text/plain", b"Method Not Allowed")
+                return
+            url = urlsplit(parts[1])
+            query = parse_qs(url.query)
+            if url.path == "/":
+                await self._respond(writer, 200, "text/html; charset=utf-8", self._page().encode())
+            elif url.path == "/rows":
+                try:
+                    page = _positive_int(query, "page", 1)
+                    size = _positive_int(query, "size", self.page_size)
+                except ValueError as e:
+                    await self._respond(writer, 400, "text/plain", str(e).encode())
+                    return
+                body = json.dumps(self.state.page(page, size)).encode()
+                await self._respond(writer, 200, "application/json", body)
+            elif url.path == "/metrics":
+                body = json.dumps({"version": self.state.version, **self.state.metrics}).encode()
+                await self._respond(writer, 200, "application/json", body)
+            elif url.path == "/snapshot":
+                await self._stream_snapshot(writer)
+            elif url.path == "/events":
+                await self._stream_events(writer)
+            else:
+                await self._respond(writer, 404, "text/plain", b"Not Found")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _page(self):
+        return PAGE_TEMPLATE.render(
+            style=Markup(PAGE_STYLE),
+            company=COMPANY_NAME,
+            metrics=self.state.metrics_html,
+            headers=HEADER_CELLS,
+            updated=self.state.updated or "",
+            page_size=self.page_size,
+        )
+
+    async def _respond(self, writer, status, content_type, body):
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+    async def _stream_snapshot(self, writer):
+        """Send the static page with chunked transfer encoding, flushing as it goes."""
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+            b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n"
+        )
+        buffer, size = [], 0
+        for chunk in self.state.snapshot_chunks():
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= SNAPSHOT_CHUNK_CHARS:
+                await self._send_chunk(writer, "".join(buffer))
+                buffer, size = [], 0
+        if buffer:
+            await self._send_chunk(writer, "".join(buffer))
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _send_chunk(self, writer, text):
+        data = text.encode()
+        writer.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        await writer.drain()
+
+    async def _stream_events(self, writer):
+        queue = asyncio.Queue()
+        self.subscribers.add(queue)
+        try:
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n"
+            )
+            await writer.drain()
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    message = b": keepalive\n\n"
+                writer.write(message)
+                await writer.drain()
+        finally:
+            self.subscribers.discard(queue)
+
+    async def serve(self, host, port):
+        await self.refresh()
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"📊 Monitoring dashboard live at http://{host}:{port}/")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.poll_loop())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live AC.L2-3.1.20 monitoring dashboard")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--data-dir", default=str(DATA_DIR), help="Directory with the inventory and alert feed")
+    parser.add_argument("--poll", type=float, default=5.0, help="Seconds between input change checks")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--state-dir", help="Keep alert checkpoints here instead of under output/")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    server = DashboardServer(DashboardState(args.data_dir, state_dir=args.state_dir), poll_seconds=args.poll, page_size=args.page_size)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Content-hash evidence cache for incremental assessment runs
+Collector rows are stored in SQLite under output/, keyed by control ID and the
+SHA-256 of every input the collector reads; unchanged controls are reused.
+Input digests are remembered per (size, mtime) so unchanged files are not
+re-hashed
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / "output" / "evidence_cache.sqlite"
+DEFAULT_MAX_AGE_DAYS = 30
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+HASH_CHUNK = 1024 * 1024
+ROW_LAYOUT_VERSION = 8  # bump when collectors change the columns or content of their rows
+
+
+def file_sha256(path):
+    """SHA-256 of a file, read in chunks; None if the file does not exist."""
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                h.update(chunk)
+    except FileNotFoundError:
+        return None
+    return h.hexdigest()
+
+
+def inputs_key(control_id, collector_name, control, paths, assessment_date="", digest=file_sha256):
+    """Cache key over the row layout, control config, collector, assessment date and input contents.
+
+    ``digest(path)`` returns a file's SHA-256 (None if missing). Pass an empty
+    ``assessment_date`` for collectors whose rows do not depend on it.
+    """
+    h = hashlib.sha256(
+        f"{ROW_LAYOUT_VERSION}\0{control_id}\0{collector_name}\0{assessment_date}\0"
+        f"{json.dumps(control, sort_keys=True)}".encode()
+    )
+    for path in sorted(Path(p) for p in paths):
+        h.update(f"\0{path.name}\0{digest(path) or 'missing'}".encode())
+    return h.hexdigest()
+
+
+class EvidenceCache:
+    """SQLite-backed row cache with age and size eviction."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_age_days=DEFAULT_MAX_AGE_DAYS,
+                 max_bytes=DEFAULT_MAX_BYTES, refresh=False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age_days * 86400
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(self.path, timeout=30)  # batch jobs share the file
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS evidence (
+                   key TEXT PRIMARY KEY,
+                   control_id TEXT NOT NULL,
+                   rows TEXT NOT NULL,
+                   size INTEGER NOT NULL,
+                   created REAL NOT NULL,
+                   accessed REAL NOT NULL
+               )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS file_hashes (
+                   path TEXT PRIMARY KEY,
+                   size INTEGER NOT NULL,
+                   mtime_ns INTEGER NOT NULL,
+                   sha256 TEXT NOT NULL
+               )"""
+        )
+        self._conn.commit()
+        self.hashed = 0  # input files actually read this session
+
+    def key_for(self, collector):
+        # only date-sensitive collectors key on the date, so nightly runs still hit for the rest
+        assessment_date = collector.assessment_date if collector.date_sensitive else ""
+        return inputs_key(
+            collector.control_id, type(collector).__name__, collector.control, collector.inputs(),
+            assessment_date, digest=self.file_digest,
+        )
+
+    def file_digest(self, path):
+        """SHA-256 of ``path``, reused while its size and mtime are unchanged (re-hashed when refreshing)."""
+        try:
+            st = Path(path).stat()
+        except FileNotFoundError:
+            return None
+        name = str(Path(path).resolve())
+        if not self.refresh:
+            row = self._conn.execute(
+                "SELECT sha256 FROM file_hashes WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (name, st.st_size, st.st_mtime_ns),
+            ).fetchone()
+            if row is not None:
+                return row[0]
+        digest = file_sha256(path)
+        if digest is not None:
+            self.hashed += 1
+            with self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?)",
+                                   (name, st.st_size, st.st_mtime_ns, digest))
+        return digest
+
+    def get(self, key):
+        """Cached rows for ``key``, or None (always None when refreshing)."""
+        if self.refresh:
+            self.misses += 1
+            return None
+        row = self._conn.execute(
+            "SELECT rows, created FROM evidence WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or time.time() - row[1] > self.max_age:
+            self.misses += 1
+            return None
+        self._conn.execute("UPDATE evidence SET accessed = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, control_id, rows):
+        payload = json.dumps(rows, default=str)
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO evidence VALUES (?, ?, ?, ?, ?, ?)",
+                (key, control_id, payload, len(payload), now, now),
+            )
+
+    def evict(self):
+        """Drop entries past max age, then least-recently used until under max size.
+
+        Remembered digests of files that no longer exist are dropped too.
+        """
+        with self._conn:
+            self._conn.execute("DELETE FROM evidence WHERE created < ?", (time.time() - self.max_age,))
+            gone = [(p,) for (p,) in self._conn.execute("SELECT path FROM file_hashes") if not Path(p).exists()]
+            self._conn.executemany("DELETE FROM file_hashes WHERE path = ?", gone)
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM evidence").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for key, size in self._conn.execute(
+                "SELECT key, size FROM evidence ORDER BY accessed ASC"
+            ).fetchall():
+                self._conn.execute("DELETE FROM evidence WHERE key = ?", (key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def close(self):
+        self.evict()
+        self._conn.close()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Indexed firewall log ingestion for AC.L2-3.1.20
+Streams logs of the form ``<ISO timestamp> [COMPONENT] message`` through mmap,
+builds a compact (connection, timestamp, offset) index that is persisted under
+output/ as one .npy file per array (memory-mapped on load) and reused (or
+extended for appended logs) on later runs
+"""
+
+import array
+import hashlib
+import json
+import mmap
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_INDEX_DIR = REPO_ROOT / "output" / "firewall_index"
+DEFAULT_LOG_GLOB = "Firewall_Log_*.log"
+INDEX_VERSION = 2
+SCAN_CHUNK_ENTRIES = 65536  # index entries buffered while scanning before they become typed arrays
+
+LINE_RE = re.compile(rb"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?)Z?\s+\[([A-Za-z0-9_-]+)\]\s?(.*)$")
+CONN_RE = re.compile(rb"\bVEN-\d+\b")
+RULE_RE = re.compile(rb"\b(?:Disabling|Modifying|Enabling|Adding) rule:\s*(\S+)")
+NEW_ACTION_RE = re.compile(rb"^New:\s*(\w+)")
+
+KIND_MENTION, KIND_RULE = 0, 1
+ACTIONS = ["", "deny", "permit"]
+
+
+class FirewallLogIndex:
+    """Sorted (connection, timestamp) index over one firewall log file.
+
+    Arrays are parallel: ``conn`` (code into ``conn_ids``), ``ts`` (datetime64[ns]),
+    ``offset`` (byte offset of the line), ``kind`` (mention / rule change),
+    ``action`` (code into ``ACTIONS``) and ``rule`` (code into ``rules``, -1 if none).
+
+    On disk ``index_path`` is a JSON header naming the generation directory
+    that holds one ``<array>.npy`` per array; a save writes a new generation
+    and then swaps the header atomically, so readers never see a partial index.
+    """
+
+    def __init__(self, log_path, index_dir=DEFAULT_INDEX_DIR):
+        self.log_path = Path(log_path)
+        self.index_dir = Path(index_dir)
+        digest = hashlib.sha1(str(self.log_path.resolve()).encode()).hexdigest()[:12]
+        self.index_path = self.index_dir / f"{self.log_path.name}.{digest}.json"
+        self.conn_ids = []
+        self._conn_codes = {}
+        self.rules = []
+        self._arrays = _empty_arrays()
+        self._meta = {}
+
+    # Building -------------------------------------------------------------
+    def load_or_build(self):
+        """Reuse the persisted index, extend it for appended bytes, or rebuild."""
+        st = self.log_path.stat()
+        meta = self._load()
+        if meta and meta["size"] == st.st_size and meta["mtime_ns"] == st.st_mtime_ns:
+            return self
+        start = 0
+        if meta and st.st_size > meta["indexed_bytes"] and meta.get("head") == self._head_digest():
+            start = meta["indexed_bytes"]  # append-only growth: only scan the tail
+        else:
+            self.conn_ids, self.rules, self._arrays, self._meta = [], [], _empty_arrays(), {}
+            self._conn_codes = {}
+        self._scan(start)
+        self._meta.update(size=st.st_size, mtime_ns=st.st_mtime_ns, head=self._head_digest())
+        self._save()
+        return self
+
+    def _head_digest(self):
+        with open(self.log_path, "rb") as f:
+            return hashlib.sha1(f.read(4096)).hexdigest()
+
+    def _scan(self, start):
+        conn_codes = self._conn_codes
+        rule_codes = {r: i for i, r in enumerate(self.rules)}
+        entries = _EntryBuffer(SCAN_CHUNK_ENTRIES)
+        current_rule = self._meta.get("current_rule")
+        indexed_bytes = start
+
+        size = self.log_path.stat().st_size
+        if size > start:
+            with open(self.log_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = start
+                while pos < size:
+                    end = mm.find(b"\n", pos)
+                    if end == -1:
+                        break  # partial trailing line; picked up on the next run
+                    line = mm[pos:end].rstrip(b"\r")
+                    line_pos, pos = pos, end + 1
+                    indexed_bytes = pos
+                    m = LINE_RE.match(line)
+                    if m is None:
+                        continue
+                    ts, _component, message = m.groups()
+                    rule_m = RULE_RE.search(message)
+                    if rule_m:
+                        current_rule = rule_m.group(1).decode()
+                    action_m = NEW_ACTION_RE.match(message)
+                    if action_m and current_rule:
+                        action = action_m.group(1).decode().lower()
+                        conn_m = CONN_RE.search(current_rule.encode())
+                        if conn_m:
+                            entries.append(_code(conn_codes, self.conn_ids, conn_m.group(0).decode()), ts, line_pos,
+                                           KIND_RULE, ACTIONS.index(action) if action in ACTIONS else 0,
+                                           _code(rule_codes, self.rules, current_rule))
+                        continue
+                    for conn in {c.decode() for c in CONN_RE.findall(message)}:
+                        entries.append(_code(conn_codes, self.conn_ids, conn), ts, line_pos, KIND_MENTION, 0, -1)
+
+        new = entries.arrays()
+        merged = {k: np.concatenate([self._arrays[k], new[k]]) for k in new}
+        order = np.lexsort((merged["ts"], merged["conn"]))
+        self._arrays = {k: v[order] for k, v in merged.items()}
+        self._meta.update(indexed_bytes=indexed_bytes, current_rule=current_rule)
+
+    # Persistence ----------------------------------------------------------
+    def _read_header(self):
+        try:
+            meta = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("version") == INDEX_VERSION else None
+
+    def _load(self):
+        meta = self._read_header()
+        if meta is None:
+            return None
+        generation = self.index_dir / meta.pop("generation")
+        try:
+            self._arrays = {k: np.load(generation / f"{k}.npy", mmap_mode="r", allow_pickle=False)
+                            for k in _empty_arrays()}
+        except (OSError, ValueError):
+            self._arrays = _empty_arrays()
+            return None
+        self.conn_ids, self.rules = meta.pop("conn_ids"), meta.pop("rules")
+        self._conn_codes = {c: i for i, c in enumerate(self.conn_ids)}
+        self._meta = meta
+        return meta
+
+    def _save(self):
+        previous = self._read_header()
+        generation = f"{self.index_path.stem}.{os.getpid()}-{time.time_ns()}"
+        gen_dir = self.index_dir / generation
+        gen_dir.mkdir(parents=True)
+        for k, v in self._arrays.items():
+            np.save(gen_dir / f"{k}.npy", v, allow_pickle=False)
+        meta = dict(self._meta, version=INDEX_VERSION, generation=generation,
+                    conn_ids=self.conn_ids, rules=self.rules)
+        tmp = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+        if previous and previous.get("generation") not in (None, generation):
+            # open memory maps keep their pages; on platforms that refuse the delete it is retried next save
+            shutil.rmtree(self.index_dir / previous["generation"], ignore_errors=True)
+
+    def remove(self):
+        """Delete the persisted index (header and array files) for this log."""
+        meta = self._read_header()
+        self.index_path.unlink(missing_ok=True)
+        if meta and meta.get("generation"):
+            shutil.rmtree(self.index_dir / meta["generation"], ignore_errors=True)
+
+    # Lookups --------------------------------------------------------------
+    def _span(self, conn_id, start=None, end=None):
+        """Index range for ``conn_id`` within [start, end] via binary search."""
+        code = self._conn_codes.get(conn_id)
+        if code is None:
+            return 0, 0
+        conn = self._arrays["conn"]
+        lo, hi = np.searchsorted(conn, code, "left"), np.searchsorted(conn, code, "right")
+        ts = self._arrays["ts"][lo:hi]
+        if start is not None:
+            lo += np.searchsorted(ts, np.datetime64(start, "ns"), "left")
+            ts = self._arrays["ts"][lo:hi]
+        if end is not None:
+            hi = lo + np.searchsorted(ts, np.datetime64(end, "ns"), "right")
+        return lo, hi
+
+    def entries(self, conn_id, start=None, end=None):
+        """(timestamp, line) pairs mentioning ``conn_id`` within the time window."""
+        lo, hi = self._span(conn_id, start, end)
+        if lo == hi:
+            return []
+        out = []
+        with open(self.log_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for ts, off in zip(self._arrays["ts"][lo:hi], self._arrays["offset"][lo:hi]):
+                end_pos = mm.find(b"\n", int(off))
+                out.append((ts, mm[int(off):end_pos if end_pos != -1 else None].decode(errors="replace").rstrip()))
+        return out
+
+    def rule_changes(self, conn_id, start=None, end=None):
+        """(timestamp, rule, action) for every rule change on ``conn_id``."""
+        lo, hi = self._span(conn_id, start, end)
+        kind = self._arrays["kind"][lo:hi]
+        sel = np.flatnonzero(kind == KIND_RULE) + lo
+        return [
+            (self._arrays["ts"][i], self.rules[self._arrays["rule"][i]], ACTIONS[self._arrays["action"][i]])
+            for i in sel
+        ]
+
+
+def _empty_arrays():
+    return {
+        "conn": np.empty(0, dtype=np.int32),
+        "ts": np.empty(0, dtype="datetime64[ns]"),
+        "offset": np.empty(0, dtype=np.int64),
+        "kind": np.empty(0, dtype=np.int8),
+        "action": np.empty(0, dtype=np.int8),
+        "rule": np.empty(0, dtype=np.int32),
+    }
+
+
+def _code(codes, table, value):
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(table)
+        table.append(value)
+    return code
+
+
+class _EntryBuffer:
+    """Index entries gathered by a scan, kept as typed array chunks.
+
+    Entries accumulate in compact ``array.array`` columns (raw timestamps in a
+    list) and every ``chunk_entries`` entries become one chunk of numpy arrays,
+    its timestamps parsed in one vectorized call, so a scan holds no per-entry
+    Python objects beyond the current chunk.
+    """
+
+    TYPECODES = {"conn": "i", "offset": "q", "kind": "b", "action": "b", "rule": "i"}
+
+    def __init__(self, chunk_entries=SCAN_CHUNK_ENTRIES):
+        self.chunk_entries = chunk_entries
+        self.chunks = []
+        self._reset()
+
+    def _reset(self):
+        self._cols = {k: array.array(code) for k, code in self.TYPECODES.items()}
+        self._ts = []
+
+    def append(self, conn, ts, offset, kind, action, rule):
+        cols = self._cols
+        cols["conn"].append(conn)
+        cols["offset"].append(offset)
+        cols["kind"].append(kind)
+        cols["action"].append(action)
+        cols["rule"].append(rule)
+        self._ts.append(ts)
+        if len(self._ts) >= self.chunk_entries:
+            self.flush()
+
+    def flush(self):
+        if not self._ts:
+            return
+        empty = _empty_arrays()
+        chunk = {k: np.frombuffer(col, dtype=col.typecode).astype(empty[k].dtype) for k, col in self._cols.items()}
+        chunk["ts"] = np.array(self._ts, dtype=bytes).astype(empty["ts"].dtype)
+        self.chunks.append(chunk)
+        self._reset()
+
+    def arrays(self):
+        """Every entry so far as one set of typed arrays."""
+        self.flush()
+        empty = _empty_arrays()
+        return {k: np.concatenate([empty[k]] + [c[k] for c in self.chunks]) for k in empty}
+
+
+def load_indexes(log_paths, index_dir=DEFAULT_INDEX_DIR):
+    """Build or reuse the persisted index for each log file."""
+    return [FirewallLogIndex(p, index_dir).load_or_build() for p in log_paths]
+
+
+def verify_deny(indexes, conn_id, since=None):
+    """Timestamp of the first rule change to deny for ``conn_id`` (at/after ``since``), or None."""
+    hits = [
+        ts
+        for index in indexes
+        for ts, _rule, action in index.rule_changes(conn_id, start=since)
+        if action == "deny"
+    ]
+    return min(hits) if hits else None
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Identifier reuse detection for AC.L2-3.1.7
+Builds a hash index of archived identifiers (with their deprovision dates)
+keyed by a normalized skeleton (case-folded, separators removed, look-alike
+characters folded) and joins current accounts against it, so reuse within
+the 2-year retention window is found in one linear pass instead of pairwise
+comparison. Archived identifiers that were themselves re-issued too early are
+found from the same index sorted by deprovision date
+"""
+
+import re
+import threading
+from pathlib import Path
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+import pandas as pd  # pyright: ignore[reportMissingModuleSource]
+
+RETENTION_DAYS = 730  # "Retention period: 2 years minimum"
+
+# Look-alike sequences folded into one skeleton (after case folding), applied in order
+CONFUSABLES = [("rn", "m"), ("vv", "w"), ("0", "o"), ("1", "l"), ("i", "l"), ("|", "l"), ("5", "s"), ("$", "s"),
+               ("@", "a")]
+SEPARATORS = r"[\s._\-]+"
+
+VIOLATION_COLUMNS = [
+    "identifier",
+    "matched_identifier",
+    "match_type",
+    "source",
+    "deprovisioned",
+    "reused_on",
+    "days_after_deprovision",
+    "violation",
+]
+
+REUSED = "Reused within retention window"
+RESERVED = "Reserved identifier reused"
+CONCURRENT = "Concurrent holders (created before deprovision)"
+UNKNOWN_DEPROVISION = "Deprovision date unknown"
+
+
+def skeleton(usernames):
+    """Vectorized normalization key: NFKC, case-folded, no separators, look-alikes folded."""
+    keys = usernames.astype("string").str.normalize("NFKC").str.casefold().str.replace(SEPARATORS, "", regex=True)
+    for seq, replacement in CONFUSABLES:
+        keys = keys.str.replace(seq, replacement, regex=False)
+    return keys
+
+
+def _markdown_table(path, required="Username"):
+    """First markdown table in ``path`` whose header has ``required``, as a DataFrame."""
+    header, rows = None, []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line.startswith("|"):
+            if header:
+                break
+            continue
+        cells = [c.strip() for c in line.strip("|").split("|")]
+        if header is None:
+            if required in cells:
+                header = cells
+        elif not all(re.fullmatch(r":?-+:?", c) for c in cells):
+            rows.append(cells[: len(header)])
+    return pd.DataFrame(rows, columns=header or [required])
+
+
+def load_archived(path):
+    """Archived identities: ``username``, ``deprovisioned`` (datetime) and ``status``.
+
+    Reads the reserved-username table of the identity management procedure
+    (markdown) or an archive export (CSV) with Username and Termination Date /
+    Deprovision Date columns.
+    """
+    path = Path(path)
+    raw = _markdown_table(path) if path.suffix.lower() == ".md" else pd.read_csv(path, dtype="string")
+    date_col = next((c for c in ("Termination Date", "Deprovision Date", "Deprovisioned") if c in raw.columns), None)
+    return pd.DataFrame(
+        {
+            "username": raw["Username"].astype("string").str.strip(),
+            "deprovisioned": pd.to_datetime(raw[date_col] if date_col else pd.Series(pd.NaT, index=raw.index),
+                                            errors="coerce"),
+            "status": raw["Status"].astype("string") if "Status" in raw.columns else pd.Series("", index=raw.index,
+                                                                                            dtype="string"),
+        }
+    )
+
+
+def load_current(path):
+    """Current accounts: ``username`` and ``created`` (NaT when the export has no creation date)."""
+    raw = pd.read_csv(path, dtype="string", usecols=lambda c: c in ("Username", "Created"))
+    created = raw["Created"] if "Created" in raw.columns else pd.Series(pd.NaT, index=raw.index)
+    return pd.DataFrame({"username": raw["Username"].str.strip(), "created": pd.to_datetime(created, errors="coerce")})
+
+
+def _match_type(identifier, matched):
+    exact = identifier == matched
+    case = identifier.str.casefold() == matched.str.casefold()
+    return np.select([exact.to_numpy(dtype=bool), case.to_numpy(dtype=bool)],
+                     ["exact", "case-normalized"], default="near-duplicate")
+
+
+def detect_reuse(current, archived, as_of, retention_days=RETENTION_DAYS):
+    """Violations DataFrame (``VIOLATION_COLUMNS``) from one indexed pass.
+
+    A current account matching an archived identifier is a violation when it was
+    created (or, without a creation date, is still in use at ``as_of``) 0 to
+    ``retention_days`` after the archived one was deprovisioned, or at any
+    time if the archive marks the identifier "Never Reuse". A current account
+    created before the archived one was deprovisioned is reported as
+    ``CONCURRENT`` (two holders at once, not a reuse), and a match whose
+    archived record has no deprovision date as ``UNKNOWN_DEPROVISION``, since
+    the retention window cannot be checked. Two archived records with the
+    same key deprovisioned less than ``retention_days`` apart prove the second
+    was issued inside the window. ``days_after_deprovision`` is nullable
+    (Int64): it is NA for ``UNKNOWN_DEPROVISION`` rows and rendered as an
+    empty cell.
+    """
+    as_of = pd.Timestamp(as_of).normalize()
+    retention = pd.Timedelta(days=retention_days)
+    # one integer code per skeleton across both sides: the hash index
+    codes, _ = pd.factorize(pd.concat([skeleton(archived["username"]), skeleton(current["username"])],
+                                      ignore_index=True))
+    archived_codes, current_codes = codes[: len(archived)], codes[len(archived):]
+    archived = archived.assign(key=archived_codes)[archived_codes >= 0]
+    current = current.assign(key=current_codes)[current_codes >= 0]
+
+    # current accounts joined to the archive index on the skeleton (hash join)
+    pairs = current.merge(archived, on="key", suffixes=("", "_archived"))
+    reused_on = pairs["created"].fillna(as_of)
+    gap = reused_on - pairs["deprovisioned"]
+    known = gap.notna().to_numpy(dtype=bool)
+    days = gap.dt.days.to_numpy(dtype="float64", na_value=np.nan)
+    unknown = ~known
+    concurrent = known & (days < 0)
+    in_window = known & (days >= 0) & (gap < retention).to_numpy(dtype=bool, na_value=False)
+    never_reuse = pairs["status"].str.contains("never reuse", case=False).fillna(False).to_numpy(dtype=bool)
+    hit = unknown | concurrent | in_window | never_reuse
+    violation = np.select([unknown, concurrent, in_window], [UNKNOWN_DEPROVISION, CONCURRENT, REUSED],
+                          default=RESERVED)[hit]
+    pairs = pairs[hit]
+    frames = [
+        pd.DataFrame(
+            {
+                "identifier": pairs["username"],
+                "matched_identifier": pairs["username_archived"],
+                "match_type": _match_type(pairs["username"], pairs["username_archived"]),
+                "source": "current",
+                "deprovisioned": pairs["deprovisioned"],
+                "reused_on": reused_on[hit],
+                "days_after_deprovision": gap[hit].dt.days,
+                "violation": violation,
+            }
+        )
+    ]
+
+    # archived identifiers re-issued inside the window: neighbours in the sorted index
+    order = np.lexsort((archived["deprovisioned"].to_numpy(), archived["key"].to_numpy()))
+    history = archived.iloc[order]
+    key = history["key"].to_numpy()
+    same_key = np.r_[False, key[1:] == key[:-1]]
+    deprovisioned = history["deprovisioned"].to_numpy()
+    gap = pd.Series(deprovisioned - np.r_[deprovisioned[:1], deprovisioned[:-1]], index=history.index)
+    reissued = same_key & (gap < retention).to_numpy(dtype=bool, na_value=False)
+    if reissued.any():
+        later, earlier = history[reissued], history.iloc[np.flatnonzero(reissued) - 1]
+        frames.append(
+            pd.DataFrame(
+                {
+                    "identifier": later["username"].to_numpy(),
+                    "matched_identifier": earlier["username"].to_numpy(),
+                    "match_type": _match_type(later["username"].reset_index(drop=True),
+                                              earlier["username"].reset_index(drop=True)),
+                    "source": "archived",
+                    "deprovisioned": earlier["deprovisioned"].to_numpy(),
+                    "reused_on": pd.NaT,
+                    "days_after_deprovision": gap[reissued].dt.days.to_numpy(),
+                    "violation": "Re-issued within retention window",
+                }
+            )
+        )
+
+    violations = pd.concat(frames, ignore_index=True).reindex(columns=VIOLATION_COLUMNS)
+    for col in ("deprovisioned", "reused_on"):
+        violations[col] = violations[col].dt.strftime("%Y-%m-%d").fillna("")
+    violations["days_after_deprovision"] = violations["days_after_deprovision"].astype("Int64")
+    return violations
+
+
+def analyze_identifier_reuse(archived_path, current_path, as_of, retention_days=RETENTION_DAYS):
+    """Check current accounts against the archive; returns (summary dict, violations DataFrame)."""
+    archived = load_archived(archived_path)
+    current = load_current(current_path)
+    violations = detect_reuse(current, archived, as_of, retention_days)
+    concurrent = violations["violation"].eq(CONCURRENT)
+    counts = violations.loc[~concurrent, "match_type"].value_counts()
+    summary = {
+        "current": int(len(current)),
+        "archived": int(len(archived)),
+        "retention_days": retention_days,
+        "violations": int((~concurrent).sum()),
+        "exact": int(counts.get("exact", 0)),
+        "case_normalized": int(counts.get("case-normalized", 0)),
+        "near_duplicate": int(counts.get("near-duplicate", 0)),
+        "unknown_deprovision": int(violations["violation"].eq(UNKNOWN_DEPROVISION).sum()),
+        "concurrent_holders": int(concurrent.sum()),
+    }
+    return summary, violations
+
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+
+def analyze_identifier_reuse_cached(archived_path, current_path, as_of, retention_days=RETENTION_DAYS):
+    """``analyze_identifier_reuse`` memoized per input (path, size, mtime) and date within the process.
+
+    Lets the 3.1.7 collector and the Identifier_Reuse_Violations sheet share one pass.
+    """
+    key = [str(as_of), retention_days]
+    for path in (archived_path, current_path):
+        st = Path(path).stat()
+        key += [str(Path(path).resolve()), st.st_size, st.st_mtime_ns]
+    key = tuple(key)
+    with _memo_lock:
+        if key not in _memo:
+            _memo.clear()
+            _memo[key] = analyze_identifier_reuse(archived_path, current_path, as_of, retention_days)
+        summary, violations = _memo[key]
+    return dict(summary), violations.copy()
+
+
+def evidence_result(summary):
+    """Main-row fields for the AC.L2-3.1.7 evidence row."""
+    years = summary["retention_days"] / 365
+    concurrent = summary.get("concurrent_holders", 0)
+    unknown = summary.get("unknown_deprovision", 0)
+    result = {
+        "status": "COMPLIANT" if not (summary["violations"] or concurrent) else "NON_COMPLIANT",
+        "implementation": f"{years:.0f}-year minimum retention for all user identifiers",
+        "test_result": (
+            f"Checked {summary['current']} current identifiers against {summary['archived']} archived "
+            f"(exact, case-normalized and look-alike forms): {summary['violations']} reuse violations"
+            + (f", {concurrent} concurrent holders" if concurrent else "")
+        ),
+    }
+    findings, remediation = [], []
+    if summary["violations"]:
+        findings.append(
+            f"{summary['violations']} identifier reuse violations ({summary['exact']} exact, "
+            f"{summary['case_normalized']} case-normalized, {summary['near_duplicate']} near-duplicate"
+            + (f"; {unknown} with no recorded deprovision date" if unknown else "") + ")"
+        )
+        remediation.append("Rename reused accounts and restore the identifiers to the reserved list")
+    if concurrent:
+        findings.append(f"{concurrent} identifiers held by a current account while the archived holder "
+                        "was still provisioned")
+        remediation.append("Confirm the archived accounts were deprovisioned and record their actual dates")
+    if findings:
+        result["finding"] = "; ".join(findings)
+        result["remediation"] = "; ".join(remediation)
+    return result
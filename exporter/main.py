@@ -3,21 +3,20 @@
 CMMC Level 2 AC Controls Assessment Demo
 Educational Version for Aspire Cyber Podcast
 Demonstrates automated evidence generation for Access Control requirements
+
+Importable as a library (``build_report(config) -> Path``): importing has no
+side effects, and pandas/NumPy/openpyxl are only loaded when a report is built.
 """
 
 import argparse
-from datetime import datetime, timedelta
+import os
+from contextlib import nullcontext
+from datetime import datetime
 from pathlib import Path
 
-import numpy as np  # pyright: ignore[reportMissingImports]
-import pandas as pd  # pyright: ignore[reportMissingModuleSource]
-from openpyxl.styles import PatternFill, Font, Alignment, Border, Side  # pyright: ignore[reportMissingModuleSource]
-from openpyxl.utils import get_column_letter  # type: ignore
-
-print("=" * 60)
-print("🎯 CMMC LEVEL 2 AC CONTROLS ASSESSMENT DEMO")
-print("📺 Aspire Cyber Podcast Educational Version")
-print("=" * 60)
+from collectors import DATA_DIR, EVIDENCE_DIR, build_collectors, run_collectors
+from evidence_cache import DEFAULT_MAX_AGE_DAYS, DEFAULT_MAX_BYTES, EvidenceCache
+from metrics import METRICS_FORMATS, ConsoleSink, Metrics, metrics_sink
 
 # Mock company configuration
 MOCK_COMPANY = {
@@ -70,369 +69,581 @@ AC_CONTROLS = {
 }
 
 
-def generate_ac_evidence():
-    """Generate mock evidence for AC controls with multiple rows for multiple evidence"""
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    evidence = [
-        # AC.L2-3.1.1 - First evidence
-        {
-            "control_id": "AC.L2-3.1.1",
-            "control_name": AC_CONTROLS["AC.L2-3.1.1"]["name"],
-            "status": "COMPLIANT",
-            "implementation": "Role-based access control via Google Cloud Identity + Active Directory",
-            "evidence": "Access Control Policy",
-            "test_result": "Verified 10 sample users - all properly provisioned",
-            "last_tested": now,
-        },
-        # AC.L2-3.1.1 - Second evidence
-        {
-            "control_id": "",
-            "control_name": "",
-            "status": "",
-            "implementation": "",
-            "evidence": "Q3 Access Review",
-            "test_result": "",
-            "last_tested": "",
-        },
-        # AC.L2-3.1.3
-        {
-            "control_id": "AC.L2-3.1.3",
-            "control_name": AC_CONTROLS["AC.L2-3.1.3"]["name"],
-            "status": "COMPLIANT",
-            "implementation": "CUI isolated in dedicated VPC with DLP policies",
-            "evidence": "Network Segmentation Diagram",
-            "test_result": "Firewall rules validated, DLP blocking test successful",
-            "last_tested": now,
-        },
-        # AC.L2-3.1.6 - First evidence
-        {
-            "control_id": "AC.L2-3.1.6",
-            "control_name": AC_CONTROLS["AC.L2-3.1.6"]["name"],
-            "status": "COMPLIANT",
-            "implementation": "15-minute timeout enforced via GPO and Workspace policy",
-            "evidence": "GPO Config",
-            "test_result": "Tested 25 random workstations - all locked at 15 minutes",
-            "last_tested": now,
-        },
-        # AC.L2-3.1.6 - Second evidence
-        {
-            "control_id": "",
-            "control_name": "",
-            "status": "",
-            "implementation": "",
-            "evidence": "Session Lock Test Results",
-            "test_result": "",
-            "last_tested": "",
-        },
-        # AC.L2-3.1.7
-        {
-            "control_id": "AC.L2-3.1.7",
-            "control_name": AC_CONTROLS["AC.L2-3.1.7"]["name"],
-            "status": "COMPLIANT",
-            "implementation": "2-year minimum retention for all user identifiers",
-            "evidence": "Identity Management Procedure",
-            "test_result": "Verified naming convention prevents collisions",
-            "last_tested": now,
-        },
-        # AC.L2-3.1.12
-        {
-            "control_id": "AC.L2-3.1.12",
-            "control_name": AC_CONTROLS["AC.L2-3.1.12"]["name"],
-            "status": "COMPLIANT",
-            "implementation": "All remote access through VPN with MFA, sessions recorded",
-            "evidence": "Remote Access Monitoring Report",
-            "test_result": "SIEM alerts working, demonstrated anomaly detection",
-            "last_tested": now,
-        },
-        # AC.L2-3.1.20 - First evidence
-        {
-            "control_id": "AC.L2-3.1.20",
-            "control_name": AC_CONTROLS["AC.L2-3.1.20"]["name"],
-            "status": "PARTIALLY_COMPLIANT",
-            "implementation": "Continuous monitoring of 12 external connections",
-            "evidence": "Connection Inventory",
-            "test_result": "2 vendor attestations expired - access auto-restricted to read-only",
-            "last_tested": now,
-            "finding": "Vendor attestations expired for VEN-003 and VEN-007",
-            "remediation": "Updated attestations expected by month-end",
-        },
-        # AC.L2-3.1.20 - Second evidence
-        {
-            "control_id": "",
-            "control_name": "",
-            "status": "",
-            "implementation": "",
-            "evidence": "Dashboard Screenshot",
-            "test_result": "",
-            "last_tested": "",
-            "finding": "",
-            "remediation": "",
-        },
-        # AC.L2-3.1.20 - Third evidence
-        {
-            "control_id": "",
-            "control_name": "",
-            "status": "",
-            "implementation": "",
-            "evidence": "Firewall Logs",
-            "test_result": "",
-            "last_tested": "",
-            "finding": "",
-            "remediation": "",
-        },
-        # AC.L2-3.1.20 - Fourth evidence
-        {
-            "control_id": "",
-            "control_name": "",
-            "status": "",
-            "implementation": "",
-            "evidence": "Alert Email",
-            "test_result": "",
-            "last_tested": "",
-            "finding": "",
-            "remediation": "",
-        },
-    ]
-    return pd.DataFrame(evidence)
+def generate_ac_evidence(collectors=None, max_workers=None, cache=None, company=None, controls=None,
+                         data_dir=DATA_DIR, evidence_dir=EVIDENCE_DIR):
+    """Collect evidence for AC controls with multiple rows for multiple evidence
 
+    Runs one collector per control in AC_CONTROLS concurrently (see collectors.py);
+    with an EvidenceCache only controls whose inputs changed are recomputed.
+    """
+    import pandas as pd  # pyright: ignore[reportMissingModuleSource]
 
-def generate_continuous_monitoring_data():
-    """Generate continuous monitoring evidence for AC.L2-3.1.20"""
-    vendors = [
-        ("VEN-001", "Raytheon", "Valid", "2024-12-15"),
-        ("VEN-002", "Lockheed", "Valid", "2024-11-30"),
-        ("VEN-003", "Northrop", "EXPIRED", "2024-08-30"),
-        ("VEN-004", "Boeing", "Valid", "2025-01-15"),
-        ("VEN-007", "L3Harris", "EXPIRED", "2024-08-28"),
-    ]
-    now = (datetime.now() - timedelta(hours=2)).strftime("%Y-%m-%d %H:%M:%S")
-
-    rows = []
-    for ven_id, name, status, expiry in vendors:
-        rows.append(
-            {
-                "connection_id": ven_id,
-                "vendor_name": name,
-                "connection_type": "VPN",
-                "attestation_status": status,
-                "expiry_date": expiry,
-                "last_activity": now,
-                "data_transferred_24h": f"{np.random.randint(50, 500)}MB",  # pyright: ignore[reportUndefinedVariable]
-                "risk_score": "HIGH" if status == "EXPIRED" else "LOW",
-                "access_level": "Read-Only" if status == "EXPIRED" else "Full",
-                "monitoring_status": "Active",
-                "alerts_sent": "Yes" if status == "EXPIRED" else "No",
-            }
+    if collectors is None:
+        collectors = build_collectors(
+            controls or AC_CONTROLS,
+            data_dir=data_dir,
+            evidence_dir=evidence_dir,
+            assessment_date=(company or MOCK_COMPANY)["assessment_date"],
         )
-    return pd.DataFrame(rows)
-
-
-def generate_assessment_summary(evidence_df):
-    """Generate executive summary of assessment"""
-    # Count unique controls, not rows
-    unique_controls = evidence_df[evidence_df['control_id'] != '']['control_id'].nunique()
-    
-    # Count status only for rows with control_id (not continuation rows)
-    main_rows = evidence_df[evidence_df['control_id'] != '']
-    compliant = len(main_rows[main_rows['status'] == 'COMPLIANT'])
-    partial = len(main_rows[main_rows['status'] == 'PARTIALLY_COMPLIANT'])
-    non_compliant = len(main_rows[main_rows['status'] == 'NON_COMPLIANT'])
-    
+    return pd.DataFrame(run_collectors(collectors, max_workers=max_workers, cache=cache))
+
+
+def state_paths(state_dir=None):
+    """Where a run persists state between runs: the evidence cache, assessment history,
+    firewall log indexes, alert checkpoints and evidence manifest
+
+    Everything goes under ``state_dir`` when given; otherwise each module's
+    default under the repository's output/ directory is used.
+    """
+    if state_dir is None:
+        from alerts import DEFAULT_STATE_DIR
+        from evidence_cache import DEFAULT_CACHE_PATH
+        from firewall_log import DEFAULT_INDEX_DIR
+        from manifest import DEFAULT_MANIFEST_DIR
+        from summary import DEFAULT_HISTORY_PATH
+
+        return {
+            "cache": DEFAULT_CACHE_PATH,
+            "history": DEFAULT_HISTORY_PATH,
+            "firewall_index": DEFAULT_INDEX_DIR,
+            "alert_state": DEFAULT_STATE_DIR,
+            "manifest": DEFAULT_MANIFEST_DIR,
+        }
+    state_dir = Path(state_dir)
+    return {
+        "cache": state_dir / "evidence_cache.sqlite",
+        "history": state_dir / "assessment_history.csv",
+        "firewall_index": state_dir / "firewall_index",
+        "alert_state": state_dir / "alert_state",
+        "manifest": state_dir / "evidence_manifest",
+    }
+
+
+def generate_continuous_monitoring_data(path=DATA_DIR / "external_connections.json", assessment_date=None,
+                                        evidence_dir=EVIDENCE_DIR, state_dir=None):
+    """Generate continuous monitoring evidence for AC.L2-3.1.20 from the connection inventory
+    and the alert state indexed from the monitoring alert feed next to it
+
+    Alert checkpoints and firewall log indexes are kept under ``state_dir`` (see state_paths).
+    """
+    from alerts import load_alert_index
+    from connections import assess_connections, load_connections
+    from firewall_log import DEFAULT_LOG_GLOB
+
+    paths = state_paths(state_dir)
+    inventory = load_connections(path)
+    alert_index = load_alert_index(Path(path).parent / "monitoring_alerts.json", state_dir=paths["alert_state"])
+    monitoring = assess_connections(inventory, assessment_date or MOCK_COMPANY["assessment_date"],
+                                    alert_index=alert_index)
+    monitoring["firewall_restriction"] = verify_firewall_restrictions(
+        monitoring, sorted(Path(evidence_dir).glob(DEFAULT_LOG_GLOB)), index_dir=paths["firewall_index"]
+    )
+    return monitoring
+
+
+def verify_firewall_restrictions(monitoring, log_paths=None, index_dir=None):
+    """Confirm from the indexed firewall logs that each expired connection went to deny"""
+    import numpy as np  # pyright: ignore[reportMissingImports]
+    from firewall_log import DEFAULT_INDEX_DIR, DEFAULT_LOG_GLOB, load_indexes, verify_deny
+
+    if log_paths is None:
+        log_paths = sorted(EVIDENCE_DIR.glob(DEFAULT_LOG_GLOB))
+    indexes = load_indexes(log_paths, index_dir or DEFAULT_INDEX_DIR)
+    results = np.full(len(monitoring), "N/A", dtype=object)
+    expired = monitoring["attestation_status"].astype(str).str.upper().eq("EXPIRED").to_numpy()
+    for i in np.flatnonzero(expired):
+        conn_id, expiry = monitoring["connection_id"].iat[i], monitoring["expiry_date"].iat[i]
+        denied_at = verify_deny(indexes, conn_id, since=expiry if isinstance(expiry, str) else None)
+        results[i] = (
+            f"Deny confirmed {np.datetime_as_string(denied_at, unit='s')}" if denied_at is not None
+            else "Not found in firewall logs"
+        )
+    return results
+
+
+def generate_access_review_exceptions(path=EVIDENCE_DIR / "AC_3.1.1_Q3_Access_Review.csv"):
+    """Stale, unreviewed-CUI and orphaned-manager exceptions from the AC.L2-3.1.1 access review"""
+    from access_review import analyze_access_review_cached
+
+    _, exceptions = analyze_access_review_cached(path)
+    return exceptions
+
+
+def generate_identifier_reuse_violations(evidence_dir=EVIDENCE_DIR, assessment_date=None):
+    """Current identifiers reusing an archived one inside the AC.L2-3.1.7 retention window"""
+    from identifier_reuse import analyze_identifier_reuse_cached
+
+    evidence_dir = Path(evidence_dir)
+    _, violations = analyze_identifier_reuse_cached(
+        evidence_dir / "AC_3.1.7_Identity_Management_Procedure.md",
+        evidence_dir / "AC_3.1.1_Q3_Access_Review.csv",
+        assessment_date or MOCK_COMPANY["assessment_date"],
+    )
+    return violations
+
+
+def generate_remote_access_data(path=DATA_DIR / "remote_access_logs.json"):
+    """Per-user remote access session statistics for AC.L2-3.1.12"""
+    from remote_access import analyze_remote_access_cached
+
+    _, per_user = analyze_remote_access_cached(path)
+    return per_user
+
+
+def generate_assessment_summary(evidence_df, company=None, history=None):
+    """Generate executive summary of assessment
+
+    Status counts come from one groupby pass (summary.status_counts). With a run
+    ``history`` the change in compliance rate against the previous run of the
+    same company and assessment (``company["assessment_id"]``) is added.
+    """
+    import pandas as pd  # pyright: ignore[reportMissingModuleSource]
+    from summary import previous_run, status_counts
+
+    company = company or MOCK_COMPANY
+    counts = status_counts(evidence_df).iloc[0]
+
     summary = {
-        'Assessment Date': [MOCK_COMPANY['assessment_date']],
-        'Company': [MOCK_COMPANY['name']],
-        'Total AC Controls': [unique_controls],  # Should be 6, not 11
-        'Fully Compliant': [compliant],  # Should be 5
-        'Partially Compliant': [partial],  # Should be 1
-        'Non-Compliant': [non_compliant],  # Should be 0
-        'Compliance Rate': [f"{(compliant/unique_controls)*100:.1f}%"],
-        'Critical Findings': [partial]
+        'Assessment Date': [company['assessment_date']],
+        'Company': [company['name']],
+        'Total AC Controls': [int(counts['total_controls'])],
+        'Fully Compliant': [int(counts['compliant'])],
+        'Partially Compliant': [int(counts['partially_compliant'])],
+        'Non-Compliant': [int(counts['non_compliant'])],
+        'Compliance Rate': [f"{counts['compliance_rate']:.1f}%"],
+        'Critical Findings': [int(counts['partially_compliant'])]
     }
-    
+    if history is not None:
+        previous = previous_run(history, company["name"], company.get("assessment_id", ""))
+        summary['Change vs Previous Run'] = [
+            f"{counts['compliance_rate'] - previous['compliance_rate'].iloc[-1]:+.1f} pts"
+            if not previous.empty else "First recorded run"
+        ]
+
     return pd.DataFrame(summary)
 
 
-def _auto_fit_and_style(ws, zebra=True):
-    """Apply header style, auto-width, filters, freeze panes, zebra rows, and borders."""
-    # Header style
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    center = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    thin = Side(style="thin", color="D9D9D9")
-    border = Border(left=thin, right=thin, top=thin, bottom=thin)
-
-    # Freeze header row & add filter
-    ws.freeze_panes = "A2"
-    ws.auto_filter.ref = ws.dimensions
-
-    # Header row styling
-    for col in range(1, ws.max_column + 1):
-        c = ws.cell(row=1, column=col)
-        c.fill = header_fill
-        c.font = header_font
-        c.alignment = center
-        c.border = border
-
-    # Auto-fit columns (cap width)
-    for col_idx in range(1, ws.max_column + 1):
-        letter = get_column_letter(col_idx)
-        max_len = 0
-        for row in range(1, ws.max_row + 1):
-            v = ws.cell(row=row, column=col_idx).value
-            v_len = len(str(v)) if v is not None else 0
-            max_len = max(max_len, v_len)
-        ws.column_dimensions[letter].width = min(max_len + 2, 50)
-
-    # Zebra striping + borders
-    if zebra and ws.max_row >= 3:
-        alt_fill = PatternFill(start_color="F7F9FC", end_color="F7F9FC", fill_type="solid")
-        for r in range(2, ws.max_row + 1):
-            if r % 2 == 0:
-                for c in range(1, ws.max_column + 1):
-                    cell = ws.cell(row=r, column=c)
-                    cell.fill = alt_fill
-                    cell.border = border
-            else:
-                for c in range(1, ws.max_column + 1):
-                    ws.cell(row=r, column=c).border = border
-
-
-def _color_cues(ws, sheet_name):
-    """Contextual color cues per sheet."""
-    # Evidence sheet: status in column 3
-    if sheet_name == "AC_Controls_Evidence":
-        status_col = 3
-        green = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-        yellow = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-        for r in range(2, ws.max_row + 1):
-            val = ws.cell(row=r, column=status_col).value
-            if val == "COMPLIANT":
-                ws.cell(row=r, column=status_col).fill = green
-            elif val == "PARTIALLY_COMPLIANT":
-                ws.cell(row=r, column=status_col).fill = yellow
-
-    # External Monitoring: risk_score and attestation status
-    if sheet_name == "External_Monitoring":
-        # Find columns by header
-        headers = {ws.cell(row=1, column=c).value: c for c in range(1, ws.max_column + 1)}
-        risk_col = headers.get("risk_score")
-        attest_col = headers.get("attestation_status")
-        high = PatternFill(start_color="F8CBAD", end_color="F8CBAD", fill_type="solid")  # soft red
-        warn = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")  # soft yellow
-
-        if risk_col:
-            for r in range(2, ws.max_row + 1):
-                if ws.cell(row=r, column=risk_col).value == "HIGH":
-                    ws.cell(row=r, column=risk_col).fill = high
-
-        if attest_col:
-            for r in range(2, ws.max_row + 1):
-                if str(ws.cell(row=r, column=attest_col).value).upper() == "EXPIRED":
-                    ws.cell(row=r, column=attest_col).fill = high
-                elif str(ws.cell(row=r, column=attest_col).value).upper() == "VALID":
-                    ws.cell(row=r, column=attest_col).fill = warn
-
-
-def add_hyperlinks_to_evidence(worksheet):
-    """Add hyperlinks to evidence column"""
-    github_base = "https://github.com/securedbyjc/cmmc-ac-controls-demo/blob/main/evidence_samples/"
-    
-    # Define evidence links mapping - THIS WAS MISSING
-    evidence_links = {
-        2: [("AC_3.1.1_Access_Control_Policy.md", "Access Control Policy")],
-        3: [("AC_3.1.1_Q3_Access_Review.csv", "Q3 Access Review")],
-        4: [("AC_3.1.3_CUI_Network_Segmentation_Diagram.png", "Network Segmentation Diagram")],
-        5: [("AC_3.1.6_Session_Lock_GPO.xml", "GPO Config")],
-        6: [("AC_3.1.6_Session_Lock_Test_Results.md", "Session Lock Test Results")],
-        7: [("AC_3.1.7_Identity_Management_Procedure.md", "Identity Management Procedure")],
-        8: [("AC_3.1.12_Remote_Access_Monitoring_Report.md", "Remote Access Monitoring Report")],
-        9: [("AC_3.1.20_External_Connection_Inventory.md", "Connection Inventory")],
-        10: [("Screenshot_Dashboard_VEN003_Restricted.md", "Dashboard Screenshot")],
-        11: [("Firewall_Log_VEN003_Restriction.log", "Firewall Logs")],
-        12: [("Email_Alert_VEN003_Expiry.md", "Alert Email")],
+def record_assessment_history(evidence_df, company=None, path=None):
+    """Append this run's status counts to the assessment history used for trends"""
+    from summary import DEFAULT_HISTORY_PATH, append_history, history_record, status_counts
+
+    company = company or MOCK_COMPANY
+    record = history_record(status_counts(evidence_df), company['name'], company['assessment_date'],
+                            company.get('assessment_id', ''))
+    append_history(record, path or DEFAULT_HISTORY_PATH)
+
+
+# Detail stages of generate_report_data and the control each one evidences
+STAGE_CONTROLS = {
+    "monitoring": "AC.L2-3.1.20",
+    "remote_access": "AC.L2-3.1.12",
+    "access_exceptions": "AC.L2-3.1.1",
+    "identifier_reuse": "AC.L2-3.1.7",
+}
+DETAIL_SHEETS = (
+    ("monitoring", "External_Monitoring"),
+    ("remote_access", "Remote_Access_Sessions"),
+    ("access_exceptions", "Access_Review_Exceptions"),
+    ("identifier_reuse", "Identifier_Reuse_Violations"),
+)
+
+GITHUB_EVIDENCE_BASE = "https://github.com/securedbyjc/cmmc-ac-controls-demo/blob/main/evidence_samples/"
+
+LINK_MODES = ("github", "local")  # repository URLs, or paths relative to the workbook (offline packs)
+
+
+def evidence_link_base(link_mode="github", evidence_dir=EVIDENCE_DIR, output_file=None):
+    """Hyperlink prefix for evidence artifacts
+
+    "local" links are relative to the workbook's folder so an evidence pack can
+    be zipped and opened offline.
+    """
+    if link_mode == "github":
+        return GITHUB_EVIDENCE_BASE
+    if link_mode == "local":
+        start = Path(output_file).resolve().parent if output_file else Path.cwd()
+        return Path(os.path.relpath(Path(evidence_dir).resolve(), start)).as_posix() + "/"
+    raise ValueError(f"Unknown link mode: {link_mode!r} (expected one of {', '.join(LINK_MODES)})")
+
+
+def attach_artifact_hashes(evidence, manifest):
+    """Insert an ``evidence_sha256`` column next to each row's artifact reference"""
+    evidence = evidence.copy()
+    hashes = evidence["artifact"].map(manifest.sha256) if "artifact" in evidence.columns else ""
+    position = evidence.columns.get_loc("artifact") + 1 if "artifact" in evidence.columns else len(evidence.columns)
+    evidence.insert(position, "evidence_sha256", hashes)
+    return evidence
+
+
+def report_sheets(data, link_base=GITHUB_EVIDENCE_BASE):
+    """(sheet name, DataFrame, style options) for every sheet, in workbook order
+
+    Detail sheets whose stage was not run (control not selected) are left out.
+    Evidence hyperlinks are resolved from each row's ``artifact`` column through
+    the manifest's artifact index while the rows are written.
+    """
+    from manifest import link_resolver
+
+    resolve = link_resolver(data["manifest"]["artifact"].astype(str).tolist(), link_base)
+    return [
+        ("AC_Controls_Evidence", data["evidence"],
+         {"link_column": "evidence", "link_source": "artifact", "resolve_link": resolve}),
+        ("Executive_Summary", data["summary"], {"accent_column": "Compliance Rate"}),
+        *[(sheet, data[key], {}) for key, sheet in DETAIL_SHEETS if key in data],
+        ("Evidence_Manifest", data["manifest"], {}),
+    ]
+
+
+def generate_report_data(cache=None, company=None, controls=None, data_dir=DATA_DIR, evidence_dir=EVIDENCE_DIR,
+                         metrics=None, state_dir=None, history_path=None):
+    """Run every data stage of the assessment; returns DataFrames keyed by stage
+
+    company/controls/data_dir/evidence_dir default to the demo configuration.
+    Detail stages (STAGE_CONTROLS) only run when their control is selected; the
+    analyses shared with collectors run before evidence collection so their
+    cost is reported under their own stage rather than under "evidence".
+    Each stage reports its timing, rows and input bytes to ``metrics`` (a
+    metrics.Metrics recorder) when one is given. History, manifest, alert and
+    firewall index state is kept under ``state_dir`` (see state_paths);
+    ``history_path`` overrides where the run history is read and appended.
+    """
+    from manifest import EvidenceManifest
+    from metrics import Metrics
+    from summary import load_history
+
+    company = company or MOCK_COMPANY
+    metrics = metrics if metrics is not None else Metrics()
+    data_dir, evidence_dir = Path(data_dir), Path(evidence_dir)
+    paths = state_paths(state_dir)
+    history_path = history_path or paths["history"]
+    connections_path = data_dir / "external_connections.json"
+    sessions_path = data_dir / "remote_access_logs.json"
+    access_review_path = evidence_dir / "AC_3.1.1_Q3_Access_Review.csv"
+    procedure_path = evidence_dir / "AC_3.1.7_Identity_Management_Procedure.md"
+
+    selected = set(controls or AC_CONTROLS)
+    data = {}
+    # the detail analyses run first, each in its own stage; their collectors then reuse the memoized results
+    if STAGE_CONTROLS["remote_access"] in selected:
+        with metrics.stage("remote_access") as stage:
+            data["remote_access"] = generate_remote_access_data(sessions_path)
+            stage.count(rows=len(data["remote_access"]), nbytes=_file_size(sessions_path))
+    if STAGE_CONTROLS["access_exceptions"] in selected:
+        with metrics.stage("access_review") as stage:
+            data["access_exceptions"] = generate_access_review_exceptions(access_review_path)
+            stage.count(rows=len(data["access_exceptions"]), nbytes=_file_size(access_review_path))
+    if STAGE_CONTROLS["identifier_reuse"] in selected:
+        with metrics.stage("identifier_reuse") as stage:
+            data["identifier_reuse"] = generate_identifier_reuse_violations(evidence_dir, company["assessment_date"])
+            stage.count(rows=len(data["identifier_reuse"]),
+                        nbytes=_file_size(procedure_path) + _file_size(access_review_path))
+    with metrics.stage("evidence") as stage:
+        evidence = generate_ac_evidence(cache=cache, company=company, controls=controls,
+                                        data_dir=data_dir, evidence_dir=evidence_dir)
+        stage.count(rows=len(evidence))
+    with metrics.stage("manifest") as stage:
+        manifest = EvidenceManifest(evidence_dir, paths["manifest"])
+        manifest.build()
+        stage.count(rows=len(manifest.entries), nbytes=sum(e["size"] for e in manifest.entries.values()))
+    if STAGE_CONTROLS["monitoring"] in selected:
+        with metrics.stage("monitoring") as stage:
+            data["monitoring"] = generate_continuous_monitoring_data(connections_path, company["assessment_date"],
+                                                                     evidence_dir, state_dir)
+            stage.count(rows=len(data["monitoring"]), nbytes=_file_size(connections_path))
+    with metrics.stage("summary") as stage:
+        summary = generate_assessment_summary(evidence, company=company, history=load_history(history_path))
+        record_assessment_history(evidence, company=company, path=history_path)
+        stage.count(rows=len(summary))
+    return {
+        "evidence": attach_artifact_hashes(evidence, manifest),
+        "summary": summary,
+        **{key: data[key] for key in STAGE_CONTROLS if key in data},
+        "manifest": manifest.to_frame(),
     }
-    
-    # Add hyperlinks to evidence column (column 5)
-    for row, links in evidence_links.items():
-        if links:
-            file, text = links[0]
-            cell = worksheet.cell(row=row, column=5)
-            cell.hyperlink = f"{github_base}{file}"
-            cell.font = Font(color="0563C1", underline="single")
-
-
-def create_excel_report(output_file: Path) -> Path:
-    """Generate comprehensive Excel report with hyperlinks and styling"""
-    # Generate data
-    evidence = generate_ac_evidence()
-    monitoring = generate_continuous_monitoring_data()
-    summary = generate_assessment_summary(evidence)
+
+
+def _file_size(path):
+    try:
+        return Path(path).stat().st_size
+    except OSError:
+        return 0
+
+
+def write_excel_report(output_file: Path, sheets, engine: str = "openpyxl") -> Path:
+    """Write and style ``sheets`` (see report_sheets) with the chosen engine
+
+    engine="streaming" writes through write-only worksheets and styles each row
+    as it is written, keeping memory flat for large evidence/monitoring sets.
+    """
+    if engine == "streaming":
+        from streaming_writer import write_report_streaming
+
+        return write_report_streaming(output_file, sheets)
+
+    import pandas as pd  # pyright: ignore[reportMissingModuleSource]
+    from styling import StyleCache, style_worksheet
 
     with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-        # Write all three sheets (index=False to keep it clean)
-        evidence.to_excel(writer, sheet_name="AC_Controls_Evidence", index=False)
-        summary.to_excel(writer, sheet_name="Executive_Summary", index=False)
-        monitoring.to_excel(writer, sheet_name="External_Monitoring", index=False)
-
-        # Access workbook and sheets
-        wb = writer.book
-        ws_evidence = writer.sheets["AC_Controls_Evidence"]
-        ws_summary = writer.sheets["Executive_Summary"]
-        ws_monitor = writer.sheets["External_Monitoring"]
-
-        # Add hyperlinks in the evidence sheet
-        add_hyperlinks_to_evidence(ws_evidence)
-
-        # Apply consistent styling
-        for name, ws in [
-            ("AC_Controls_Evidence", ws_evidence),
-            ("Executive_Summary", ws_summary),
-            ("External_Monitoring", ws_monitor),
-        ]:
-            _auto_fit_and_style(ws, zebra=True)
-            _color_cues(ws, name)
-
-        # Executive summary: emphasize Compliance Rate cell
-        # Locate "Compliance Rate" column and apply accent fill to its data cell
-        headers = {ws_summary.cell(row=1, column=c).value: c for c in range(1, ws_summary.max_column + 1)}
-        comp_col = headers.get("Compliance Rate")
-        if comp_col:
-            data_cell = ws_summary.cell(row=2, column=comp_col)
-            data_cell.fill = PatternFill(start_color="DDEBF7", end_color="DDEBF7", fill_type="solid")
-            data_cell.font = Font(bold=True)
+        # Write all sheets (index=False to keep it clean)
+        for name, df, _ in sheets:
+            df.to_excel(writer, sheet_name=name, index=False)
+
+        # Style every sheet in one row-major pass (hyperlinks, zebra, color cues)
+        cache = StyleCache()
+        for name, df, options in sheets:
+            style_worksheet(writer.sheets[name], name, df, cache=cache, **options)
 
     return output_file
 
 
+def persist_report_data(data, store, assessment_date):
+    """Write every stage to the columnar store and read it back for rendering"""
+    store.write_run(data, assessment_date)
+    return store.read_run(assessment_date, stages=list(data))
+
+
+def render_report(output_file: Path, engine: str = "openpyxl", cache=None, store=None, link_mode="github",
+                  metrics=None, **config):
+    """Generate the report data and the workbook; returns (workbook path, data)
+
+    Same arguments as create_excel_report. ``data`` holds the DataFrames the
+    workbook was rendered from (read back from the store when one is used).
+    """
+    from metrics import Metrics
+
+    metrics = metrics if metrics is not None else Metrics()
+    link_base = evidence_link_base(link_mode, config.get("evidence_dir", EVIDENCE_DIR), output_file)
+    data = generate_report_data(cache=cache, metrics=metrics, **config)
+    if store is not None:
+        with metrics.stage("store") as stage:
+            written = store.bytes_written
+            data = persist_report_data(data, store, (config.get("company") or MOCK_COMPANY)["assessment_date"])
+            stage.count(rows=sum(len(df) for df in data.values()), nbytes=store.bytes_written - written)
+    with metrics.stage("workbook") as stage:
+        sheets = report_sheets(data, link_base)
+        output_file = write_excel_report(output_file, sheets, engine=engine)
+        stage.count(rows=sum(len(df) for _, df, _ in sheets), nbytes=_file_size(output_file))
+    return output_file, data
+
+
+def create_excel_report(output_file: Path, engine: str = "openpyxl", cache=None, store=None,
+                        link_mode="github", metrics=None, **config) -> Path:
+    """Generate comprehensive Excel report with hyperlinks and styling
+
+    ``config`` is passed to generate_report_data (company, controls, data_dir, evidence_dir, state_dir,
+    history_path).
+    With an AssessmentStore (see store.py) the data is persisted first and the
+    workbook is rendered from the store. ``link_mode`` is one of LINK_MODES.
+    Stage timings go to ``metrics`` (a metrics.Metrics recorder) when given.
+    """
+    return render_report(output_file, engine=engine, cache=cache, store=store, link_mode=link_mode,
+                         metrics=metrics, **config)[0]
+
+
+DEFAULT_CONFIG = {
+    "company": None,  # company dict; defaults to MOCK_COMPANY
+    "controls": None,  # {control_id: control} subset of AC_CONTROLS; defaults to all
+    "data_dir": DATA_DIR,
+    "evidence_dir": EVIDENCE_DIR,
+    "output_dir": "output",
+    "output_file": None,  # defaults to <output_dir>/cmmc_ac_assessment_<timestamp>.xlsx
+    "engine": "openpyxl",
+    "evidence_links": "github",  # one of LINK_MODES
+    "cache": None,  # an open EvidenceCache owned by the caller; overrides use_cache
+    "use_cache": True,
+    "refresh": False,
+    "cache_max_age_days": DEFAULT_MAX_AGE_DAYS,
+    "cache_max_bytes": DEFAULT_MAX_BYTES,
+    "use_store": True,  # persist to the columnar store when pyarrow is installed
+    "store_dir": None,  # defaults to <output_dir>/assessment_store
+    "state_dir": None,  # evidence cache, history, indexes, checkpoints, manifest; defaults to <output_dir>
+    "history_path": None,  # run history CSV; defaults to <state_dir>/assessment_history.csv
+    "metrics": None,  # a metrics.Metrics recorder; every pipeline stage reports to it
+}
+
+
+def build_report(config=None) -> Path:
+    """Library entry point: generate one assessment workbook and return its path
+
+    ``config`` overrides keys of DEFAULT_CONFIG. Nothing is printed.
+    """
+    return run_assessment(config)[0]
+
+
+def run_assessment(config=None):
+    """Like build_report, but returns (workbook path, report data keyed by stage)"""
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    unknown = set(config) - set(DEFAULT_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown config key(s): {', '.join(sorted(unknown))}")
+
+    output_file = config["output_file"]
+    if output_file is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_file = Path(config["output_dir"]) / f"cmmc_ac_assessment_{timestamp}.xlsx"
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    state_dir = config["state_dir"] if config["state_dir"] is not None else config["output_dir"]
+
+    cache, owns_cache = config["cache"], False
+    if cache is None and config["use_cache"]:
+        cache = EvidenceCache(
+            state_paths(state_dir)["cache"],
+            max_age_days=config["cache_max_age_days"],
+            max_bytes=config["cache_max_bytes"],
+            refresh=config["refresh"],
+        )
+        owns_cache = True
+    store = None
+    if config["use_store"]:
+        from store import AssessmentStore, available as store_available
+
+        if store_available():
+            store = AssessmentStore(config["store_dir"] or Path(config["output_dir"]) / "assessment_store")
+    try:
+        return render_report(
+            output_file,
+            engine=config["engine"],
+            cache=cache,
+            store=store,
+            link_mode=config["evidence_links"],
+            metrics=config["metrics"],
+            company=config["company"],
+            controls=config["controls"],
+            data_dir=config["data_dir"],
+            evidence_dir=config["evidence_dir"],
+            state_dir=state_dir,
+            history_path=config["history_path"],
+        )
+    finally:
+        if owns_cache:
+            cache.close()
+
+
+def results_summary_lines(data):
+    """Console results summary built from the report's Executive_Summary and evidence rows"""
+    from summary import main_rows
+
+    summary = data["summary"].iloc[0]
+    rows = main_rows(data["evidence"])
+    status = rows["status"].astype(str)
+
+    def controls(n):
+        return f"{n} control{'' if n == 1 else 's'}"
+
+    def ids(value):
+        return ", ".join(rows.loc[status == value, "control_id"].astype(str))
+
+    total, compliant = int(summary["Total AC Controls"]), int(summary["Fully Compliant"])
+    lines = [f"{compliant} of {total} AC controls FULLY COMPLIANT"]
+    for label, key, value in (
+        ("PARTIALLY COMPLIANT", "Partially Compliant", "PARTIALLY_COMPLIANT"),
+        ("NON-COMPLIANT", "Non-Compliant", "NON_COMPLIANT"),
+    ):
+        if int(summary[key]):
+            lines.append(f"{controls(int(summary[key]))} {label} ({ids(value)})")
+    not_assessed = int((status == "NOT_ASSESSED").sum())
+    if not_assessed:
+        lines.append(f"{controls(not_assessed)} NOT ASSESSED ({ids('NOT_ASSESSED')})")
+    change = summary.get("Change vs Previous Run")
+    change = "" if change is None or change != change else f" ({change})"  # NaN-safe
+    lines.append(f"Compliance rate: {summary['Compliance Rate']}{change}")
+    findings = rows["finding"].fillna("").astype(str) if "finding" in rows.columns else None
+    if findings is not None:
+        for control_id, finding in zip(rows["control_id"], findings):
+            if finding:
+                lines.append(f"Finding ({control_id}): {finding}")
+    return lines
+
+
 def main():
     """Main execution"""
     parser = argparse.ArgumentParser(description="CMMC AC Controls Assessment Demo")
     parser.add_argument("--assessment", default="AC_CONTROLS", help="Assessment type")
+    parser.add_argument(
+        "--engine",
+        choices=["openpyxl", "streaming"],
+        default="openpyxl",
+        help="Excel output engine (streaming keeps memory flat for large datasets)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Disable the evidence cache")
+    parser.add_argument("--refresh", action="store_true", help="Recompute all controls and refresh the cache")
+    parser.add_argument("--cache-max-age-days", type=float, default=DEFAULT_MAX_AGE_DAYS,
+                        help="Evict cached evidence older than this")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help="Evict least-recently used evidence above this size")
+    parser.add_argument("--no-store", action="store_true", help="Do not persist to the columnar (Parquet) store")
+    parser.add_argument("--state-dir", help="Keep the evidence cache, history, log indexes, alert checkpoints and "
+                                            "manifest here instead of under output/")
+    parser.add_argument("--links", choices=LINK_MODES, default="github",
+                        help="Evidence hyperlinks: GitHub URLs or paths relative to the workbook (offline packs)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the run (cProfile + tracemalloc); reports go to output/profile/")
+    parser.add_argument("--metrics", choices=METRICS_FORMATS, default="json",
+                        help="Per-stage metrics: JSON lines (output/pipeline_metrics.jsonl), a Prometheus "
+                             "text file (output/pipeline_metrics.prom) or off")
     args = parser.parse_args()
 
+    print("=" * 60)
+    print("🎯 CMMC LEVEL 2 AC CONTROLS ASSESSMENT DEMO")
+    print("📺 Aspire Cyber Podcast Educational Version")
+    print("=" * 60)
+
     print(f"\n📋 Generating assessment for: {MOCK_COMPANY['name']}")
     print(f"👥 Employees: {MOCK_COMPANY['employees']} ({MOCK_COMPANY['cui_users']} with CUI access)")
     print(f"🔒 Focus: CMMC Level 2 Access Control Requirements\n")
 
-    # Generate report
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = Path(f"output/cmmc_ac_assessment_{timestamp}.xlsx")
-    output_file.parent.mkdir(exist_ok=True)
-
     print("⚙️  Collecting evidence from mock systems...")
-    print("   ✓ Access control matrix")
-    print("   ✓ Session policies")
-    print("   ✓ Remote access logs")
-    print("   ✓ External connection monitoring")
-
-    report = create_excel_report(output_file)
+    metrics_file = metrics_sink(args.metrics, DEFAULT_CONFIG["output_dir"])
+    metrics = Metrics(
+        [ConsoleSink(), *([metrics_file] if metrics_file else [])],
+        labels={"company": MOCK_COMPANY["name"], "assessment_date": MOCK_COMPANY["assessment_date"]},
+    )
+
+    state_dir = args.state_dir or DEFAULT_CONFIG["output_dir"]
+    cache = None
+    if not args.no_cache:
+        cache = EvidenceCache(
+            state_paths(state_dir)["cache"],
+            max_age_days=args.cache_max_age_days,
+            max_bytes=int(args.cache_max_mb * 1024 * 1024),
+            refresh=args.refresh,
+        )
+    profiler, profile_paths = nullcontext(), None
+    if args.profile:
+        from profiling import profile_run
+
+        profiler = profile_run(Path(DEFAULT_CONFIG["output_dir"]) / "profile")
+    try:
+        with profiler as profile_paths:
+            report, data = run_assessment({"engine": args.engine, "cache": cache, "use_cache": cache is not None,
+                                           "use_store": not args.no_store, "evidence_links": args.links,
+                                           "metrics": metrics, "state_dir": state_dir})
+    finally:
+        metrics.close()
+        if cache is not None:
+            cache.close()
+            print(f"   ↺ Evidence cache: {cache.hits} controls reused, {cache.misses} recomputed")
 
     print(f"\n✅ Assessment complete!")
     print(f"📁 Report generated: {report}")
+    if not args.no_store:
+        from store import available as store_available
+
+        if store_available():
+            print(f"🗄  Columnar store: {Path(DEFAULT_CONFIG['output_dir']) / 'assessment_store'}")
+        else:
+            print("   (columnar store skipped: pip install pyarrow to enable it)")
+    if profile_paths:
+        print(f"🔬 Profile: {profile_paths['cprofile']} (cProfile), {profile_paths['tracemalloc']} (tracemalloc)")
+        if profile_paths["note"]:
+            print(f"   ({profile_paths['note']})")
+    if metrics_file:
+        total = sum(r["seconds"] for r in metrics.records)
+        print(f"⏱  Stage metrics: {metrics_file.path} ({len(metrics.records)} stages, {total:.2f}s)")
     print("\n📊 Results Summary:")
-    print("   • 5 of 6 AC controls FULLY COMPLIANT")
-    print("   • 1 control PARTIALLY COMPLIANT (AC.L2-3.1.20)")
-    print("   • Finding: 2 vendor attestations expired (auto-restricted)")
+    for line in results_summary_lines(data):
+        print(f"   • {line}")
     print("\n" + "=" * 60)
     print("This educational demo shows automated evidence generation.")
     print("For production use, implement real API integrations.")
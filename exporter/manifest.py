@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Evidence artifact integrity manifest
+Hashes every file in the evidence folder (SHA-256) on a thread pool with
+chunked, mmap-backed reads and records size, mtime and digest. The manifest is
+kept under output/evidence_manifest/ and files whose size and mtime are
+unchanged since the last run are not re-hashed
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from urllib.parse import quote
+
+from collectors import EVIDENCE_DIR, REPO_ROOT
+
+DEFAULT_MANIFEST_DIR = REPO_ROOT / "output" / "evidence_manifest"
+CHUNK_SIZE = 8 * 1024 * 1024  # hashlib releases the GIL while digesting each chunk
+MANIFEST_COLUMNS = ["artifact", "size_bytes", "modified", "sha256"]
+
+
+def artifact_sha256(path, chunk_size=CHUNK_SIZE):
+    """SHA-256 hex digest of ``path``, read through a memory map in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for start in range(0, len(view), chunk_size):
+                    digest.update(view[start:start + chunk_size])
+            finally:
+                view.release()
+    return digest.hexdigest()
+
+
+class EvidenceManifest:
+    """Size, mtime and SHA-256 of every artifact under ``evidence_dir``.
+
+    ``entries`` maps the artifact path relative to ``evidence_dir`` (POSIX
+    separators) to ``{"size", "mtime_ns", "sha256"}``.
+    """
+
+    def __init__(self, evidence_dir=EVIDENCE_DIR, manifest_dir=DEFAULT_MANIFEST_DIR):
+        self.evidence_dir = Path(evidence_dir)
+        self.manifest_dir = Path(manifest_dir)
+        self.entries = {}
+        self.hashed = 0
+        self.reused = 0
+
+    @property
+    def path(self):
+        key = hashlib.sha1(str(self.evidence_dir.resolve()).encode()).hexdigest()[:16]
+        return self.manifest_dir / f"{key}.json"
+
+    def _load_previous(self):
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))["entries"]
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def build(self, max_workers=None):
+        """Scan the evidence folder, hashing only new or changed files; returns ``entries``."""
+        previous = self._load_previous()
+        entries, pending = {}, []
+        for path in sorted(p for p in self.evidence_dir.rglob("*") if p.is_file()):
+            name = path.relative_to(self.evidence_dir).as_posix()
+            st = path.stat()
+            old = previous.get(name)
+            if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                entries[name] = old
+            else:
+                entries[name] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": None}
+                pending.append(name)
+
+        if pending:
+            if max_workers is None:
+                max_workers = min(len(pending), (os.cpu_count() or 1) * 2)
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                digests = pool.map(artifact_sha256, [self.evidence_dir / name for name in pending])
+                for name, digest in zip(pending, digests):
+                    entries[name]["sha256"] = digest
+
+        self.entries = entries
+        self.hashed, self.reused = len(pending), len(entries) - len(pending)
+        if pending or set(previous) != set(entries):
+            self.save()
+        return entries
+
+    def save(self):
+        """Atomically write the manifest."""
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        data = {"evidence_dir": str(self.evidence_dir.resolve()), "entries": self.entries}
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def sha256(self, artifact):
+        """Digest recorded for ``artifact`` (relative path), or "" if it is not in the folder."""
+        entry = self.entries.get(Path(artifact).as_posix())
+        return entry["sha256"] if entry else ""
+
+    def to_frame(self):
+        """Manifest as a DataFrame (``MANIFEST_COLUMNS``) for the workbook."""
+        import pandas as pd  # pyright: ignore[reportMissingModuleSource]
+
+        return pd.DataFrame(
+            [
+                (name, e["size"], datetime.fromtimestamp(e["mtime_ns"] / 1e9).strftime("%Y-%m-%d %H:%M:%S"),
+                 e["sha256"])
+                for name, e in self.entries.items()
+            ],
+            columns=MANIFEST_COLUMNS,
+        )
+
+
+def link_resolver(artifacts, link_base):
+    """Callable mapping an artifact reference to its hyperlink target.
+
+    ``artifacts`` are the manifest's relative paths; a reference resolves by
+    relative path or by file name. ``link_base`` is a URL prefix (e.g. the
+    repository's evidence folder) or a relative path prefix for offline
+    evidence packs. Unknown references resolve to None (no link).
+    """
+    index = {}
+    for rel in artifacts:
+        index.setdefault(PurePosixPath(rel).name, rel)
+    index.update((rel, rel) for rel in artifacts)
+    encode = quote if "://" in link_base else str
+
+    def resolve(reference):
+        rel = index.get(reference) if reference else None
+        return f"{link_base}{encode(rel)}" if rel else None
+
+    return resolve
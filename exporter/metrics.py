@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Per-stage pipeline instrumentation
+Each stage of a run reports its wall time, row count and byte count to a
+Metrics recorder, which hands every record to pluggable hooks: JSON lines
+(output/pipeline_metrics.jsonl), a Prometheus text-format file
+(output/pipeline_metrics.prom, for the node_exporter textfile collector) or
+the console
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+METRICS_FORMATS = ("json", "prometheus", "off")
+METRIC_PREFIX = "cmmc_pipeline_stage"
+
+
+class StageTimer:
+    """Times one stage; call ``count`` inside the block to attach rows/bytes."""
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.record = {"stage": stage, "seconds": None, "rows": None, "bytes": None, "ok": True}
+
+    def count(self, rows=None, nbytes=None):
+        if rows is not None:
+            self.record["rows"] = int(rows)
+        if nbytes is not None:
+            self.record["bytes"] = int(nbytes)
+        return self
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record["seconds"] = round(time.perf_counter() - self._started, 6)
+        self.record["ok"] = exc_type is None
+        self.metrics.emit(self.record)
+        return False
+
+
+class Metrics:
+    """Collects stage records and passes each one to every hook.
+
+    A hook is any callable taking the record dict (``stage``, ``seconds``,
+    ``rows``, ``bytes``, ``ok``, ``timestamp`` plus ``labels``); hooks with a
+    ``close`` method are closed by ``close``. With no hooks records are only
+    kept in ``records``.
+    """
+
+    def __init__(self, hooks=(), labels=None):
+        self.hooks = list(hooks)
+        self.labels = dict(labels or {})
+        self.records = []
+
+    def stage(self, name):
+        return StageTimer(self, name)
+
+    def emit(self, record):
+        record = {"timestamp": datetime.now().isoformat(timespec="milliseconds"), **self.labels, **record}
+        self.records.append(record)
+        for hook in self.hooks:
+            hook(record)
+
+    def close(self):
+        for hook in self.hooks:
+            close = getattr(hook, "close", None)
+            if close is not None:
+                close()
+
+
+class JsonLinesSink:
+    """Appends one JSON object per stage record to ``path``."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, record):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class PrometheusTextSink:
+    """Gauges for the last run's stages, written atomically in Prometheus text format on ``close``.
+
+    ``labels`` names the record keys exported as labels next to ``stage``.
+    """
+
+    GAUGES = (
+        ("seconds", "duration_seconds", "Wall time of the stage in the last run"),
+        ("rows", "rows", "Rows produced by the stage in the last run"),
+        ("bytes", "bytes", "Bytes read or written by the stage in the last run"),
+        ("ok", "success", "1 if the stage completed in the last run, 0 if it raised"),
+    )
+
+    def __init__(self, path, labels=("job", "company")):
+        self.path = Path(path)
+        self.labels = tuple(labels)
+        self.records = []
+
+    def __call__(self, record):
+        self.records.append(record)
+
+    def render(self):
+        lines = []
+        for key, name, help_text in self.GAUGES:
+            lines += [f"# HELP {METRIC_PREFIX}_{name} {help_text}", f"# TYPE {METRIC_PREFIX}_{name} gauge"]
+            for record in self.records:
+                if record.get(key) is None:
+                    continue
+                labels = ",".join(
+                    f'{label}="{_label_value(record[label])}"'
+                    for label in ("stage", *self.labels) if label in record
+                )
+                value = record[key]
+                value = int(value) if isinstance(value, (bool, int)) else float(value)
+                lines.append(f"{METRIC_PREFIX}_{name}{{{labels}}} {value}")
+        lines += [
+            "# HELP cmmc_pipeline_last_run_timestamp_seconds Unix time the last run finished",
+            "# TYPE cmmc_pipeline_last_run_timestamp_seconds gauge",
+            f"cmmc_pipeline_last_run_timestamp_seconds {time.time():.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        if not self.records:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+class ConsoleSink:
+    """Prints one progress line per finished stage."""
+
+    def __init__(self, indent="   "):
+        self.indent = indent
+
+    def __call__(self, record):
+        mark = "✓" if record["ok"] else "✗"
+        detail = [f"{record['seconds']:.2f}s"]
+        if record["rows"] is not None:
+            detail.append(f"{record['rows']:,} row{'' if record['rows'] == 1 else 's'}")
+        if record["bytes"] is not None:
+            detail.append(f"{record['bytes'] / 1024:,.1f} KiB")
+        print(f"{self.indent}{mark} {record['stage']:<18} {', '.join(detail)}")
+
+
+def metrics_sink(fmt, output_dir="output", name="pipeline_metrics"):
+    """File hook for ``fmt`` (one of METRICS_FORMATS) writing <output_dir>/<name>.jsonl|.prom; None for "off"."""
+    if fmt == "json":
+        return JsonLinesSink(Path(output_dir) / f"{name}.jsonl")
+    if fmt == "prometheus":
+        return PrometheusTextSink(Path(output_dir) / f"{name}.prom")
+    if fmt == "off":
+        return None
+    raise ValueError(f"Unknown metrics format: {fmt!r} (expected one of {', '.join(METRICS_FORMATS)})")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling for a real assessment run (main.py --profile)
+Runs the report under cProfile (the main thread and every worker thread it
+starts) and tracemalloc, then writes a .pstats file plus plain-text top-N
+listings by cumulative time and by allocation site under output/profile/
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_PROFILE_DIR = Path("output") / "profile"
+TOP_N = 30
+TRACEMALLOC_FRAMES = 10
+# Before 3.12 cProfile only sees the thread that enabled it, so each worker thread
+# gets its own profiler. From 3.12 one profiler (sys.monitoring) sees every
+# thread and a second one cannot be enabled.
+PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+
+@contextmanager
+def profile_run(profile_dir=DEFAULT_PROFILE_DIR, top=TOP_N):
+    """Profile the enclosed block; yields a dict filled with the written paths on exit.
+
+    Keys: ``pstats`` (load with ``pstats.Stats`` or snakeviz), ``cprofile``
+    (text, sorted by cumulative time), ``tracemalloc`` (text, top allocation
+    sites and the peak) and ``note`` (set when worker threads could not be
+    profiled and only the main thread was).
+    """
+    profilers = []
+    skipped = []
+    lock = threading.Lock()
+
+    def start_thread_profiler(frame, event, arg):
+        # first profile event in a new thread: hand the thread to its own profiler
+        sys.setprofile(None)
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler is active; the thread must still run
+            with lock:
+                skipped.append(threading.current_thread().name)
+            return
+        with lock:
+            profilers.append(profiler)
+
+    main_profiler = cProfile.Profile()
+    paths = {}
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    tracemalloc.reset_peak()
+    if PER_THREAD_PROFILERS:
+        threading.setprofile(start_thread_profiler)
+    main_profiler.enable()
+    try:
+        yield paths
+    finally:
+        main_profiler.disable()
+        if PER_THREAD_PROFILERS:
+            threading.setprofile(None)
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+        with lock:
+            thread_profilers = list(profilers)
+            note = (f"{len(skipped)} worker thread(s) not profiled (another profiler was active); "
+                    "times are for the main thread only") if skipped else None
+        paths.update(_write_reports(Path(profile_dir), main_profiler, thread_profilers, snapshot,
+                                    current, peak, top, note))
+
+
+def _write_reports(profile_dir, main_profiler, thread_profilers, snapshot, current, peak, top, note=None):
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    stem = profile_dir / f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+    stats = pstats.Stats(main_profiler)
+    for profiler in thread_profilers:
+        try:
+            stats.add(profiler)
+        except TypeError:  # a thread that never recorded a call has no stats
+            continue
+    stats.dump_stats(f"{stem}.pstats")
+
+    text = io.StringIO()
+    stats.stream = text
+    if not PER_THREAD_PROFILERS:
+        text.write("cProfile: one profiler covering every thread\n\n")
+    else:
+        text.write(f"cProfile: main thread + {len(thread_profilers)} worker thread(s)\n\n")
+    if note:
+        text.write(f"Note: {note}\n\n")
+    stats.sort_stats("cumulative").print_stats(top)
+    stats.sort_stats("tottime").print_stats(top)
+    Path(f"{stem}_cprofile.txt").write_text(text.getvalue(), encoding="utf-8")
+
+    lines = [
+        f"tracemalloc: peak {peak / 2**20:.1f} MiB, still allocated at exit {current / 2**20:.1f} MiB",
+        "",
+        f"Top {top} allocation sites still allocated at exit (by line):",
+    ]
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+               tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+               tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>")]
+    for stat in snapshot.filter_traces(filters).statistics("lineno")[:top]:
+        lines.append(f"  {stat}")
+    Path(f"{stem}_tracemalloc.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    return {
+        "note": note,
+        "pstats": Path(f"{stem}.pstats"),
+        "cprofile": Path(f"{stem}_cprofile.txt"),
+        "tracemalloc": Path(f"{stem}_tracemalloc.txt"),
+    }
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Remote access session analysis for AC.L2-3.1.12
+Streams VPN session exports (JSON document, JSON-lines, optionally gzipped) in
+chunks and aggregates per-user statistics with vectorized pandas operations
+"""
+
+import gzip
+import json
+import threading
+import warnings
+from pathlib import Path
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+import pandas as pd  # pyright: ignore[reportMissingModuleSource]
+
+try:  # incremental parsing of single-document JSON exports (see requirements.txt)
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    ijson = None
+
+DEFAULT_CHUNKSIZE = 50_000
+SESSION_COLUMNS = ["user", "timestamp", "source_ip", "mfa_verified", "session_duration", "accessed_cui", "recorded"]
+UNKNOWN_USER = "(no user)"  # bucket for sessions exported without a user
+DURATION_PATTERN = r"^\s*(?:(?P<h>\d+)\s*h)?\s*(?:(?P<m>\d+)\s*m)?\s*$"
+
+
+def _open(path):
+    path = Path(path)
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def _is_json_lines(path):
+    suffixes = Path(path).suffixes
+    return any(s in (".jsonl", ".ndjson") for s in suffixes)
+
+
+def _batched(records, size):
+    batch = []
+    for rec in records:
+        batch.append(rec)
+        if len(batch) >= size:
+            yield pd.DataFrame.from_records(batch, columns=SESSION_COLUMNS)
+            batch = []
+    if batch:
+        yield pd.DataFrame.from_records(batch, columns=SESSION_COLUMNS)
+
+
+def iter_session_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield DataFrames of at most ``chunksize`` session records.
+
+    JSON-lines exports (``.jsonl``/``.ndjson``, optionally ``.gz``) are read with
+    pandas' chunked reader. Single-document exports (``{"sessions": [...]}``) are
+    parsed incrementally with ijson; without it they are loaded whole, with a
+    warning.
+    """
+    if _is_json_lines(path):
+        with _open(path) as f:
+            for chunk in pd.read_json(f, lines=True, chunksize=chunksize, dtype=False):
+                yield chunk.reindex(columns=SESSION_COLUMNS)
+        return
+    if ijson is None:
+        warnings.warn(
+            f"ijson is not installed: loading all of {path} into memory; "
+            "pip install ijson (or export JSON lines) to stream it",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+    with _open(path) as f:
+        records = ijson.items(f, "sessions.item") if ijson is not None else json.load(f).get("sessions", [])
+        yield from _batched(records, chunksize)
+
+
+def parse_durations(durations):
+    """Vectorized "2h 15m" / "45m" / "3h" -> minutes (float, NaN if unparseable)."""
+    parts = durations.astype("string").str.extract(DURATION_PATTERN)
+    hours = pd.to_numeric(parts["h"], errors="coerce")
+    minutes = pd.to_numeric(parts["m"], errors="coerce")
+    total = hours.fillna(0) * 60 + minutes.fillna(0)
+    return total.where(hours.notna() | minutes.notna()).astype(float)
+
+
+def _chunk_aggregate(chunk):
+    """Per-user partial aggregates for one chunk."""
+    mfa = chunk["mfa_verified"].fillna(False).astype(bool)
+    cui = chunk["accessed_cui"].fillna(False).astype(bool)
+    recorded = chunk["recorded"].fillna(False).astype(bool)
+    minutes = parse_durations(chunk["session_duration"])
+    frame = pd.DataFrame(
+        {
+            "user": chunk["user"].astype("string").fillna(UNKNOWN_USER),
+            "sessions": 1,
+            "mfa_verified": mfa.astype(np.int64),
+            "cui_sessions": cui.astype(np.int64),
+            "unrecorded_cui_sessions": (cui & ~recorded).astype(np.int64),
+            "duration_total_min": minutes.fillna(0.0),
+            "duration_max_min": minutes,
+            "duration_known": minutes.notna().astype(np.int64),
+        }
+    )
+    return frame.groupby("user", sort=False).agg(
+        sessions=("sessions", "sum"),
+        mfa_verified=("mfa_verified", "sum"),
+        cui_sessions=("cui_sessions", "sum"),
+        unrecorded_cui_sessions=("unrecorded_cui_sessions", "sum"),
+        duration_total_min=("duration_total_min", "sum"),
+        duration_max_min=("duration_max_min", "max"),
+        duration_known=("duration_known", "sum"),
+    )
+
+
+def analyze_remote_access(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Stream a session export and return (summary dict, per-user DataFrame)."""
+    partial = None
+    for chunk in iter_session_chunks(path, chunksize):
+        agg = _chunk_aggregate(chunk)
+        if partial is None:
+            partial = agg
+        else:
+            # Only the per-user partials are kept between chunks
+            both = pd.concat([partial, agg])
+            partial = both.groupby(level=0, sort=False).agg(
+                {
+                    "sessions": "sum",
+                    "mfa_verified": "sum",
+                    "cui_sessions": "sum",
+                    "unrecorded_cui_sessions": "sum",
+                    "duration_total_min": "sum",
+                    "duration_max_min": "max",
+                    "duration_known": "sum",
+                }
+            )
+    if partial is None:
+        partial = _chunk_aggregate(pd.DataFrame(columns=SESSION_COLUMNS))
+
+    per_user = partial.sort_index()
+    known = per_user["duration_known"].replace(0, np.nan)
+    per_user["mfa_ratio"] = (per_user["mfa_verified"] / per_user["sessions"]).round(3)
+    per_user["duration_avg_min"] = (per_user["duration_total_min"] / known).round(1)
+    per_user["review_status"] = np.where(
+        (per_user["mfa_ratio"] < 1) | (per_user["unrecorded_cui_sessions"] > 0), "REVIEW", "OK"
+    )
+
+    sessions = int(per_user["sessions"].sum())
+    mfa = int(per_user["mfa_verified"].sum())
+    durations_known = int(per_user["duration_known"].sum())
+    summary = {
+        "sessions": sessions,
+        "users": int(len(per_user) - (UNKNOWN_USER in per_user.index)),
+        "mfa_verified": mfa,
+        "mfa_ratio": mfa / sessions if sessions else 1.0,
+        "cui_sessions": int(per_user["cui_sessions"].sum()),
+        "unrecorded_cui_sessions": int(per_user["unrecorded_cui_sessions"].sum()),
+        "unattributed_sessions": int(per_user["sessions"].get(UNKNOWN_USER, 0)),
+        "duration_avg_min": float(per_user["duration_total_min"].sum() / durations_known) if durations_known else 0.0,
+        "duration_max_min": float(per_user["duration_max_min"].max()) if durations_known else 0.0,
+    }
+
+    per_user = per_user.reset_index()[
+        [
+            "user",
+            "sessions",
+            "mfa_verified",
+            "mfa_ratio",
+            "cui_sessions",
+            "unrecorded_cui_sessions",
+            "duration_avg_min",
+            "duration_max_min",
+            "review_status",
+        ]
+    ]
+    return summary, per_user
+
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+
+def analyze_remote_access_cached(path, chunksize=DEFAULT_CHUNKSIZE):
+    """``analyze_remote_access`` memoized per (path, size, mtime) within the process.
+
+    Lets the 3.1.12 collector and the Remote_Access_Sessions sheet share one pass.
+    """
+    st = Path(path).stat()
+    key = (str(Path(path).resolve()), st.st_size, st.st_mtime_ns)
+    with _memo_lock:
+        if key not in _memo:
+            _memo.clear()
+            _memo[key] = analyze_remote_access(path, chunksize)
+        summary, per_user = _memo[key]
+    return dict(summary), per_user.copy()
+
+
+def evidence_result(summary):
+    """Main-row fields for the AC.L2-3.1.12 evidence row."""
+    unattributed = summary.get("unattributed_sessions", 0)
+    compliant = summary["mfa_ratio"] >= 1 and summary["unrecorded_cui_sessions"] == 0 and not unattributed
+    result = {
+        "status": "COMPLIANT" if compliant else "PARTIALLY_COMPLIANT",
+        "implementation": "All remote access through VPN with MFA, sessions recorded",
+        "test_result": (
+            f"{summary['sessions']} sessions from {summary['users']} users analyzed: "
+            f"{summary['mfa_ratio']:.0%} MFA-verified, "
+            f"{summary['unrecorded_cui_sessions']} unrecorded CUI sessions, "
+            f"avg duration {summary['duration_avg_min']:.0f} min"
+        ),
+    }
+    if not compliant:
+        result["finding"] = (
+            f"{summary['sessions'] - summary['mfa_verified']} sessions without MFA, "
+            f"{summary['unrecorded_cui_sessions']} CUI sessions not recorded"
+            + (f", {unattributed} sessions without a user" if unattributed else "")
+        )
+        result["remediation"] = "Enforce MFA and session recording on the VPN CUI profile"
+    return result
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Columnar assessment store
+Every stage of a run (evidence, monitoring, summary, remote access, access
+review exceptions, identifier reuse violations, artifact manifest) is kept as Parquet under output/assessment_store/<stage>/,
+hive-partitioned by assessment_date and control_id, so trend queries and
+downstream tools can memory-map just the columns and partitions they need. The Excel workbook is
+rendered from what is read back. pyarrow is optional: without it the store is
+unavailable and reports render straight from the in-memory DataFrames
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pandas as pd  # pyright: ignore[reportMissingModuleSource]
+
+from collectors import REPO_ROOT
+
+try:  # optional: columnar store
+    import pyarrow as pa  # type: ignore
+    import pyarrow.dataset as ds  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    pa = ds = pq = None
+
+DEFAULT_STORE_DIR = REPO_ROOT / "output" / "assessment_store"
+PARTITION_COLUMNS = ("assessment_date", "control_id")
+STAGES = ("evidence", "summary", "monitoring", "remote_access", "access_exceptions", "identifier_reuse", "manifest")
+
+# control_id partition for stages whose rows are not per control
+STAGE_CONTROLS = {
+    "summary": "ALL",
+    "monitoring": "AC.L2-3.1.20",
+    "remote_access": "AC.L2-3.1.12",
+    "access_exceptions": "AC.L2-3.1.1",
+    "identifier_reuse": "AC.L2-3.1.7",
+    "manifest": "ALL",
+}
+
+# helper columns stored alongside the data and removed on read
+ROW_COLUMN = "_row"  # original row order
+BLANK_CONTROL_COLUMN = "_blank_control_id"  # continuation rows carry no control_id
+COLUMNS_METADATA_KEY = b"assessment_columns"  # original column order
+
+
+def available():
+    """True if pyarrow is installed and the store can be used."""
+    return pa is not None
+
+
+class AssessmentStore:
+    """Partitioned Parquet store for the DataFrames of assessment runs.
+
+    Writing a stage replaces everything stored for that stage and assessment
+    date, so re-running a date (even with fewer controls) keeps one snapshot.
+    """
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        if not available():
+            raise ImportError("the columnar assessment store requires pyarrow (pip install pyarrow)")
+        self.root = Path(root)
+        self.bytes_written = 0
+
+    def _partitioning(self):
+        return ds.partitioning(pa.schema([(c, pa.string()) for c in PARTITION_COLUMNS]), flavor="hive")
+
+    def write_stage(self, stage, df, assessment_date):
+        """Persist one stage's DataFrame for ``assessment_date``."""
+        columns = [str(c) for c in df.columns]
+        frame = df.copy()
+        frame[ROW_COLUMN] = range(len(frame))
+        if "control_id" in frame.columns:
+            control_id = frame["control_id"].astype("string")
+            blank = control_id.isna() | (control_id == "")
+            frame[BLANK_CONTROL_COLUMN] = blank.to_numpy()
+            frame["control_id"] = control_id.mask(blank).ffill().fillna("UNASSIGNED").astype(str)
+        else:
+            frame["control_id"] = STAGE_CONTROLS.get(stage, "ALL")
+        frame["assessment_date"] = str(assessment_date)
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), COLUMNS_METADATA_KEY: json.dumps(columns).encode()}
+        )
+        date_dir = self.root / stage / f"assessment_date={assessment_date}"
+        shutil.rmtree(date_dir, ignore_errors=True)  # control partitions missing from this run must go too
+        if not len(frame):
+            self._write_empty(stage, table, date_dir)
+            return
+        written = []
+        ds.write_dataset(
+            table,
+            self.root / stage,
+            format="parquet",
+            partitioning=self._partitioning(),
+            existing_data_behavior="overwrite_or_ignore",
+            basename_template="part-{i}.parquet",
+            file_visitor=lambda f: written.append(f.path),
+        )
+        self.bytes_written += sum(Path(p).stat().st_size for p in written)
+
+    def _write_empty(self, stage, table, date_dir):
+        """Keep a zero-row file for an empty stage so its columns survive the round trip."""
+        path = date_dir / f"control_id={STAGE_CONTROLS.get(stage, 'UNASSIGNED')}" / "part-0.parquet"
+        path.parent.mkdir(parents=True)
+        table = table.drop_columns(list(PARTITION_COLUMNS))
+        # all-null (object) columns would clash with the typed columns of other dates
+        table = table.cast(pa.schema(
+            [f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in table.schema],
+            metadata=table.schema.metadata,
+        ))
+        pq.write_table(table, path)
+        self.bytes_written += path.stat().st_size
+
+    def read_stage(self, stage, assessment_date=None, control_ids=None, columns=None):
+        """Read one stage back as the DataFrame that was written.
+
+        ``assessment_date``/``control_ids`` prune partitions and ``columns``
+        limits the columns read; files are memory-mapped. Without a date filter
+        the partition columns are kept so runs can be told apart.
+        """
+        path = self.root / stage
+        if not path.exists():
+            return pd.DataFrame(columns=columns or [])
+        filters = []
+        if assessment_date is not None:
+            filters.append(("assessment_date", "=", str(assessment_date)))
+        if control_ids is not None:
+            filters.append(("control_id", "in", [str(c) for c in control_ids]))
+
+        read_columns = None
+        if columns is not None:
+            read_columns = list(dict.fromkeys([*columns, *PARTITION_COLUMNS, ROW_COLUMN]))
+            schema = pq.read_schema(next(path.rglob("*.parquet")))
+            if BLANK_CONTROL_COLUMN in schema.names:
+                read_columns.append(BLANK_CONTROL_COLUMN)
+        table = pq.read_table(path, columns=read_columns, filters=filters or None, memory_map=True,
+                              partitioning="hive")
+        metadata = table.schema.metadata or {}
+        df = table.to_pandas()
+        for col in PARTITION_COLUMNS:
+            df[col] = df[col].astype(str)
+
+        sort = [ROW_COLUMN] if assessment_date is not None else ["assessment_date", ROW_COLUMN]
+        df = df.sort_values(sort, kind="stable").reset_index(drop=True)
+        if BLANK_CONTROL_COLUMN in df.columns:
+            df.loc[df[BLANK_CONTROL_COLUMN].astype(bool), "control_id"] = ""
+
+        original = json.loads(metadata[COLUMNS_METADATA_KEY]) if COLUMNS_METADATA_KEY in metadata else []
+        keep = [c for c in (columns or original) if c in df.columns]
+        if assessment_date is None:
+            keep += [c for c in PARTITION_COLUMNS if c not in keep]
+        return df[keep] if keep else df.drop(columns=[ROW_COLUMN, BLANK_CONTROL_COLUMN], errors="ignore")
+
+    def write_run(self, data, assessment_date):
+        """Persist every stage in ``data`` (as returned by main.generate_report_data)."""
+        for stage in STAGES:
+            if stage in data:
+                self.write_stage(stage, data[stage], assessment_date)
+
+    def read_run(self, assessment_date, stages=STAGES):
+        """Every stage of one assessment date, keyed like main.generate_report_data."""
+        return {stage: self.read_stage(stage, assessment_date) for stage in stages}
+
+    def assessment_dates(self, stage="evidence"):
+        """Assessment dates present for ``stage``, oldest first."""
+        path = self.root / stage
+        if not path.exists():
+            return []
+        return sorted(p.name.split("=", 1)[1] for p in path.glob("assessment_date=*") if p.is_dir())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Streaming Excel writer for the CMMC AC assessment workbook
+Writes rows into write-only worksheets so memory stays flat at any row count
+"""
+
+from pathlib import Path
+
+import pandas as pd  # pyright: ignore[reportMissingModuleSource]
+from openpyxl import Workbook  # pyright: ignore[reportMissingModuleSource]
+from openpyxl.cell import WriteOnlyCell  # pyright: ignore[reportMissingModuleSource]
+
+from styling import SheetStyler, StyleCache, apply_layout
+
+
+def _write_sheet(wb, sheet_name, df, cache, **style_kwargs):
+    """Stream one DataFrame into a write-only sheet, styling each row as it is written."""
+    ws = wb.create_sheet(sheet_name)
+    columns = list(df.columns)
+    n_rows = len(df) + 1
+
+    # Layout must be declared before the first row is streamed
+    apply_layout(ws, df, n_rows)
+    styler = SheetStyler(sheet_name, columns, n_rows, cache=cache, **style_kwargs)
+
+    header = [WriteOnlyCell(ws, value=col) for col in columns]
+    styler.style_header(header)
+    ws.append(header)
+
+    for r, values in enumerate(df.itertuples(index=False, name=None), start=2):
+        # NaN/NaT/NA -> empty cell, as DataFrame.to_excel does
+        values = [None if pd.isna(v) else v for v in values]
+        cells = [WriteOnlyCell(ws, value=v) for v in values]
+        styler.style_row(r, cells, values)
+        ws.append(cells)
+    return ws
+
+
+def write_report_streaming(output_file: Path, sheets) -> Path:
+    """Write the assessment sheets with write-only worksheets.
+
+    ``sheets`` is a list of (sheet name, DataFrame, style options) as passed to
+    ``SheetStyler`` (hyperlinks, link_column, accent_column).
+    """
+    wb = Workbook(write_only=True)
+    cache = StyleCache()
+    for name, df, options in sheets:
+        _write_sheet(wb, name, df, cache, **options)
+    wb.save(output_file)
+    return output_file
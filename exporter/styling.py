@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Single-pass styling engine for the CMMC AC assessment workbook
+Column widths come from the DataFrame, styles are interned once per workbook,
+and every cell is styled in one row-major pass (or as it is streamed)
+"""
+
+from copy import copy
+
+from openpyxl.styles import PatternFill, Font, Alignment, Border, Side  # pyright: ignore[reportMissingModuleSource]
+from openpyxl.utils import get_column_letter  # type: ignore
+
+from connections import MONITORING_GAP
+
+MAX_COLUMN_WIDTH = 50
+
+THIN = Side(style="thin", color="D9D9D9")
+BORDER = Border(left=THIN, right=THIN, top=THIN, bottom=THIN)
+CENTER = Alignment(horizontal="center", vertical="center", wrap_text=True)
+
+FILLS = {
+    "header": PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+    "zebra": PatternFill(start_color="F7F9FC", end_color="F7F9FC", fill_type="solid"),
+    "green": PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"),
+    "yellow": PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid"),
+    "red": PatternFill(start_color="F8CBAD", end_color="F8CBAD", fill_type="solid"),  # soft red
+    "accent": PatternFill(start_color="DDEBF7", end_color="DDEBF7", fill_type="solid"),
+}
+FONTS = {
+    "header": Font(color="FFFFFF", bold=True),
+    "link": Font(color="0563C1", underline="single"),
+    "bold": Font(bold=True),
+}
+
+# Status color cues: sheet -> column -> upper-cased value -> fill name
+STATUS_FILLS = {
+    "AC_Controls_Evidence": {
+        "status": {"COMPLIANT": "green", "PARTIALLY_COMPLIANT": "yellow"},
+    },
+    "External_Monitoring": {
+        "risk_score": {"HIGH": "red", "MEDIUM": "yellow"},
+        "attestation_status": {"EXPIRED": "red", "EXPIRING": "yellow", "VALID": "yellow"},
+        "firewall_restriction": {"NOT FOUND IN FIREWALL LOGS": "red"},
+        "alerts_sent": {MONITORING_GAP.upper(): "red"},
+    },
+    "Remote_Access_Sessions": {
+        "review_status": {"OK": "green", "REVIEW": "yellow"},
+    },
+    "Access_Review_Exceptions": {
+        "state": {"RESOLVED": "green", "OPEN": "red"},
+    },
+    "Identifier_Reuse_Violations": {
+        "match_type": {"EXACT": "red", "CASE-NORMALIZED": "yellow", "NEAR-DUPLICATE": "yellow"},
+    },
+}
+
+
+def column_widths(df, cap=MAX_COLUMN_WIDTH):
+    """Auto-fit widths per column from vectorized string lengths (header included)."""
+    widths = []
+    for col in df.columns:
+        values = df[col]
+        lengths = values.astype("string").fillna("").str.len()
+        max_len = max(int(lengths.max()) if len(lengths) else 0, len(str(col)))
+        widths.append(min(max_len + 2, cap))
+    return widths
+
+
+def apply_layout(ws, df, n_rows=None):
+    """Column widths, frozen header and auto-filter; safe before rows are streamed."""
+    n_rows = len(df) + 1 if n_rows is None else n_rows
+    for idx, width in enumerate(column_widths(df), start=1):
+        ws.column_dimensions[get_column_letter(idx)].width = width
+    ws.freeze_panes = "A2"
+    ws.auto_filter.ref = f"A1:{get_column_letter(max(len(df.columns), 1))}{n_rows}"
+
+
+class StyleCache:
+    """Interns one style per distinct (fill, font, border, alignment) key per workbook.
+
+    The first cell with a key registers the style objects; every later cell only
+    copies the resolved style indices.
+    """
+
+    def __init__(self):
+        self._resolved = {}
+
+    def apply(self, cell, key):
+        resolved = self._resolved.get(key)
+        if resolved is not None:
+            cell._style = copy(resolved)
+            return
+        fill, font, bordered, centered = key
+        if fill:
+            cell.fill = FILLS[fill]
+        if font:
+            cell.font = FONTS[font]
+        if bordered:
+            cell.border = BORDER
+        if centered:
+            cell.alignment = CENTER
+        self._resolved[key] = copy(cell._style)
+
+
+HEADER_KEY = ("header", "header", True, True)
+
+
+class SheetStyler:
+    """Resolves the style key for every cell of one sheet in a single pass.
+
+    Hyperlinks go on ``link_column``: either from ``hyperlinks`` (worksheet row
+    -> URL) or, row by row, by passing the row's ``link_source`` value to
+    ``resolve_link``.
+    """
+
+    def __init__(self, sheet_name, columns, n_rows, hyperlinks=None, link_column=None,
+                 accent_column=None, zebra=True, cache=None, link_source=None, resolve_link=None):
+        self.columns = list(columns)
+        self.zebra = zebra and n_rows >= 3
+        self.hyperlinks = hyperlinks or {}
+        self.resolve_link = resolve_link
+        self.cache = cache if cache is not None else StyleCache()
+        cues = STATUS_FILLS.get(sheet_name, {})
+        self._cues = [cues.get(col) for col in self.columns]
+        self._link_idx = self.columns.index(link_column) if link_column in self.columns else None
+        self._source_idx = (
+            self.columns.index(link_source) if resolve_link is not None and link_source in self.columns else None
+        )
+        self._accent_idx = self.columns.index(accent_column) if accent_column in self.columns else None
+
+    def style_header(self, cells):
+        for cell in cells:
+            self.cache.apply(cell, HEADER_KEY)
+
+    def style_row(self, r, cells, values):
+        """Style the cells of worksheet row ``r`` (2-based data rows)."""
+        base_fill = "zebra" if self.zebra and r % 2 == 0 else None
+        link_url = None
+        if self._link_idx is not None:
+            link_url = self.hyperlinks.get(r)
+            if link_url is None and self._source_idx is not None:
+                link_url = self.resolve_link(values[self._source_idx])
+        for idx, (cell, value) in enumerate(zip(cells, values)):
+            fill, font = base_fill, None
+            cue = self._cues[idx]
+            if cue is not None and value is not None:
+                fill = cue.get(str(value).upper(), fill)
+            if idx == self._link_idx and link_url:
+                cell.hyperlink = link_url
+                font = "link"
+            if idx == self._accent_idx and r == 2:
+                fill, font = "accent", "bold"
+            if fill or font or self.zebra:
+                self.cache.apply(cell, (fill, font, self.zebra, False))
+
+
+def style_worksheet(ws, sheet_name, df, **kwargs):
+    """Style a worksheet already populated from ``df`` in one row-major pass."""
+    n_rows = len(df) + 1
+    apply_layout(ws, df, n_rows)
+    styler = SheetStyler(sheet_name, df.columns, n_rows, **kwargs)
+    rows = ws.iter_rows(min_row=1, max_row=n_rows, max_col=len(df.columns))
+    styler.style_header(next(rows))
+    for r, cells in enumerate(rows, start=2):
+        styler.style_row(r, cells, [c.value for c in cells])
+    return ws
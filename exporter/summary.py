@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Executive summary engine
+Status counts come from one groupby pass over the evidence, for a single
+assessment or rolled up across many (business unit, enclave, quarter), with
+trend deltas against earlier runs of the same (company, assessment) kept in
+output/assessment_history.csv
+"""
+
+import os
+from pathlib import Path
+
+import pandas as pd  # pyright: ignore[reportMissingModuleSource]
+
+try:
+    import fcntl
+except ImportError:  # Windows: history appends are not locked
+    fcntl = None
+
+DEFAULT_HISTORY_PATH = Path(__file__).resolve().parent.parent / "output" / "assessment_history.csv"
+HISTORY_KEYS = ("company", "assessment")  # one trend line per company enclave/assessment
+ROLLUP_DIMENSIONS = ("business_unit", "enclave", "quarter")
+
+# Evidence status -> summary count column
+STATUS_COUNTS = {
+    "COMPLIANT": "compliant",
+    "PARTIALLY_COMPLIANT": "partially_compliant",
+    "NON_COMPLIANT": "non_compliant",
+    "NOT_ASSESSED": "not_assessed",
+}
+COUNT_COLUMNS = ["total_controls", *STATUS_COUNTS.values()]
+
+
+def main_rows(evidence):
+    """Control rows only (continuation rows carry no control_id)."""
+    control_id = evidence["control_id"]
+    return evidence[control_id.notna() & (control_id != "")]
+
+
+def status_counts(evidence, by=()):
+    """Per-group control totals and status counts in one groupby pass.
+
+    Returns one row per group with ``total_controls`` (control rows, i.e. one per
+    control per assessment), one column per status in ``STATUS_COUNTS`` and a
+    numeric ``compliance_rate`` (percent).
+    """
+    rows = main_rows(evidence)
+    by = list(by)
+    if not by:
+        rows = rows.assign(_all=0)
+    keys = by or ["_all"]
+    counts = (
+        rows.groupby(keys + ["status"], dropna=False, observed=True, sort=False)
+        .size()
+        .unstack("status", fill_value=0)
+    )
+    if not by:
+        counts = counts.reindex([0], fill_value=0)  # one row even without evidence
+    table = counts.reindex(columns=list(STATUS_COUNTS), fill_value=0).rename(columns=STATUS_COUNTS)
+    table.insert(0, "total_controls", counts.sum(axis=1))
+    table = table.fillna(0).astype("int64")
+    total = table["total_controls"].where(table["total_controls"] > 0)
+    table["compliance_rate"] = (table["compliant"] / total * 100).fillna(0.0)
+    table.columns.name = None
+    return table.reset_index(drop=not by)
+
+
+def rollup_assessments(evidence, dimensions=ROLLUP_DIMENSIONS):
+    """Long-form rollup across many assessments, one block per dimension.
+
+    ``evidence`` is the concatenated evidence of several assessments carrying the
+    dimension columns; missing dimensions are skipped. Output columns are
+    ``level``, ``group`` and the ``status_counts`` columns.
+    """
+    frames = []
+    for dim in dimensions:
+        if dim not in evidence.columns:
+            continue
+        table = status_counts(evidence, by=[dim]).rename(columns={dim: "group"})
+        table.insert(0, "level", dim)
+        frames.append(table)
+    overall = status_counts(evidence)
+    overall.insert(0, "group", "ALL")
+    overall.insert(0, "level", "overall")
+    frames.append(overall)
+    return pd.concat(frames, ignore_index=True)
+
+
+def trend_deltas(current, previous, keys):
+    """Join ``current`` to ``previous`` on ``keys`` and add ``<column>_delta`` columns."""
+    metrics = COUNT_COLUMNS + ["compliance_rate"]
+    prev = previous[list(keys) + [m for m in metrics if m in previous.columns]]
+    merged = current.merge(prev, on=list(keys), how="left", suffixes=("", "_previous"))
+    for m in metrics:
+        if f"{m}_previous" in merged.columns:
+            merged[f"{m}_delta"] = merged[m] - merged[f"{m}_previous"]
+    return merged
+
+
+def load_history(path=DEFAULT_HISTORY_PATH):
+    """Earlier run summaries (empty DataFrame if there are none).
+
+    Files written before runs were keyed by assessment get an empty ``assessment``.
+    """
+    path = Path(path)
+    if not path.exists():
+        return pd.DataFrame()
+    history = pd.read_csv(path, dtype={key: "string" for key in HISTORY_KEYS}, keep_default_na=False,
+                          na_values={"compliance_rate": [""]})
+    for key in HISTORY_KEYS:
+        if key not in history.columns:
+            history[key] = ""
+    return history
+
+
+def previous_run(history, company, assessment=""):
+    """Latest history row for one (company, assessment) as a one-row DataFrame (empty if none)."""
+    if history.empty:
+        return history
+    runs = history[(history["company"] == company) & (history["assessment"] == (assessment or ""))]
+    return runs.tail(1)
+
+
+def latest_runs(history, keys):
+    """Most recent history row per ``keys`` (history is append-ordered)."""
+    if history.empty:
+        return history
+    return history.groupby(list(keys), sort=False).tail(1)
+
+
+def history_trends(history, keys=HISTORY_KEYS):
+    """Latest run per ``keys`` with ``<column>_delta`` columns against the run before it."""
+    if history.empty:
+        return history
+    current = latest_runs(history, keys)
+    return trend_deltas(current, latest_runs(history.drop(current.index), keys), keys)
+
+
+def history_record(counts, company, assessment_date, assessment=""):
+    """One history row for a single assessment's ``status_counts`` result."""
+    record = counts.copy()
+    record.insert(0, "assessment", assessment or "")
+    record.insert(0, "company", company)
+    record.insert(0, "assessment_date", assessment_date)
+    return record
+
+
+def append_history(summary, path=DEFAULT_HISTORY_PATH):
+    """Append this run's summary rows to the history file.
+
+    Writers are serialized with an exclusive lock on ``<path>.lock`` so parallel
+    jobs sharing one history neither interleave rows nor write the header twice;
+    a file in an older column layout is rewritten in the current one.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        header = ""
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                header = f.readline().strip()
+        if header and header != ",".join(summary.columns):
+            merged = pd.concat([load_history(path), summary], ignore_index=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            merged.reindex(columns=summary.columns).to_csv(tmp, index=False)
+            os.replace(tmp, path)
+        else:
+            summary.to_csv(path, mode="a", header=not header, index=False)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# the exporter runs as flat scripts from exporter/, so its modules import as top-level names
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "exporter"))
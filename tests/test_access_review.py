@@ -0,0 +1,50 @@
+import pandas as pd
+
+from access_review import analyze_access_review, evidence_result
+from collectors import EVIDENCE_DIR
+
+CSV = """\
+Username,Full Name,Department,CUI Access,Last Login,Manager,Review Status,Action Taken
+alee,Ann Lee,Engineering,Yes,2024-09-30,Bob Wilson,Approved,No Change
+bwilson,Bob Wilson,Engineering,No,2024-09-29,,Approved,No Change
+cstale,Carl Stale,Finance,No,2024-07-01,Bob Wilson,Approved,No Change
+dgone,Dana Gone,Finance,No,2024-06-01,Bob Wilson,Reviewed,Disabled - No login 30+ days
+ecui,Eve Cui,IT,Yes,2024-09-28,Dana Gone,Pending,No Change
+"""
+
+
+def write_export(tmp_path):
+    path = tmp_path / "review.csv"
+    path.write_text(CSV)
+    return path
+
+
+def test_exceptions_cover_stale_unapproved_and_orphaned_accounts(tmp_path):
+    summary, exceptions = analyze_access_review(write_export(tmp_path))
+
+    assert summary["as_of"] == "2024-09-30"  # the export's newest login
+    found = set(zip(exceptions["username"], exceptions["exception"], exceptions["state"]))
+    assert found == {
+        ("cstale", "Stale account", "Open"),
+        ("dgone", "Stale account", "Resolved"),
+        ("ecui", "CUI access without approved review", "Open"),
+        ("bwilson", "Orphaned manager", "Open"),
+        ("ecui", "Orphaned manager", "Open"),
+    }
+    assert (summary["open_stale"], summary["open_cui_unapproved"], summary["open_orphaned"]) == (1, 1, 2)
+    assert evidence_result(summary)["status"] == "PARTIALLY_COMPLIANT"
+
+
+def test_chunked_read_matches_a_single_chunk(tmp_path):
+    path = write_export(tmp_path)
+    whole = analyze_access_review(path, as_of="2024-10-15")
+    chunked = analyze_access_review(path, as_of="2024-10-15", chunksize=2)
+
+    assert chunked[0] == whole[0]
+    pd.testing.assert_frame_equal(chunked[1], whole[1])
+
+
+def test_sample_review_has_no_open_exceptions():
+    summary, exceptions = analyze_access_review(EVIDENCE_DIR / "AC_3.1.1_Q3_Access_Review.csv")
+    assert summary["open_exceptions"] == 0 and summary["resolved_exceptions"] == len(exceptions) > 0
+    assert evidence_result(summary)["status"] == "COMPLIANT"
@@ -0,0 +1,70 @@
+import json
+
+from alerts import AlertIndex, AlertStreamProcessor, iter_alert_file, load_alert_index
+
+
+def alert(conn_id, alert_type, timestamp):
+    return {"connection_id": conn_id, "alert_type": alert_type, "timestamp": timestamp}
+
+
+def append(path, *lines):
+    with open(path, "a", encoding="utf-8") as f:
+        for line in lines:
+            f.write((line if isinstance(line, str) else json.dumps(line)) + "\n")
+
+
+def test_repeats_inside_the_window_are_suppressed():
+    index = AlertIndex(window_hours=24)
+    assert index.add(alert("VEN-003", "ATTESTATION_EXPIRED", "2024-08-30T00:00:00Z"))
+    assert not index.add(alert("VEN-003", "ATTESTATION_EXPIRED", "2024-08-30T12:00:00Z"))
+    assert index.add(alert("VEN-003", "ATTESTATION_EXPIRED", "2024-09-01T00:00:00Z"))
+    assert index.add(alert("VEN-003", "ATTESTATION_EXPIRING", "2024-08-30T12:00:00Z"))
+
+    assert index.counts() == {"VEN-003": 3}
+    assert (index.accepted, index.suppressed) == (3, 1)
+    assert index.last_alert("VEN-003") == "ATTESTATION_EXPIRED 2024-09-01T00:00:00Z"
+
+
+def test_tail_stops_at_a_partial_line(tmp_path):
+    path = tmp_path / "alerts.jsonl"
+    append(path, alert("VEN-001", "ATTESTATION_EXPIRED", "2024-08-01T00:00:00Z"))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"connection_id": "VEN-002"')  # writer mid-line
+
+    read = list(iter_alert_file(path))
+    assert [a["connection_id"] for a, _ in read] == ["VEN-001"]
+    assert read[-1][1] == len(path.read_bytes().split(b"\n")[0]) + 1
+
+
+def test_malformed_lines_are_rejected_and_skipped(tmp_path):
+    path = tmp_path / "alerts.jsonl"
+    append(path, alert("VEN-001", "ATTESTATION_EXPIRED", "2024-08-01T00:00:00Z"), "{not json", "[1, 2]",
+           alert("VEN-002", "ATTESTATION_EXPIRED", "2024-08-02T00:00:00Z"))
+    processor = AlertStreamProcessor(path, state_dir=None)
+
+    assert processor.catch_up() == 4
+    assert processor.offset == path.stat().st_size
+    assert (processor.index.accepted, processor.index.rejected) == (2, 2)
+    assert processor.catch_up() == 0
+
+
+def test_checkpoint_resumes_from_the_saved_offset(tmp_path):
+    path, state_dir = tmp_path / "alerts.jsonl", tmp_path / "state"
+    append(path, alert("VEN-001", "ATTESTATION_EXPIRED", "2024-08-01T00:00:00Z"))
+    assert load_alert_index(path, state_dir=state_dir).counts() == {"VEN-001": 1}
+
+    append(path, alert("VEN-002", "ATTESTATION_EXPIRED", "2024-08-02T00:00:00Z"))
+    processor = AlertStreamProcessor(path, state_dir=state_dir)
+    assert processor.load_checkpoint()
+    assert processor.catch_up() == 1
+    assert processor.index.counts() == {"VEN-001": 1, "VEN-002": 1}
+
+
+def test_rotated_source_is_read_from_the_start(tmp_path):
+    path, state_dir = tmp_path / "alerts.jsonl", tmp_path / "state"
+    append(path, alert("VEN-001", "ATTESTATION_EXPIRED", "2024-08-01T00:00:00Z"))
+    load_alert_index(path, state_dir=state_dir)
+
+    path.write_text(json.dumps(alert("VEN-009", "ATTESTATION_EXPIRING", "2024-09-01T00:00:00Z")) + "\n")
+    assert not AlertStreamProcessor(path, state_dir=state_dir).load_checkpoint()
+    assert load_alert_index(path, state_dir=state_dir).counts() == {"VEN-009": 1}
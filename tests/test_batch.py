@@ -0,0 +1,57 @@
+import json
+
+import pandas as pd
+import pytest
+
+import main
+from batch import history_path, load_manifest, run_job
+from collectors import DATA_DIR, EVIDENCE_DIR
+
+
+def job(**extra):
+    return {"id": "acme-b", "company": {"name": "Acme", "assessment_date": "2024-09-30"},
+            "data_dir": str(DATA_DIR), "evidence_dir": str(EVIDENCE_DIR), **extra}
+
+
+def test_control_subset_limits_every_stage(tmp_path):
+    result = run_job(job(controls=["AC.L2-3.1.1", "AC.L2-3.1.20"]), tmp_path, use_store=False, metrics_format="off")
+
+    assert result["ok"], result.get("traceback")
+    sheets = list(pd.read_excel(result["output"], sheet_name=None))
+    assert sheets == ["AC_Controls_Evidence", "Executive_Summary", "External_Monitoring",
+                      "Access_Review_Exceptions", "Evidence_Manifest"]
+    assert "remote_access" not in result["stages"] and "identifier_reuse" not in result["stages"]
+
+
+def test_job_state_stays_in_the_output_dir(tmp_path, monkeypatch):
+    def no_default_state(state_dir=None):
+        assert state_dir is not None, "job used the repository-level state"
+        return real(state_dir)
+
+    real = main.state_paths
+    monkeypatch.setattr(main, "state_paths", no_default_state)
+    result = run_job(job(controls=["AC.L2-3.1.20"]), tmp_path, use_store=False, metrics_format="off")
+
+    assert result["ok"], result.get("traceback")
+    state = tmp_path / "state" / "acme-b"
+    assert (state / "evidence_cache.sqlite").exists() and (state / "firewall_index").is_dir()
+    assert pd.read_csv(history_path(tmp_path))["assessment"].tolist() == ["acme-b"]
+
+
+@pytest.mark.parametrize("ids", [["acme", "acme"], ["../escape"], ["a/b"], [""], [".hidden"]])
+def test_manifest_rejects_duplicate_or_unsafe_ids(tmp_path, ids):
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(json.dumps({"jobs": [{"id": job_id} for job_id in ids]}))
+
+    with pytest.raises(ValueError):
+        load_manifest(manifest)
+
+
+def test_manifest_defaults_ids_and_dirs(tmp_path):
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(json.dumps({"jobs": [{"id": "acme.q3"}, {"data_dir": "acme/data"}]}))
+
+    jobs = load_manifest(manifest)
+    assert [j["id"] for j in jobs] == ["acme.q3", "job-2"]
+    assert jobs[1]["data_dir"] == str(tmp_path / "acme" / "data")
+    assert jobs[0]["evidence_dir"] == str(EVIDENCE_DIR)
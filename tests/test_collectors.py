@@ -0,0 +1,41 @@
+import shutil
+
+import pytest
+
+from collectors import EVIDENCE_DIR, SessionLockCollector
+
+RESULTS = "AC_3.1.6_Session_Lock_Test_Results.md"
+
+
+@pytest.fixture
+def evidence_dir(tmp_path):
+    for name, _ in SessionLockCollector.artifacts:
+        shutil.copy(EVIDENCE_DIR / name, tmp_path / name)
+    return tmp_path
+
+
+def assess(evidence_dir):
+    return SessionLockCollector({"name": "Session Lock"}, evidence_dir=evidence_dir).assess()
+
+
+def test_session_lock_reports_the_tested_sample(evidence_dir):
+    result = assess(evidence_dir)
+    assert result["status"] == "COMPLIANT"
+    assert result["test_result"] == "Tested 25 random workstations - all locked at 15 minutes"
+
+
+def test_session_lock_failures_make_the_control_non_compliant(evidence_dir):
+    path = evidence_dir / RESULTS
+    path.write_text(path.read_text().replace("Total Tested: 25", "Total Tested: 40").replace("Failed: 0", "Failed: 3"))
+    result = assess(evidence_dir)
+
+    assert result["status"] == "NON_COMPLIANT"
+    assert result["finding"] == "3 of 40 sampled workstations failed the session lock test"
+
+
+def test_session_lock_without_test_results_makes_no_test_claim(evidence_dir):
+    (evidence_dir / RESULTS).unlink()
+    result = assess(evidence_dir)
+
+    assert result["status"] == "COMPLIANT"
+    assert "Tested" not in result["test_result"]
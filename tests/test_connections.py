@@ -0,0 +1,33 @@
+import pandas as pd
+
+from alerts import AlertIndex
+from connections import MONITORING_GAP, assess_connections, evidence_result
+
+
+def inventory():
+    return pd.DataFrame({
+        "id": ["VEN-001", "VEN-002", "VEN-003"],
+        "vendor": ["A", "B", "C"],
+        "type": ["VPN", "VPN", "VPN"],
+        "expires": ["2024-08-01", "2025-12-31", "2024-08-30"],
+        "status": ["EXPIRED", "ACTIVE", "EXPIRED"],
+        "cui_access": [True, False, True],
+    })
+
+
+def test_expired_connection_without_alert_is_a_monitoring_gap():
+    index = AlertIndex()
+    index.add({"connection_id": "VEN-003", "alert_type": "ATTESTATION_EXPIRED", "timestamp": "2024-08-30T00:00:00Z"})
+    monitoring = assess_connections(inventory(), "2024-09-30", alert_index=index)
+
+    assert monitoring["alerts_sent"].tolist() == [MONITORING_GAP, "No", "Yes"]
+    result = evidence_result(monitoring)
+    assert result["status"] == "PARTIALLY_COMPLIANT"
+    assert "Monitoring gap: no expiry alert received for VEN-001" in result["finding"]
+
+
+def test_without_alert_index_no_gap_is_reported():
+    monitoring = assess_connections(inventory(), "2024-09-30")
+
+    assert MONITORING_GAP not in monitoring["alerts_sent"].tolist()
+    assert "Monitoring gap" not in evidence_result(monitoring)["finding"]
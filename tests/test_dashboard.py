@@ -0,0 +1,41 @@
+import io
+
+from dashboard import CompiledTemplate, Markup, dashboard_metrics, render_row, stream_dashboard, write_dashboard
+
+ROWS = [
+    {"connection_id": "VEN-001", "vendor_name": "<Acme & Co>", "attestation_status": "Valid",
+     "expiry_date": "2025-12-31", "alerts": 0},
+    {"connection_id": "VEN-002", "vendor_name": "Beta", "attestation_status": "EXPIRED",
+     "expiry_date": "2024-08-30", "alerts": 2},
+]
+
+
+def test_template_escapes_values_but_not_markup():
+    template = CompiledTemplate("<p>{text}</p>{html}{items}")
+    page = template.render(text="a < b", html=Markup("<br>"), items=["&", Markup("<i>x</i>")])
+    assert page == "<p>a &lt; b</p><br>&amp;<i>x</i>"
+
+
+def test_rows_are_rendered_as_the_page_is_consumed():
+    rendered = []
+
+    def render(row):
+        rendered.append(row["connection_id"])
+        return render_row(row)
+
+    chunks = stream_dashboard(ROWS, updated="2024-09-30 00:00:00", render=render)
+    head = "".join(next(chunks) for _ in range(3))
+    assert "<!DOCTYPE html>" in head and rendered == []
+
+    page = head + "".join(chunks)
+    assert rendered == ["VEN-001", "VEN-002"]
+    assert page.index("VEN-001") < page.index("VEN-002")
+    assert "&lt;Acme &amp; Co&gt;" in page and "<Acme" not in page
+
+
+def test_written_page_matches_the_stream():
+    out = io.StringIO()
+    write_dashboard(ROWS, out, updated="2024-09-30 00:00:00")
+    assert out.getvalue() == "".join(stream_dashboard(ROWS, updated="2024-09-30 00:00:00"))
+    assert dashboard_metrics(ROWS) == {"compliant": 1, "expiring": 0, "expired": 1, "total": 2}
+    assert "✗ 1 Expired" in out.getvalue()
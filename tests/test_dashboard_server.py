@@ -0,0 +1,164 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+import dashboard_server
+
+from dashboard import render_row, row_dom_id
+from dashboard_server import DashboardServer, DashboardState
+
+CONNECTIONS = [
+    {"id": "VEN-001", "vendor": "Vendor A", "type": "VPN", "expires": "2025-12-31"},
+    {"id": "VEN-002", "vendor": "Vendor B", "type": "API", "expires": "2024-08-30", "status": "EXPIRED"},
+]
+
+
+def write(path, data):
+    old = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(json.dumps(data))
+    os.utime(path, ns=(old + 1_000_000_000, old + 1_000_000_000))  # a visible change even on coarse clocks
+
+
+def get(server, path):
+    """Status line and body of ``GET path`` served by ``server.handle``."""
+    async def go():
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        async with listener:
+            reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: test\r\n\r\n".encode())
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return head.split(b"\r\n")[0].decode(), body
+
+    return asyncio.run(go())
+
+
+@pytest.fixture
+def state(tmp_path):
+    write(tmp_path / "external_connections.json", {"connections": CONNECTIONS})
+    write(tmp_path / "monitoring_alerts.json", {"alerts": []})
+    return DashboardState(tmp_path, assessment_date="2024-09-30", state_dir=tmp_path / "state")
+
+
+def test_first_refresh_sends_every_row_then_nothing_until_inputs_change(state):
+    diff = state.refresh()
+    assert [c["id"] for c in diff["changed"]] == ["VEN-001", "VEN-002"]
+    assert diff["removed"] == [] and diff["total"] == 2
+    assert state.refresh() is None
+
+
+def test_refresh_diffs_only_changed_and_removed_rows(state, tmp_path):
+    state.refresh()
+    write(tmp_path / "external_connections.json",
+          {"connections": [dict(CONNECTIONS[0], vendor="Vendor A2")]})
+    diff = state.refresh()
+
+    assert [c["id"] for c in diff["changed"]] == ["VEN-001"]
+    assert diff["removed"] == ["VEN-002"]
+    assert diff["version"] == 2
+
+
+def test_failed_load_keeps_the_view_and_is_retried(state, tmp_path):
+    state.refresh()
+    inventory = tmp_path / "external_connections.json"
+    old = inventory.stat().st_mtime_ns
+    inventory.write_text("{not json")
+    os.utime(inventory, ns=(old + 1_000_000_000, old + 1_000_000_000))
+    with pytest.raises(ValueError):
+        state.refresh()
+    assert state.page(1, 10)["total"] == 2
+
+    write(inventory, {"connections": CONNECTIONS[:1]})
+    assert state.refresh()["removed"] == ["VEN-002"]
+
+
+def test_poll_refresh_logs_failures_instead_of_raising(state, tmp_path, caplog):
+    (tmp_path / "external_connections.json").write_text("{not json")
+    assert asyncio.run(DashboardServer(state).refresh()) is None
+    assert "Dashboard refresh failed" in caplog.text
+
+
+def test_dom_id_is_shared_by_rendered_row_and_diff(state):
+    row = {"connection_id": 'VEN-"<9>', "vendor_name": "X", "attestation_status": "Valid",
+           "expiry_date": "2025-01-01", "alerts": 0}
+    assert f'id="{row_dom_id(row["connection_id"])}"' in render_row(row)
+    diff = state.refresh()
+    assert all(f'id="{c["dom_id"]}"' in c["html"] for c in diff["changed"])
+
+
+def test_alert_checkpoints_go_to_the_state_dir(state, tmp_path):
+    write(tmp_path / "monitoring_alerts.json",
+          {"alerts": [{"connection_id": "VEN-002", "alert_type": "ATTESTATION_EXPIRED",
+                       "timestamp": "2024-08-30T00:00:00Z"}]})
+    diff = state.refresh()
+
+    assert "<td>1</td>" in next(c["html"] for c in diff["changed"] if c["id"] == "VEN-002")
+    assert list((tmp_path / "state" / "alert_state").glob("*.json"))
+
+
+@pytest.mark.parametrize("query", ["page=abc", "page=0", "size=-5", "size=1.5"])
+def test_bad_rows_query_is_a_400(state, query):
+    state.refresh()
+    status, body = get(DashboardServer(state), f"/rows?{query}")
+    assert status == "HTTP/1.1 400 Bad Request"
+    assert b"positive integer" in body
+
+
+def test_rows_are_paged(state):
+    state.refresh()
+    status, body = get(DashboardServer(state), "/rows?page=2&size=1")
+    page = json.loads(body)
+
+    assert status == "HTTP/1.1 200 OK"
+    assert (page["page"], page["pages"], page["total"]) == (2, 2, 2)
+    assert [r["id"] for r in page["rows"]] == ["VEN-002"]
+
+
+def test_events_push_only_changed_rows(state, tmp_path):
+    async def go():
+        server = DashboardServer(state, poll_seconds=0.05)
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+        writer.write(b"GET /events HTTP/1.1\r\n\r\n")
+        await writer.drain()
+        headers = await reader.readuntil(b"\r\n\r\n")
+        while not server.subscribers:
+            await asyncio.sleep(0.01)
+        poller = asyncio.create_task(server.poll_loop())
+        events = [await asyncio.wait_for(reader.readuntil(b"\n\n"), 5)]
+        write(tmp_path / "external_connections.json", {"connections": [dict(CONNECTIONS[1], vendor="Vendor B2")]})
+        events.append(await asyncio.wait_for(reader.readuntil(b"\n\n"), 5))
+        poller.cancel()
+        writer.close()
+        listener.close()
+        return headers, events
+
+    headers, events = asyncio.run(go())
+    assert b"Content-Type: text/event-stream" in headers
+    diffs = []
+    for event in events:
+        name, data = event.decode().strip().split("\n")
+        assert name == "event: rows"
+        diffs.append(json.loads(data.removeprefix("data: ")))
+    assert [c["id"] for c in diffs[0]["changed"]] == ["VEN-001", "VEN-002"]
+    assert [c["id"] for c in diffs[1]["changed"]] == ["VEN-002"] and diffs[1]["removed"] == ["VEN-001"]
+
+
+def test_snapshot_is_sent_in_chunks(state, monkeypatch):
+    monkeypatch.setattr(dashboard_server, "SNAPSHOT_CHUNK_CHARS", 256)
+    state.refresh()
+    status, body = get(DashboardServer(state), "/snapshot")
+
+    chunks = []
+    while True:
+        size, _, body = body.partition(b"\r\n")
+        if int(size, 16) == 0:
+            break
+        chunks.append(body[:int(size, 16)])
+        body = body[int(size, 16) + 2:]
+    assert status == "HTTP/1.1 200 OK" and len(chunks) > 1
+    assert b"".join(chunks).decode() == "".join(state.snapshot_chunks())
@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+import evidence_cache
+from collectors import EvidenceCollector, run_collectors
+from evidence_cache import EvidenceCache
+
+
+class CountingCollector(EvidenceCollector):
+    control_id = "AC.L2-TEST"
+    artifacts = (("policy.md", "Policy"),)
+    calls = 0
+
+    def assess(self):
+        type(self).calls += 1
+        text = self.artifact_path("policy.md").read_text()
+        return {"status": "COMPLIANT", "implementation": text, "test_result": "ok"}
+
+
+@pytest.fixture
+def evidence_dir(tmp_path):
+    path = tmp_path / "evidence"
+    path.mkdir()
+    (path / "policy.md").write_text("v1")
+    CountingCollector.calls = 0
+    return path
+
+
+def collect(cache, evidence_dir):
+    collector = CountingCollector({"name": "Test"}, evidence_dir=evidence_dir, assessment_date="2024-09-30")
+    return run_collectors([collector], cache=cache)
+
+
+def test_miss_then_hit_reuses_rows(tmp_path, evidence_dir):
+    cache = EvidenceCache(tmp_path / "cache.sqlite")
+    first = collect(cache, evidence_dir)
+    second = collect(cache, evidence_dir)
+    cache.close()
+
+    assert CountingCollector.calls == 1
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert second[0]["implementation"] == first[0]["implementation"] == "v1"
+
+
+def test_hit_refreshes_last_tested(tmp_path, evidence_dir):
+    cache = EvidenceCache(tmp_path / "cache.sqlite")
+    key = cache.key_for(CountingCollector({"name": "Test"}, evidence_dir=evidence_dir,
+                                          assessment_date="2024-09-30"))
+    cache.put(key, "AC.L2-TEST", [{"control_id": "AC.L2-TEST", "status": "COMPLIANT",
+                                   "last_tested": "2000-01-01 00:00:00"}])
+    rows = collect(cache, evidence_dir)
+    cache.close()
+
+    assert CountingCollector.calls == 0
+    assert rows[0]["last_tested"] != "2000-01-01 00:00:00"
+
+
+def test_changed_input_is_a_miss(tmp_path, evidence_dir):
+    cache = EvidenceCache(tmp_path / "cache.sqlite")
+    collect(cache, evidence_dir)
+    (evidence_dir / "policy.md").write_text("v2 changed")
+    rows = collect(cache, evidence_dir)
+    cache.close()
+
+    assert CountingCollector.calls == 2
+    assert rows[0]["implementation"] == "v2 changed"
+
+
+def test_unchanged_inputs_are_not_rehashed(tmp_path, evidence_dir, monkeypatch):
+    hashed = []
+    real = evidence_cache.file_sha256
+    monkeypatch.setattr(evidence_cache, "file_sha256", lambda path: hashed.append(path) or real(path))
+    cache = EvidenceCache(tmp_path / "cache.sqlite")
+    collect(cache, evidence_dir)
+    collect(cache, evidence_dir)
+    assert len(hashed) == 1
+
+    policy = evidence_dir / "policy.md"
+    st = policy.stat()
+    os.utime(policy, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    collect(cache, evidence_dir)
+    cache.close()
+    assert len(hashed) == 2
+
+
+class DatedCollector(CountingCollector):
+    date_sensitive = True
+
+
+@pytest.mark.parametrize("cls, calls", [(CountingCollector, 1), (DatedCollector, 2)])
+def test_next_day_hits_unless_date_sensitive(tmp_path, evidence_dir, cls, calls):
+    cls.calls = 0
+    cache = EvidenceCache(tmp_path / "cache.sqlite")
+    for day in ("2024-09-30", "2024-10-01"):
+        run_collectors([cls({"name": "Test"}, evidence_dir=evidence_dir, assessment_date=day)], cache=cache)
+    cache.close()
+
+    assert cls.calls == calls
+    assert (cache.misses, cache.hits) == (calls, 2 - calls)
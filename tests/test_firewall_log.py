@@ -0,0 +1,53 @@
+import numpy as np
+
+import firewall_log
+from firewall_log import FirewallLogIndex, verify_deny
+
+LOG = """\
+2024-08-30T00:00:00.123Z [GRC-CONNECTOR] Query: Check attestation status for VEN-003
+2024-08-30T00:00:00.567Z [RULE-UPDATE] Disabling rule: VEN-003-CUI-ACCESS
+2024-08-30T00:00:00.678Z [RULE-UPDATE] New: deny src:10.20.30.0/24 dst:10.0.10.0/24 port:any
+"""
+
+
+def test_index_is_persisted_and_memory_mapped(tmp_path):
+    log = tmp_path / "Firewall_Log_Test.log"
+    log.write_text(LOG)
+    built = FirewallLogIndex(log, tmp_path / "index").load_or_build()
+
+    reloaded = FirewallLogIndex(log, tmp_path / "index").load_or_build()
+    assert isinstance(reloaded._arrays["ts"], np.memmap)
+    assert verify_deny([reloaded], "VEN-003") == verify_deny([built], "VEN-003") is not None
+    assert len(reloaded.entries("VEN-003")) == 3
+    assert reloaded.entries("VEN-999") == []
+
+
+def test_appended_lines_extend_the_index_and_replace_the_generation(tmp_path):
+    log = tmp_path / "Firewall_Log_Test.log"
+    log.write_text(LOG)
+    index_dir = tmp_path / "index"
+    FirewallLogIndex(log, index_dir).load_or_build()
+    with open(log, "a") as f:
+        f.write("2024-08-30T00:01:00.000Z [MONITOR] Blocked traffic from VEN-004\n")
+
+    index = FirewallLogIndex(log, index_dir).load_or_build()
+    assert [e[1].split()[-1] for e in index.entries("VEN-004")] == ["VEN-004"]
+    assert len([p for p in index_dir.iterdir() if p.is_dir()]) == 1
+
+    index.remove()
+    assert list(index_dir.iterdir()) == []
+
+
+def test_scan_chunks_match_a_single_pass(tmp_path, monkeypatch):
+    log = tmp_path / "Firewall_Log_Test.log"
+    log.write_text(LOG + "".join(f"2024-08-30T00:0{i}:00Z [MONITOR] Blocked traffic from VEN-00{i}\n"
+                                 for i in range(1, 8)))
+    whole = FirewallLogIndex(log, tmp_path / "whole").load_or_build()
+    monkeypatch.setattr(firewall_log, "SCAN_CHUNK_ENTRIES", 2)
+    chunked = FirewallLogIndex(log, tmp_path / "chunked").load_or_build()
+
+    assert chunked.conn_ids == whole.conn_ids
+    for key, values in whole._arrays.items():
+        assert chunked._arrays[key].dtype == values.dtype
+        np.testing.assert_array_equal(chunked._arrays[key], values)
+    assert chunked.entries("VEN-003")[0][0] == np.datetime64("2024-08-30T00:00:00.123", "ns")
@@ -0,0 +1,90 @@
+import shutil
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from collectors import EVIDENCE_DIR
+from identifier_reuse import (CONCURRENT, RESERVED, REUSED, UNKNOWN_DEPROVISION, VIOLATION_COLUMNS, detect_reuse,
+                              evidence_result, skeleton)
+from main import build_report
+
+
+def frames(created, deprovisioned, status=""):
+    current = pd.DataFrame({"username": ["jsmith"], "created": pd.to_datetime([created])})
+    archived = pd.DataFrame({
+        "username": ["jsmith"],
+        "deprovisioned": pd.to_datetime([deprovisioned]),
+        "status": pd.Series([status], dtype="string"),
+    })
+    return current, archived
+
+
+def violations(created, deprovisioned, status=""):
+    return detect_reuse(*frames(created, deprovisioned, status), as_of="2024-09-30")
+
+
+def test_reuse_inside_the_window_is_flagged():
+    found = violations("2021-01-01", "2020-06-01")
+    assert found["violation"].tolist() == [REUSED]
+    assert found["days_after_deprovision"].tolist() == [214]
+
+
+def test_reuse_after_the_window_is_clean():
+    assert violations("2023-01-01", "2020-06-01").empty
+
+
+def test_negative_gap_is_a_concurrent_holder_not_a_reuse():
+    found = violations("2020-01-01", "2020-03-01")
+    assert found["violation"].tolist() == [CONCURRENT]
+    assert found["days_after_deprovision"].tolist() == [-60]
+
+
+def test_missing_deprovision_date_is_reported_explicitly():
+    found = violations("2020-01-01", None)
+    assert found["violation"].tolist() == [UNKNOWN_DEPROVISION]
+    assert found["days_after_deprovision"].isna().all()
+
+
+def test_missing_creation_date_uses_as_of():
+    found = violations(None, "2024-01-01")
+    assert found["reused_on"].tolist() == ["2024-09-30"]
+    assert found["violation"].tolist() == [REUSED]
+
+
+def test_never_reuse_is_flagged_outside_the_window():
+    assert violations("2023-01-01", "2015-01-01", "Never Reuse")["violation"].tolist() == [RESERVED]
+
+
+def test_look_alikes_share_a_skeleton():
+    assert skeleton(pd.Series(["J.Smith", "jsrnith", "j_smlth"])).nunique() == 1
+
+
+def test_concurrent_holders_are_a_separate_finding():
+    summary = {"current": 1, "archived": 1, "retention_days": 730, "violations": 0, "exact": 0,
+               "case_normalized": 0, "near_duplicate": 0, "unknown_deprovision": 0, "concurrent_holders": 1}
+    result = evidence_result(summary)
+    assert result["status"] == "NON_COMPLIANT"
+    assert "reuse violations" not in result["finding"]
+    assert "still provisioned" in result["finding"]
+
+
+@pytest.mark.parametrize("engine", ["openpyxl", "streaming"])
+@pytest.mark.parametrize("use_store", [False, True])
+def test_workbook_renders_an_unknown_deprovision_date(tmp_path, engine, use_store):
+    if use_store:
+        pytest.importorskip("pyarrow")
+    evidence_dir = tmp_path / "evidence"
+    shutil.copytree(EVIDENCE_DIR, evidence_dir)
+    procedure = evidence_dir / "AC_3.1.7_Identity_Management_Procedure.md"
+    procedure.write_text(procedure.read_text().replace(
+        "| rlee.finance |", "| twhite.eng | unknown | | Archived |\n| rlee.finance |"))
+
+    report = build_report({"evidence_dir": evidence_dir, "output_dir": tmp_path, "state_dir": tmp_path / "state",
+                           "engine": engine, "use_cache": False, "use_store": use_store})
+
+    sheet = load_workbook(report)["Identifier_Reuse_Violations"]
+    rows = [dict(zip(VIOLATION_COLUMNS, r)) for r in sheet.iter_rows(min_row=2, values_only=True)]
+    unknown = [r for r in rows if r["violation"] == UNKNOWN_DEPROVISION]
+    assert [r["identifier"] for r in unknown] == ["twhite.eng"]
+    assert unknown[0]["days_after_deprovision"] is None and unknown[0]["deprovisioned"] in (None, "")
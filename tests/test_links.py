@@ -0,0 +1,41 @@
+import shutil
+
+import pytest
+from openpyxl import load_workbook  # pyright: ignore[reportMissingModuleSource]
+
+import main
+from collectors import EVIDENCE_DIR
+from manifest import link_resolver
+
+
+def test_references_resolve_by_name_or_relative_path():
+    resolve = link_resolver(["AC 3.1.1 Policy.md", "logs/Firewall.log"], "https://example.com/evidence/")
+
+    assert resolve("AC 3.1.1 Policy.md") == "https://example.com/evidence/AC%203.1.1%20Policy.md"
+    assert resolve("Firewall.log") == resolve("logs/Firewall.log") == "https://example.com/evidence/logs/Firewall.log"
+    assert resolve("missing.md") is None and resolve("") is None
+
+
+def test_local_links_are_relative_and_unquoted(tmp_path):
+    base = main.evidence_link_base("local", tmp_path / "evidence", tmp_path / "reports" / "report.xlsx")
+    assert base == "../evidence/"
+    assert link_resolver(["a b.md"], base)("a b.md") == "../evidence/a b.md"
+    with pytest.raises(ValueError):
+        main.evidence_link_base("ftp")
+
+
+@pytest.mark.parametrize("engine", ["openpyxl", "streaming"])
+def test_workbook_links_follow_the_artifact_column(tmp_path, engine):
+    evidence = tmp_path / "pack" / "evidence"
+    shutil.copytree(EVIDENCE_DIR, evidence)
+    report = main.build_report({"output_dir": tmp_path / "pack", "evidence_dir": evidence, "engine": engine,
+                                "evidence_links": "local", "use_cache": False, "use_store": False})
+
+    ws = load_workbook(report)["AC_Controls_Evidence"]
+    header = [c.value for c in ws[1]]
+    evidence_col, artifact_col = header.index("evidence") + 1, header.index("artifact") + 1
+    links = {ws.cell(r, artifact_col).value: ws.cell(r, evidence_col).hyperlink
+             for r in range(2, ws.max_row + 1) if ws.cell(r, artifact_col).value}
+    assert links
+    for artifact, link in links.items():
+        assert link is not None and link.target == f"evidence/{artifact}"
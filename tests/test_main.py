@@ -0,0 +1,37 @@
+import main
+
+
+def test_build_report_keeps_state_in_the_output_dir(tmp_path, monkeypatch):
+    def no_default_state(state_dir=None):
+        assert state_dir is not None, "build_report used the repository-level state"
+        return real(state_dir)
+
+    real = main.state_paths
+    monkeypatch.setattr(main, "state_paths", no_default_state)
+    report = main.build_report({"output_dir": tmp_path, "use_store": False,
+                                "controls": {"AC.L2-3.1.20": main.AC_CONTROLS["AC.L2-3.1.20"]}})
+
+    assert report.parent == tmp_path
+    assert (tmp_path / "evidence_cache.sqlite").exists()
+    assert (tmp_path / "assessment_history.csv").exists()
+    assert (tmp_path / "alert_state").is_dir() and (tmp_path / "firewall_index").is_dir()
+
+
+def test_detail_analyses_are_timed_in_their_own_stage(tmp_path, monkeypatch):
+    import remote_access
+    from metrics import Metrics
+
+    metrics, stages_at_call = Metrics(), []
+    real = remote_access.analyze_remote_access
+
+    def analyze(*args, **kwargs):
+        stages_at_call.append([r["stage"] for r in metrics.records])
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(remote_access, "analyze_remote_access", analyze)
+    monkeypatch.setattr(remote_access, "_memo", {})
+    main.generate_report_data(metrics=metrics, state_dir=tmp_path,
+                              controls={"AC.L2-3.1.12": main.AC_CONTROLS["AC.L2-3.1.12"]})
+
+    assert stages_at_call == [[]]  # computed once, inside the remote_access stage
+    assert [r["stage"] for r in metrics.records][:2] == ["remote_access", "evidence"]
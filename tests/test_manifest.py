@@ -0,0 +1,66 @@
+import hashlib
+import os
+
+import pandas as pd
+
+from manifest import MANIFEST_COLUMNS, EvidenceManifest, artifact_sha256
+
+
+def touch_later(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_chunked_digest_matches_hashlib(tmp_path):
+    path, empty = tmp_path / "big.bin", tmp_path / "empty.bin"
+    path.write_bytes(os.urandom(10_000))
+    empty.write_bytes(b"")
+
+    assert artifact_sha256(path, chunk_size=4096) == hashlib.sha256(path.read_bytes()).hexdigest()
+    assert artifact_sha256(empty) == hashlib.sha256(b"").hexdigest()
+
+
+def test_only_new_or_changed_files_are_rehashed(tmp_path):
+    evidence, state = tmp_path / "evidence", tmp_path / "manifest"
+    (evidence / "sub").mkdir(parents=True)
+    (evidence / "policy.md").write_text("v1")
+    (evidence / "sub" / "log.txt").write_text("log")
+    first = EvidenceManifest(evidence, state)
+    first.build()
+    assert (first.hashed, first.reused) == (2, 0)
+    assert first.sha256("sub/log.txt") == hashlib.sha256(b"log").hexdigest()
+
+    (evidence / "policy.md").write_text("v2")
+    touch_later(evidence / "policy.md")
+    second = EvidenceManifest(evidence, state)
+    second.build()
+    assert (second.hashed, second.reused) == (1, 1)
+    assert second.sha256("policy.md") == hashlib.sha256(b"v2").hexdigest()
+
+
+def test_removed_files_leave_the_saved_manifest(tmp_path):
+    evidence, state = tmp_path / "evidence", tmp_path / "manifest"
+    evidence.mkdir()
+    for name in ("a.md", "b.md"):
+        (evidence / name).write_text(name)
+    EvidenceManifest(evidence, state).build()
+    (evidence / "b.md").unlink()
+    EvidenceManifest(evidence, state).build()
+
+    reloaded = EvidenceManifest(evidence, state)
+    reloaded.build()
+    assert list(reloaded.entries) == ["a.md"] and reloaded.hashed == 0
+    assert reloaded.sha256("b.md") == ""
+
+
+def test_frame_has_one_row_per_artifact(tmp_path):
+    evidence = tmp_path / "evidence"
+    evidence.mkdir()
+    (evidence / "a.md").write_text("abc")
+    manifest = EvidenceManifest(evidence, tmp_path / "manifest")
+    manifest.build()
+    frame = manifest.to_frame()
+
+    assert list(frame.columns) == MANIFEST_COLUMNS
+    assert frame.loc[0, "artifact"] == "a.md" and frame.loc[0, "size_bytes"] == 3
+    assert pd.Timestamp(frame.loc[0, "modified"]).year > 2000
@@ -0,0 +1,44 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import profiling
+from profiling import profile_run
+
+
+def busy_worker(n):
+    return sum(i * i for i in range(n))
+
+
+def run_pool(profile_dir):
+    with profile_run(profile_dir, top=50) as paths:
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(busy_worker, [20_000] * 8))
+    return results, paths
+
+
+def test_profile_run_covers_worker_threads(tmp_path):
+    results, paths = run_pool(tmp_path)
+
+    assert results == [busy_worker(20_000)] * 8
+    assert paths["note"] is None
+    assert paths["pstats"].exists() and paths["tracemalloc"].exists()
+    assert "busy_worker" in paths["cprofile"].read_text()
+
+
+def test_worker_threads_still_run_when_another_profiler_is_active(tmp_path, monkeypatch):
+    real = profiling.cProfile.Profile
+
+    class MainThreadOnly(real):
+        # what Python 3.12+ does when a second profiler is enabled
+        def enable(self, *args, **kwargs):
+            if threading.current_thread() is not threading.main_thread():
+                raise ValueError("Another profiling tool is already active")
+            return super().enable(*args, **kwargs)
+
+    monkeypatch.setattr(profiling, "PER_THREAD_PROFILERS", True)
+    monkeypatch.setattr(profiling.cProfile, "Profile", MainThreadOnly)
+    results, paths = run_pool(tmp_path)
+
+    assert results == [busy_worker(20_000)] * 8
+    assert "not profiled" in paths["note"]
+    assert "main thread only" in paths["cprofile"].read_text()
@@ -0,0 +1,38 @@
+import gzip
+import json
+
+import pandas as pd
+
+from remote_access import UNKNOWN_USER, analyze_remote_access, parse_durations
+
+SESSIONS = [
+    {"user": "alee", "mfa_verified": True, "session_duration": "2h 15m", "accessed_cui": True, "recorded": True},
+    {"user": "alee", "mfa_verified": False, "session_duration": "45m", "accessed_cui": True, "recorded": False},
+    {"user": "bwilson", "mfa_verified": True, "session_duration": "3h", "accessed_cui": False, "recorded": True},
+    {"user": None, "mfa_verified": True, "session_duration": "bogus", "accessed_cui": False, "recorded": True},
+    {"user": "bwilson", "mfa_verified": True, "session_duration": "15m", "accessed_cui": False, "recorded": True},
+]
+
+
+def test_durations_parse_to_minutes():
+    minutes = parse_durations(pd.Series(["2h 15m", "45m", "3h", "bogus", None]))
+    assert minutes.iloc[:3].tolist() == [135.0, 45.0, 180.0] and minutes.iloc[3:].isna().all()
+
+
+def test_gzipped_json_lines_aggregate_like_the_json_document(tmp_path):
+    document, lines = tmp_path / "sessions.json", tmp_path / "sessions.jsonl.gz"
+    document.write_text(json.dumps({"sessions": SESSIONS}))
+    with gzip.open(lines, "wt", encoding="utf-8") as f:
+        f.writelines(json.dumps(s) + "\n" for s in SESSIONS)
+
+    summary, per_user = analyze_remote_access(lines, chunksize=2)
+    whole_summary, whole_per_user = analyze_remote_access(document)
+    assert summary == whole_summary
+    pd.testing.assert_frame_equal(per_user, whole_per_user)
+
+    assert (summary["sessions"], summary["users"], summary["unattributed_sessions"]) == (5, 2, 1)
+    assert summary["unrecorded_cui_sessions"] == 1 and summary["duration_max_min"] == 180.0
+    by_user = per_user.set_index("user")
+    assert by_user.loc["alee", ["sessions", "mfa_ratio", "review_status"]].tolist() == [2, 0.5, "REVIEW"]
+    assert by_user.loc["bwilson", "duration_avg_min"] == 97.5
+    assert by_user.loc[UNKNOWN_USER, "sessions"] == 1
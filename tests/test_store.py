@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from store import AssessmentStore  # noqa: E402
+
+
+def evidence():
+    return pd.DataFrame({
+        "control_id": ["AC.L2-3.1.1", "", "AC.L2-3.1.20"],
+        "status": ["COMPLIANT", "", "PARTIALLY_COMPLIANT"],
+        "evidence": ["Access Matrix", "User List", "Connection Inventory"],
+    })
+
+
+def test_round_trip_keeps_rows_order_and_blank_continuation_ids(tmp_path):
+    store = AssessmentStore(tmp_path)
+    store.write_stage("evidence", evidence(), "2024-09-30")
+
+    back = store.read_stage("evidence", "2024-09-30")
+    assert back.columns.tolist() == ["control_id", "status", "evidence"]
+    assert back.astype(str).values.tolist() == evidence().values.tolist()
+    assert store.bytes_written > 0
+
+
+def test_rewriting_a_date_replaces_its_snapshot(tmp_path):
+    store = AssessmentStore(tmp_path)
+    store.write_stage("evidence", evidence(), "2024-09-30")
+    store.write_stage("evidence", evidence().iloc[:2], "2024-09-30")
+
+    assert store.read_stage("evidence", "2024-09-30")["evidence"].tolist() == ["Access Matrix", "User List"]
+
+
+def test_empty_stage_keeps_its_columns(tmp_path):
+    store = AssessmentStore(tmp_path)
+    store.write_stage("identifier_reuse", pd.DataFrame({"identifier": ["jsmith"], "days": [3]}), "2024-09-30")
+    store.write_stage("identifier_reuse", pd.DataFrame(columns=["identifier", "days"]), "2024-09-30")
+
+    back = store.read_stage("identifier_reuse", "2024-09-30")
+    assert back.empty and back.columns.tolist() == ["identifier", "days"]
+    assert (tmp_path / "identifier_reuse" / "assessment_date=2024-09-30" / "control_id=AC.L2-3.1.7").is_dir()
+
+
+def test_empty_and_non_empty_dates_read_back_together(tmp_path):
+    store = AssessmentStore(tmp_path)
+    store.write_stage("identifier_reuse", pd.DataFrame({"identifier": [None], "days": [None]}).iloc[:0],
+                      "2024-06-30")
+    store.write_stage("identifier_reuse", pd.DataFrame({"identifier": ["jsmith"], "days": [3]}), "2024-09-30")
+
+    assert store.assessment_dates("identifier_reuse") == ["2024-06-30", "2024-09-30"]
+    every = store.read_stage("identifier_reuse")
+    assert every["identifier"].tolist() == ["jsmith"]
+    assert every["assessment_date"].tolist() == ["2024-09-30"]
+    assert store.read_stage("identifier_reuse", "2024-06-30").empty
+
+
+def test_run_round_trip_skips_stages_that_did_not_run(tmp_path):
+    store = AssessmentStore(tmp_path)
+    data = {"evidence": evidence(), "summary": pd.DataFrame({"Company": ["Acme"], "Total AC Controls": [2]})}
+    store.write_run(data, "2024-09-30")
+
+    back = store.read_run("2024-09-30", stages=list(data))
+    assert list(back) == ["evidence", "summary"]
+    assert back["summary"]["Total AC Controls"].tolist() == [2]
+    assert not (tmp_path / "monitoring").exists()
+
+
+def test_control_partitions_read_back_with_their_continuation_rows(tmp_path):
+    store = AssessmentStore(tmp_path)
+    store.write_stage("evidence", evidence(), "2024-09-30")
+
+    date_dir = tmp_path / "evidence" / "assessment_date=2024-09-30"
+    assert sorted(p.name for p in date_dir.iterdir()) == ["control_id=AC.L2-3.1.1", "control_id=AC.L2-3.1.20"]
+    back = store.read_stage("evidence", "2024-09-30", control_ids=["AC.L2-3.1.1"], columns=["control_id", "evidence"])
+    assert back.columns.tolist() == ["control_id", "evidence"]
+    assert back.values.tolist() == [["AC.L2-3.1.1", "Access Matrix"], ["", "User List"]]
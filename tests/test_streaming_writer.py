@@ -0,0 +1,16 @@
+import pandas as pd
+from openpyxl import load_workbook
+
+from streaming_writer import write_report_streaming
+
+
+def test_missing_values_become_empty_cells(tmp_path):
+    df = pd.DataFrame({
+        "name": ["a", None],
+        "days": pd.array([3, pd.NA], dtype="Int64"),
+        "ratio": [0.5, float("nan")],
+    })
+    out = write_report_streaming(tmp_path / "report.xlsx", [("Sheet", df, {})])
+
+    rows = list(load_workbook(out)["Sheet"].iter_rows(values_only=True))
+    assert rows == [("name", "days", "ratio"), ("a", 3, 0.5), (None, None, None)]
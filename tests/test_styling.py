@@ -0,0 +1,34 @@
+import pandas as pd
+
+from styling import FILLS, MAX_COLUMN_WIDTH, column_widths, style_worksheet
+
+
+def test_column_widths_handle_missing_values_of_every_dtype():
+    df = pd.DataFrame({
+        "days": pd.array([1234, pd.NA], dtype="Int64"),
+        "name": pd.array(["abc", pd.NA], dtype="string"),
+        "ratio": [0.5, float("nan")],
+        "notes": [None, None],
+    })
+    assert column_widths(df) == [6, 6, 7, 7]
+
+
+def test_column_widths_are_capped():
+    assert column_widths(pd.DataFrame({"x": ["y" * 500]})) == [MAX_COLUMN_WIDTH]
+
+
+def test_monitoring_gap_cell_is_red():
+    from openpyxl import Workbook  # pyright: ignore[reportMissingModuleSource]
+
+    from connections import MONITORING_GAP
+
+    df = pd.DataFrame({"connection_id": ["VEN-001", "VEN-002", "VEN-003"],
+                       "alerts_sent": [MONITORING_GAP, "Yes", "Yes"]})
+    ws = Workbook().active
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False):
+        ws.append(list(row))
+    style_worksheet(ws, "External_Monitoring", df)
+
+    assert ws["B2"].fill.start_color.rgb.endswith(FILLS["red"].start_color.rgb)
+    assert ws["A2"].fill.start_color.rgb.endswith("F7F9FC")  # zebra elsewhere on the row
@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from main import generate_assessment_summary
+from summary import append_history, history_record, history_trends, load_history, status_counts
+
+
+def evidence(*statuses):
+    rows = []
+    for n, status in enumerate(statuses):
+        rows.append({"control_id": f"AC.L2-3.1.{n}", "status": status})
+        rows.append({"control_id": "", "status": ""})  # continuation row: not counted
+    return pd.DataFrame(rows)
+
+
+def record(company, assessment, *statuses):
+    return history_record(status_counts(evidence(*statuses)), company, "2024-09-30", assessment)
+
+
+def test_status_counts_counts_control_rows_only():
+    counts = status_counts(evidence("COMPLIANT", "COMPLIANT", "PARTIALLY_COMPLIANT", "NOT_ASSESSED")).iloc[0]
+    assert (counts["total_controls"], counts["compliant"], counts["partially_compliant"],
+            counts["non_compliant"], counts["not_assessed"]) == (4, 2, 1, 0, 1)
+    assert counts["compliance_rate"] == 50.0
+
+
+def test_status_counts_by_group():
+    df = evidence("COMPLIANT", "NON_COMPLIANT").assign(enclave=["A", "A", "B", "B"])
+    table = status_counts(df, by=["enclave"]).set_index("enclave")
+    assert table.loc["A", "compliant"] == 1 and table.loc["B", "non_compliant"] == 1
+
+
+def test_change_vs_previous_run_is_keyed_on_company_and_assessment(tmp_path):
+    path = tmp_path / "history.csv"
+    append_history(record("Acme", "enclave-a", "COMPLIANT", "NON_COMPLIANT"), path)  # 50%
+    append_history(record("Acme", "enclave-b", "COMPLIANT", "COMPLIANT"), path)  # 100%, ran later
+    company = {"name": "Acme", "assessment_date": "2024-12-31", "assessment_id": "enclave-a"}
+
+    summary = generate_assessment_summary(evidence("COMPLIANT", "COMPLIANT"), company, load_history(path))
+    assert summary["Change vs Previous Run"].iloc[0] == "+50.0 pts"
+
+    company["assessment_id"] = "enclave-c"
+    summary = generate_assessment_summary(evidence("COMPLIANT"), company, load_history(path))
+    assert summary["Change vs Previous Run"].iloc[0] == "First recorded run"
+
+
+def test_history_trends_compare_each_assessment_with_its_own_previous_run(tmp_path):
+    path = tmp_path / "history.csv"
+    for rec in (record("Acme", "a", "NON_COMPLIANT"), record("Acme", "b", "COMPLIANT"),
+                record("Acme", "a", "COMPLIANT")):
+        append_history(rec, path)
+    trends = history_trends(load_history(path)).set_index("assessment")
+    assert trends.loc["a", "compliance_rate_delta"] == 100.0
+    assert pd.isna(trends.loc["b", "compliance_rate_delta"])
+
+
+def test_concurrent_appends_write_one_header_and_every_row(tmp_path):
+    path = tmp_path / "history.csv"
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda i: append_history(record("Acme", f"job-{i}", "COMPLIANT"), path), range(40)))
+    lines = path.read_text().splitlines()
+    assert len(lines) == 41 and lines[0].startswith("assessment_date,")
+    assert sorted(load_history(path)["assessment"]) == sorted(f"job-{i}" for i in range(40))
+
+
+def test_history_without_assessment_column_is_migrated(tmp_path):
+    path = tmp_path / "history.csv"
+    old = record("Acme", "", "COMPLIANT").drop(columns="assessment")
+    old.to_csv(path, index=False)
+    assert load_history(path)["assessment"].tolist() == [""]
+
+    append_history(record("Acme", "a", "NON_COMPLIANT"), path)
+    history = load_history(path)
+    assert history["assessment"].tolist() == ["", "a"]
+    assert history["compliance_rate"].tolist() == [100.0, 0.0]